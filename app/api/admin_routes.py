@@ -3,6 +3,7 @@ import os
 from functools import wraps
 from flask import Blueprint, jsonify, request, Response
 from app.db.connection import get_cursor
+from app.db.repository import clear_episode_cache
 
 admin_api = Blueprint("admin_api", __name__, url_prefix="/admin")
 
@@ -133,6 +134,7 @@ def cleanup_episodes():
         )
 
         deleted = cursor.rowcount
+    clear_episode_cache()
 
     # Verify
     with get_cursor(commit=False) as cursor:
@@ -6,6 +6,7 @@ from app.api.routes import api
 from app.api.transcript_routes import transcript_api
 from app.api.audio_routes import audio_api
 from app.api.admin_routes import admin_api
+from app.api.json_provider import OrjsonProvider
 from app.data.database import init_db
 from app.config import Config
 
@@ -44,6 +45,7 @@ def create_app():
     print(f"[STARTUP] DATABASE_URL = {masked}")
     """Application factory."""
     app = Flask(__name__, static_folder="../ui/static", static_url_path="/static")
+    app.json = OrjsonProvider(app)
     CORS(app, origins=Config.get_cors_origins())
 
     app.register_blueprint(api)
@@ -1,10 +1,20 @@
 import re
 from typing import Optional
-from flask import Blueprint, jsonify, request
-from app.db.connection import get_cursor
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from app.db.connection import execute_prepared, get_cursor
+from app.db.repository import clear_episode_cache
 from app.filters import EpisodeFilter
-# Known speakers for display mapping (SPEAKER_XX -> real name)
-KNOWN_SPEAKERS = ["Matt", "Will", "Felix", "Amber", "Virgil", "Derek Davison"]
+# Known speakers for display mapping (SPEAKER_XX -> real name).
+# A tuple so the shared value embedded in responses cannot be mutated.
+KNOWN_SPEAKERS = ("Matt", "Will", "Felix", "Amber", "Virgil", "Derek Davison")
+_KNOWN_SPEAKER_SET = frozenset(KNOWN_SPEAKERS)
+_SPEAKER_LABEL_RE = re.compile(r"^SPEAKER_(\d+)$")
+
+# Integer fields required by PATCH /assign-speaker
+ASSIGN_SPEAKER_FIELDS = ("episode_id", "start_segment_id", "end_segment_id", "speaker_id")
+
+# Hot per-episode lookups, run as server-side prepared statements
+EPISODE_EXISTS_SQL = "SELECT id FROM episodes WHERE id = $1"
 
 transcript_api = Blueprint("transcript_api", __name__, url_prefix="/api/transcripts")
 
@@ -24,11 +34,11 @@ def map_speaker_to_name(speaker: Optional[str]) -> Optional[str]:
         return None
 
     # If already a known speaker name, return as-is
-    if speaker in KNOWN_SPEAKERS:
+    if speaker in _KNOWN_SPEAKER_SET:
         return speaker
 
     # Try to extract index from SPEAKER_XX format
-    match = re.match(r"^SPEAKER_(\d+)$", speaker)
+    match = _SPEAKER_LABEL_RE.match(speaker)
     if match:
         index = int(match.group(1))
         if index < len(KNOWN_SPEAKERS):
@@ -37,6 +47,11 @@ def map_speaker_to_name(speaker: Optional[str]) -> Optional[str]:
     # No mapping available, return original
     return speaker
 
+
+def _is_int(value) -> bool:
+    """Return True for JSON integers, rejecting booleans (a subclass of int)."""
+    return type(value) is int
+
 @transcript_api.route("/search")
 def search_transcripts():
     """
@@ -758,9 +773,9 @@ def get_episode_speakers(episode_id: int):
         JSON: {"known_speakers": [...], "episode_speakers": [...]}
         404 if episode doesn't exist
     """
-    with get_cursor(commit=False) as cursor:
+    with get_cursor(commit=False, cursor_factory=None) as cursor:
         # Check if episode exists
-        cursor.execute("SELECT id FROM episodes WHERE id = %s", (episode_id,))
+        execute_prepared(cursor, "episode_exists", EPISODE_EXISTS_SQL, (episode_id,))
         if not cursor.fetchone():
             return jsonify({"error": "Episode not found"}), 404
 
@@ -775,7 +790,7 @@ def get_episode_speakers(episode_id: int):
             (episode_id,)
         )
 
-        episode_speakers = [row["speaker"] for row in cursor.fetchall()]
+        episode_speakers = [row[0] for row in cursor.fetchall()]
 
         return jsonify({
             "known_speakers": KNOWN_SPEAKERS,
@@ -799,9 +814,7 @@ def update_segment_speakers():
     Returns:
         JSON with number of segments updated.
     """
-    from app.db.models import TranscriptSegment
     from app.transcription.storage import TranscriptStorage
-    from decimal import Decimal
 
     data = request.get_json()
     if not data or "updates" not in data:
@@ -814,8 +827,8 @@ def update_segment_speakers():
     if not updates:
         return jsonify({"error": "updates array cannot be empty"}), 400
 
-    # Validate and convert to TranscriptSegment objects
-    segments = []
+    # Validate and collect (id, speaker) pairs
+    pairs = []
     for i, update in enumerate(updates):
         if not isinstance(update, dict):
             return jsonify({"error": f"update at index {i} must be an object"}), 400
@@ -835,26 +848,15 @@ def update_segment_speakers():
         if not isinstance(speaker, str):
             return jsonify({"error": f"update at index {i}: speaker must be a string"}), 400
 
-        # Create a minimal TranscriptSegment with just id and speaker
-        # The storage layer only needs these fields for the update
-        segment = TranscriptSegment(
-            id=segment_id,
-            episode_id=0,  # Not needed for update
-            word="",  # Not needed for update
-            start_time=Decimal(0),  # Not needed for update
-            end_time=Decimal(0),  # Not needed for update
-            segment_index=0,  # Not needed for update
-            speaker=speaker
-        )
-        segments.append(segment)
+        pairs.append((segment_id, speaker))
 
     # Perform the update
     storage = TranscriptStorage()
-    updated_count = storage.update_speaker_labels(segments)
+    updated_count = storage.update_speaker_labels_pairs(pairs)
 
     return jsonify({
         "updated": updated_count,
-        "requested": len(segments)
+        "requested": len(pairs)
     })
 
 
@@ -866,71 +868,68 @@ def get_episode_segments(episode_id: int):
     Query params:
         limit: Max segments per page (default 100, max 500)
         offset: Pagination offset (default 0)
+        after: Optional cursor (next_cursor from a previous page); replaces offset
         speaker: Optional speaker filter
+        format: "columns" to return segments as parallel arrays under "columns"
+            (ids, words, starts, ends, indices, speakers) instead of row objects
+        exact_total: "1" to always include an exact total count
 
     Returns:
-        JSON with segments list, total count, episode info, and available speakers.
+        JSON with segments list, has_more, episode info, available speakers,
+        next_cursor (null on the last page) and total. Without exact_total,
+        total is estimated for long unfiltered episodes (see
+        total_is_approximate) and null for speaker-filtered views.
     """
     from app.transcription.storage import TranscriptStorage
 
     try:
         limit = min(int(request.args.get("limit", 100)), 500)
         offset = int(request.args.get("offset", 0))
+        after = request.args.get("after")
+        after = int(after) if after else None
     except ValueError:
-        return jsonify({"error": "limit and offset must be integers"}), 400
+        return jsonify({"error": "limit, offset and after must be integers"}), 400
 
     speaker_filter = request.args.get("speaker", "").strip() or None
+    columnar = request.args.get("format") == "columns"
+    if request.args.get("exact_total") == "1":
+        count_mode = "exact"
+    elif speaker_filter:
+        count_mode = "none"
+    else:
+        count_mode = "auto"
 
-    # Get episode info
-    with get_cursor(commit=False) as cursor:
-        cursor.execute(
-            "SELECT id, title FROM episodes WHERE id = %s",
-            (episode_id,)
-        )
-        episode = cursor.fetchone()
-        if not episode:
-            return jsonify({"error": "Episode not found"}), 404
-
-        # Get available speakers for this episode
-        cursor.execute(
-            """
-            SELECT DISTINCT speaker
-            FROM transcript_segments
-            WHERE episode_id = %s AND speaker IS NOT NULL
-            ORDER BY speaker
-            """,
-            (episode_id,)
-        )
-        episode_speakers = [row["speaker"] for row in cursor.fetchall()]
-
-    # Get paginated segments
+    # Episode, speakers, segment page and total in one round trip
     storage = TranscriptStorage()
-    segments, total = storage.get_segments_paginated(
-        episode_id, limit, offset, speaker_filter
+    page = storage.get_episode_segments_page(
+        episode_id, limit, offset, speaker_filter, after_index=after,
+        columnar=columnar, count_mode=count_mode
     )
+    if page is None:
+        return jsonify({"error": "Episode not found"}), 404
 
-    # Convert segments to dict format
-    segments_data = [
-        {
-            "id": seg.id,
-            "word": seg.word,
-            "start_time": float(seg.start_time),
-            "end_time": float(seg.end_time),
-            "segment_index": seg.segment_index,
-            "speaker": seg.speaker
-        }
-        for seg in segments
-    ]
+    if columnar:
+        segments_key, segments = "columns", page["columns"]
+        indices = segments["indices"]
+        last_index = indices[-1] if indices else None
+    else:
+        segments_key, segments = "segments", page["segments"]
+        last_index = segments[-1]["segment_index"] if segments else None
+    next_cursor = last_index if page["has_more"] else None
 
     return jsonify({
-        "segments": segments_data,
-        "total": total,
+        segments_key: segments,
+        "has_more": page["has_more"],
+        "total": page["total"],
+        "total_is_approximate": page["total_is_approximate"],
         "episode_id": episode_id,
-        "episode_title": episode["title"],
-        "episode_speakers": episode_speakers,
+        "episode_title": page["episode"]["title"],
+        "episode_speakers": page["speakers"],
         "known_speakers": KNOWN_SPEAKERS,
         "limit": limit,
         "offset": offset,
+        "after": after,
+        "next_cursor": next_cursor,
         "speaker_filter": speaker_filter
     })
 
@@ -1027,6 +1026,50 @@ def insert_segment_after(segment_id: int):
     return jsonify({"id": new_id, "created": True}), 201
 
 
+@transcript_api.route("/segments/bulk-insert", methods=["POST"])
+def bulk_insert_segments():
+    """
+    Insert many segments at once, each after an existing segment.
+
+    Words sharing an after_id are placed after that segment in request order.
+
+    Request body:
+        {"segments": [{"after_id": 123, "word": "text"}, ...]}
+
+    Returns:
+        JSON with the new segment IDs in request order.
+    """
+    from app.transcription.storage import TranscriptStorage
+
+    data = request.get_json()
+    if not data or "segments" not in data:
+        return jsonify({"error": "segments field required in request body"}), 400
+
+    items_data = data["segments"]
+    if not isinstance(items_data, list) or not items_data:
+        return jsonify({"error": "segments must be a non-empty array"}), 400
+
+    items = []
+    for item in items_data:
+        if not isinstance(item, dict):
+            return jsonify({"error": "Each segment must be an object"}), 400
+        after_id = item.get("after_id")
+        word = item.get("word")
+        if not _is_int(after_id):
+            return jsonify({"error": "Each segment requires an integer after_id"}), 400
+        if not isinstance(word, str) or not word.strip():
+            return jsonify({"error": "Each segment requires a non-empty word"}), 400
+        items.append((after_id, word))
+
+    storage = TranscriptStorage()
+    new_ids = storage.insert_segments_after(items)
+
+    if new_ids is None:
+        return jsonify({"error": "Reference segment not found"}), 404
+
+    return jsonify({"ids": new_ids, "created": len(new_ids)}), 201
+
+
 # Speaker management endpoints
 
 @transcript_api.route("/speakers", methods=["POST"])
@@ -1081,30 +1124,36 @@ def get_episode_paragraphs(episode_id: int):
             - start_time: Start time of first word in paragraph
             - end_time: End time of last word in paragraph
             - segment_ids: List of segment IDs that make up this paragraph
+
+        The body is streamed paragraph by paragraph rather than encoded whole.
     """
     from app.transcription.storage import TranscriptStorage
 
-    # Verify episode exists
-    with get_cursor(commit=False) as cursor:
-        cursor.execute(
-            "SELECT id, title, manually_reviewed FROM episodes WHERE id = %s",
-            (episode_id,)
-        )
-        episode = cursor.fetchone()
-
-    if not episode:
+    # Episode header and paragraphs stream from one query; no row means no episode
+    storage = TranscriptStorage()
+    rows = storage.iter_episode_paragraphs(episode_id)
+    first = next(rows, None)
+    if first is None:
         return jsonify({"error": "Episode not found"}), 404
 
-    storage = TranscriptStorage()
-    paragraphs = storage.get_episode_paragraphs(episode_id)
+    def generate():
+        dumps = current_app.json.dumps
+        yield (
+            f'{{"episode_id": {episode_id}, '
+            f'"episode_title": {dumps(first["episode_title"])}, '
+            f'"manually_reviewed": {dumps(first["manually_reviewed"])}, '
+            f'"paragraphs": ['
+        )
+        total = 0
+        if first["paragraph"] is not None:
+            yield dumps(first["paragraph"])
+            total = 1
+            for row in rows:
+                yield "," + dumps(row["paragraph"])
+                total += 1
+        yield f'], "total": {total}}}'
 
-    return jsonify({
-        "episode_id": episode_id,
-        "episode_title": episode["title"],
-        "manually_reviewed": episode["manually_reviewed"],
-        "paragraphs": paragraphs,
-        "total": len(paragraphs)
-    })
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 @transcript_api.route("/assign-speaker", methods=["PATCH"])
@@ -1131,29 +1180,24 @@ def assign_speaker():
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
-    required_fields = ["episode_id", "start_segment_id", "end_segment_id", "speaker_id"]
-    for field in required_fields:
+    for field in ASSIGN_SPEAKER_FIELDS:
         if field not in data:
             return jsonify({"error": f"{field} field required"}), 400
-        if not isinstance(data[field], int):
+        if not _is_int(data[field]):
             return jsonify({"error": f"{field} must be an integer"}), 400
 
-    episode_id = data["episode_id"]
-    start_segment_id = data["start_segment_id"]
-    end_segment_id = data["end_segment_id"]
-    speaker_id = data["speaker_id"]
-
-    # Verify speaker exists
-    with get_cursor(commit=False) as cursor:
-        cursor.execute("SELECT id FROM speakers WHERE id = %s", (speaker_id,))
-        if not cursor.fetchone():
-            return jsonify({"error": "Speaker not found"}), 404
+    episode_id, start_segment_id, end_segment_id, speaker_id = (
+        data[field] for field in ASSIGN_SPEAKER_FIELDS
+    )
 
+    # Speaker validation and the range update share one statement
     storage = TranscriptStorage()
     updated = storage.assign_speaker_to_range(
         episode_id, start_segment_id, end_segment_id, speaker_id
     )
 
+    if updated is None:
+        return jsonify({"error": "Speaker not found"}), 404
     if updated == 0:
         return jsonify({"error": "No segments found in range"}), 404
 
@@ -1190,7 +1234,7 @@ def edit_paragraph_batch():
     if segment_ids is None or not isinstance(segment_ids, list):
         return jsonify({"error": "segment_ids must be a list of integers"}), 400
 
-    if not all(isinstance(sid, int) for sid in segment_ids):
+    if not all(map(_is_int, segment_ids)):
         return jsonify({"error": "segment_ids must be a list of integers"}), 400
 
     if new_text is None or not isinstance(new_text, str):
@@ -1235,6 +1279,7 @@ def set_manually_reviewed(episode_id: int):
             "UPDATE episodes SET manually_reviewed = %s WHERE id = %s",
             (value, episode_id)
         )
+    clear_episode_cache(episode_id)
 
     return jsonify({
         "episode_id": episode_id,
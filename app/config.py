@@ -1,4 +1,14 @@
 import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _parse_cors_origins(origins_str: str):
+    """Parse a CORS_ORIGINS value into "*" or a tuple of origins."""
+    if origins_str == "*":
+        return "*"
+    return tuple(origin.strip() for origin in origins_str.split(",") if origin.strip())
+
 
 class Config:
     VERSION = "0.1.0"
@@ -16,7 +26,7 @@ class Config:
         - Comma-separated list of origins for production
           e.g., "https://myapp.railway.app,https://custom-domain.com"
         """
-        origins_str = os.environ.get("CORS_ORIGINS", "*")
-        if origins_str == "*":
+        origins = _parse_cors_origins(os.environ.get("CORS_ORIGINS", "*"))
+        if origins == "*":
             return "*"
-        return [origin.strip() for origin in origins_str.split(",") if origin.strip()]
+        return list(origins)
@@ -1,15 +1,33 @@
+import atexit
 import os
+import re
+import threading
+import weakref
 from contextlib import contextmanager
 from pathlib import Path
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 
 # Load .env from project root
 _project_root = Path(__file__).resolve().parent.parent.parent
 load_dotenv(_project_root / ".env")
 
+# Default pool bounds, overridable with DB_POOL_MIN / DB_POOL_MAX
+POOL_MIN_CONNECTIONS = 4
+POOL_MAX_CONNECTIONS = 25
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Migrations containing COPY must run as their own statement batch
+_COPY_STATEMENT = re.compile(rb"^\s*COPY\b", re.IGNORECASE | re.MULTILINE)
+
+# Names of server-side prepared statements created on each connection
+_prepared_statements = weakref.WeakKeyDictionary()
+
 def get_connection_string():
     """Get PostgreSQL connection string from environment.
 
@@ -26,20 +44,74 @@ def get_connection_string():
         url = url.replace("postgres://", "postgresql://", 1)
     return url
 
+def get_pool_size() -> tuple[int, int]:
+    """Get the (min, max) pool size from DB_POOL_MIN / DB_POOL_MAX.
+
+    The minimum is clamped so it never exceeds the maximum.
+    """
+    max_size = max(1, int(os.environ.get("DB_POOL_MAX", POOL_MAX_CONNECTIONS)))
+    min_size = min(max_size, max(0, int(os.environ.get("DB_POOL_MIN", POOL_MIN_CONNECTIONS))))
+    return min_size, max_size
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Get the process-wide connection pool, creating it on first use.
+
+    Created lazily so importing this module never opens a connection, and so
+    each forked worker process builds its own pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                min_size, max_size = get_pool_size()
+                _pool = ThreadedConnectionPool(
+                    min_size,
+                    max_size,
+                    dsn=get_connection_string(),
+                )
+    return _pool
+
 @contextmanager
 def get_connection():
-    """Get a database connection context manager."""
-    conn = psycopg2.connect(get_connection_string())
+    """Get a pooled database connection context manager.
+
+    The connection is returned to the pool afterwards; any open transaction
+    is rolled back by the pool. Connections that failed at the connection
+    level are discarded instead of reused.
+    """
+    pool = _get_pool()
+    conn = pool.getconn()
+    discard = False
     try:
         yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        discard = True
+        raise
     finally:
-        conn.close()
+        pool.putconn(conn, close=discard or bool(conn.closed))
+
+def close_all_connections():
+    """Close every pooled connection and drop the pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+atexit.register(close_all_connections)
 
 @contextmanager
-def get_cursor(commit=True):
-    """Get a database cursor with automatic commit."""
+def get_cursor(commit=True, name=None, cursor_factory=RealDictCursor):
+    """Get a database cursor with automatic commit.
+
+    Pass a name to get a server-side (named) cursor, which streams rows in
+    batches of cursor.itersize instead of loading the whole result.
+
+    Rows are dicts by default. Pass cursor_factory=None for plain tuple rows
+    where columns are read by position; they skip building a dict per row.
+    """
     with get_connection() as conn:
-        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        cursor = conn.cursor(name=name, cursor_factory=cursor_factory)
         try:
             yield cursor
             if commit:
@@ -50,15 +122,65 @@ def get_cursor(commit=True):
         finally:
             cursor.close()
 
+def execute_prepared(cursor, name: str, sql: str, params: tuple = ()):
+    """Execute a query as a named server-side prepared statement.
+
+    The statement is PREPAREd the first time it is used on a connection, so
+    later calls on the same pooled connection skip Postgres' parse and plan
+    steps. Prepared statements live as long as the connection.
+
+    Args:
+        cursor: Database cursor.
+        name: Statement name, unique per query text.
+        sql: Query using $1, $2, ... placeholders.
+        params: Parameter values, in placeholder order.
+    """
+    prepared = _prepared_statements.setdefault(cursor.connection, set())
+    if name not in prepared:
+        cursor.execute(f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cursor.execute(f"EXECUTE {name}({placeholders})", params)
+    else:
+        cursor.execute(f"EXECUTE {name}")
+
 def run_migrations(migrations_dir: str = "db/migrations"):
-    """Run all SQL migration files in order."""
-    import glob
+    """Run all SQL migration files in order.
 
-    migration_files = sorted(glob.glob(f"{migrations_dir}/*.sql"))
+    Consecutive migrations are concatenated and sent as one statement batch,
+    all inside a single transaction. Files containing COPY do not compose
+    with other statements and are executed on their own.
+    """
+    with os.scandir(migrations_dir) as entries:
+        migration_files = sorted(
+            entry.path for entry in entries
+            if entry.name.endswith(".sql") and not entry.name.startswith(".") and entry.is_file()
+        )
 
     with get_cursor() as cursor:
+        batch_files = []
+        batch_sql = []
+
+        def flush():
+            if not batch_files:
+                return
+            for migration_file in batch_files:
+                print(f"Running migration: {migration_file}")
+            cursor.execute(b"\n;\n".join(batch_sql))
+            for migration_file in batch_files:
+                print(f"  Done: {migration_file}")
+            batch_files.clear()
+            batch_sql.clear()
+
         for migration_file in migration_files:
-            print(f"Running migration: {migration_file}")
-            with open(migration_file, "r") as f:
-                cursor.execute(f.read())
-            print(f"  Done: {migration_file}")
+            sql = Path(migration_file).read_bytes()
+            standalone = _COPY_STATEMENT.search(sql) is not None
+            if standalone:
+                flush()
+            batch_files.append(migration_file)
+            batch_sql.append(sql)
+            if standalone:
+                flush()
+        flush()
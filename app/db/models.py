@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Episode:
     id: Optional[int]
     patreon_id: str
@@ -12,21 +12,23 @@ class Episode:
     published_at: Optional[datetime] = None
     duration_seconds: Optional[int] = None
     youtube_url: Optional[str] = None
-    youtube_id: Optional[str] = None
     is_free: bool = False
     processed: bool = False
     manually_reviewed: bool = False
     llm_corrected: bool = False
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Not stored in the episodes table; kept last so rows selected with
+    # EPISODE_COLUMNS map onto the leading fields by position
+    youtube_id: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptSegment:
     id: Optional[int]
     episode_id: int
     word: str
-    start_time: Decimal
-    end_time: Decimal
+    start_time: float
+    end_time: float
     segment_index: int
     speaker: Optional[str] = None
     speaker_confidence: Optional[Decimal] = None
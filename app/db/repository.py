@@ -1,9 +1,204 @@
-from typing import Optional
-from .connection import get_cursor
+import dataclasses
+import io
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional
+from psycopg2.extras import execute_values
+from .connection import execute_prepared, get_cursor
 from .models import Episode, TranscriptSegment
 
+# Bounds for the in-process cache in front of episode point lookups. Writes
+# made by another process (e.g. manage.py while the API is running) are only
+# seen once an entry expires, so the TTL is the cross-process staleness window.
+EPISODE_CACHE_MAXSIZE = 4096
+EPISODE_CACHE_TTL_SECONDS = 5
+
+# Rows fetched per round trip by the iter_* episode generators
+EPISODE_STREAM_BATCH_SIZE = 1000
+
+# Bytes requested per read when streaming bulk_insert rows through COPY
+COPY_BUFFER_SIZE = 64 * 1024
+
+# COPY text format escapes for backslash and the row/column delimiters
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+# Episode columns in Episode field order, so rows build with Episode(*row)
+EPISODE_COLUMNS = (
+    "id, patreon_id, title, audio_url, published_at, duration_seconds, youtube_url, "
+    "is_free, processed, manually_reviewed, llm_corrected, created_at, updated_at"
+)
+
+# Hot lookups, run as server-side prepared statements
+EPISODE_BY_PATREON_ID_SQL = f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE patreon_id = $1"
+EPISODE_BY_ID_SQL = f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE id = $1"
+EPISODE_MARK_PROCESSED_SQL = "UPDATE episodes SET processed = TRUE WHERE id = $1"
+TRANSCRIPT_SEARCH_SQL = """
+    SELECT
+        ts.word,
+        ts.start_time,
+        ts.end_time,
+        e.id as episode_id,
+        e.title as episode_title,
+        e.patreon_id,
+        e.published_at
+    FROM transcript_segments ts
+    JOIN episodes e ON ts.episode_id = e.id
+    WHERE ts.word ILIKE $1
+    ORDER BY e.published_at DESC, ts.start_time
+    LIMIT $2 OFFSET $3
+"""
+
+
+def _unprocessed_predicate(numbered_only: bool) -> str:
+    """WHERE clause selecting unprocessed episodes, optionally numbered titles only."""
+    if numbered_only:
+        return "NOT processed AND (title ~ '^[0-9]' OR title ~ '#[0-9]')"
+    return "NOT processed"
+
+
+class _EpisodeCache:
+    """Thread-safe LRU cache of episodes with a per-entry time to live.
+
+    Each episode is stored under both its database ID and its Patreon ID.
+    Callers get copies, so mutating a returned Episode never leaks into
+    the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[Episode]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, episode = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dataclasses.replace(episode)
+
+    def put(self, episode: Episode) -> None:
+        entry = (time.monotonic() + self.ttl, dataclasses.replace(episode))
+        with self._lock:
+            for key in (("id", episode.id), ("patreon_id", episode.patreon_id)):
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, episode_id: Optional[int] = None, patreon_id: Optional[str] = None) -> None:
+        with self._lock:
+            for key in (("id", episode_id), ("patreon_id", patreon_id)):
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    cached = entry[1]
+                    self._entries.pop(("id", cached.id), None)
+                    self._entries.pop(("patreon_id", cached.patreon_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_episode_cache = _EpisodeCache(EPISODE_CACHE_MAXSIZE, EPISODE_CACHE_TTL_SECONDS)
+
+
+def clear_episode_cache(episode_id: Optional[int] = None) -> None:
+    """Drop cached episodes after rows were changed outside EpisodeRepository.
+
+    Args:
+        episode_id: Episode to drop, or None to drop every cached episode.
+    """
+    if episode_id is None:
+        _episode_cache.clear()
+    else:
+        _episode_cache.invalidate(episode_id)
+
+
+def mark_episode_processed(cursor, episode_id: int) -> None:
+    """Mark an episode as processed inside the caller's transaction.
+
+    Call clear_episode_cache(episode_id) once the transaction has committed.
+
+    Args:
+        cursor: Open database cursor.
+        episode_id: Episode to mark.
+    """
+    execute_prepared(cursor, "ep_mark_processed", EPISODE_MARK_PROCESSED_SQL, (episode_id,))
+
+
+def _like_contains(text: str) -> str:
+    """Build an ILIKE pattern matching text anywhere, with wildcards escaped.
+
+    Literal % and _ in user input would otherwise act as wildcards; a
+    pattern made only of them matches every row and cannot be narrowed by
+    the trigram index on transcript_segments.word.
+    """
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _copy_value(value) -> str:
+    """Format a value as a COPY text-format field."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(_COPY_ESCAPES)
+    return str(value)
+
+
+class _IteratorFile(io.TextIOBase):
+    """Read-only file over an iterator of text chunks, for COPY ... FROM STDIN.
+
+    Lets psycopg2's copy_expert pull rows as it sends them, so the full
+    payload is never built in memory.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        parts = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+        data = "".join(parts)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
+
+
 class EpisodeRepository:
-    """Data access for episodes."""
+    """Data access for episodes.
+
+    get_by_id and get_by_patreon_id are served from a short-lived in-process
+    cache, which this repository's own writes keep up to date. Changes made by
+    other processes, such as processed or llm_corrected flags set by manage.py,
+    can be up to EPISODE_CACHE_TTL_SECONDS stale. Pass use_cache=False when
+    every read has to hit the database.
+    """
+
+    def __init__(self, use_cache: bool = True):
+        self.use_cache = use_cache
 
     def create(self, episode: Episode) -> Episode:
         """Insert a new episode."""
@@ -29,100 +224,217 @@ class EpisodeRepository:
             episode.is_free = row["is_free"]
             episode.created_at = row["created_at"]
             episode.updated_at = row["updated_at"]
-            return episode
+        _episode_cache.invalidate(episode.id, episode.patreon_id)
+        return episode
+
+    def bulk_create(self, episodes: list[Episode]) -> list[Episode]:
+        """Insert or update many episodes in one statement and transaction.
+
+        Same conflict handling as create(). Episodes sharing a patreon_id are
+        collapsed to the last one, as repeated create() calls would leave them.
+
+        Args:
+            episodes: Episodes to upsert by patreon_id.
+
+        Returns:
+            The upserted episodes with id, is_free and timestamps filled in.
+        """
+        by_patreon_id = {episode.patreon_id: episode for episode in episodes}
+        if not by_patreon_id:
+            return []
+
+        rows = [
+            (ep.patreon_id, ep.title, ep.audio_url, ep.published_at,
+             ep.duration_seconds, ep.youtube_url, ep.is_free, ep.processed)
+            for ep in by_patreon_id.values()
+        ]
+        with get_cursor() as cursor:
+            returned = execute_values(
+                cursor,
+                """
+                INSERT INTO episodes (patreon_id, title, audio_url, published_at, duration_seconds, youtube_url, is_free, processed)
+                VALUES %s
+                ON CONFLICT (patreon_id) DO UPDATE SET
+                    title = EXCLUDED.title,
+                    audio_url = EXCLUDED.audio_url,
+                    published_at = EXCLUDED.published_at,
+                    duration_seconds = EXCLUDED.duration_seconds,
+                    youtube_url = COALESCE(EXCLUDED.youtube_url, episodes.youtube_url),
+                    is_free = EXCLUDED.is_free OR episodes.is_free
+                RETURNING patreon_id, id, is_free, created_at, updated_at
+                """,
+                rows,
+                page_size=len(rows),
+                fetch=True
+            )
+
+        for row in returned:
+            episode = by_patreon_id[row["patreon_id"]]
+            episode.id = row["id"]
+            episode.is_free = row["is_free"]
+            episode.created_at = row["created_at"]
+            episode.updated_at = row["updated_at"]
+            _episode_cache.invalidate(episode.id, episode.patreon_id)
+        return list(by_patreon_id.values())
 
     def get_by_patreon_id(self, patreon_id: str) -> Optional[Episode]:
         """Get episode by Patreon ID."""
-        with get_cursor(commit=False) as cursor:
-            cursor.execute(
-                "SELECT * FROM episodes WHERE patreon_id = %s",
-                (patreon_id,)
-            )
+        if self.use_cache:
+            cached = _episode_cache.get(("patreon_id", patreon_id))
+            if cached is not None:
+                return cached
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
+            execute_prepared(cursor, "ep_by_patreon_id", EPISODE_BY_PATREON_ID_SQL, (patreon_id,))
             row = cursor.fetchone()
-            if row:
-                return Episode(**row)
-            return None
+        return self._cache_row(row)
 
     def get_by_id(self, episode_id: int) -> Optional[Episode]:
         """Get episode by database ID."""
-        with get_cursor(commit=False) as cursor:
-            cursor.execute(
-                "SELECT * FROM episodes WHERE id = %s",
-                (episode_id,)
-            )
+        if self.use_cache:
+            cached = _episode_cache.get(("id", episode_id))
+            if cached is not None:
+                return cached
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
+            execute_prepared(cursor, "ep_by_id", EPISODE_BY_ID_SQL, (episode_id,))
             row = cursor.fetchone()
-            if row:
-                return Episode(**row)
+        return self._cache_row(row)
+
+    def _cache_row(self, row) -> Optional[Episode]:
+        """Build an Episode from a row and remember it; misses are not cached."""
+        if not row:
             return None
+        episode = Episode(*row)
+        if self.use_cache:
+            _episode_cache.put(episode)
+        return episode
 
     def search_by_title(self, query: str) -> list[Episode]:
         """Search episodes by title substring (case-insensitive)."""
-        with get_cursor(commit=False) as cursor:
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
             cursor.execute(
-                "SELECT * FROM episodes WHERE title ILIKE %s ORDER BY published_at DESC",
+                f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE title ILIKE %s ORDER BY published_at DESC",
                 (f"%{query}%",)
             )
-            return [Episode(**row) for row in cursor.fetchall()]
+            return [Episode(*row) for row in cursor.fetchall()]
 
-    def get_unprocessed(self, numbered_only: bool = False) -> list[Episode]:
-        """Get all unprocessed episodes.
+    def _iter_episodes(self, name: str, query: str, params: tuple = ()) -> Iterator[Episode]:
+        """Stream episodes from a server-side cursor in batches.
+
+        Only one batch of rows is held in memory at a time. The cursor (and
+        its connection) stays open until the generator is exhausted or closed.
+        The query must select EPISODE_COLUMNS, in order.
+        """
+        with get_cursor(commit=False, name=name, cursor_factory=None) as cursor:
+            cursor.itersize = EPISODE_STREAM_BATCH_SIZE
+            cursor.execute(query, params)
+            for row in cursor:
+                yield Episode(*row)
+
+    def iter_unprocessed(
+        self,
+        numbered_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[Episode]:
+        """Stream unprocessed episodes, newest first.
 
         Args:
             numbered_only: If True, only return episodes with numbered titles
                           (titles starting with a digit or containing #digit pattern).
+            limit: Maximum episodes to return. None for no limit.
+            offset: Number of episodes to skip first.
         """
-        with get_cursor(commit=False) as cursor:
-            if numbered_only:
-                cursor.execute(
-                    """
-                    SELECT * FROM episodes
-                    WHERE NOT processed
-                      AND (title ~ '^[0-9]' OR title ~ '#[0-9]')
-                    ORDER BY published_at DESC
-                    """
-                )
-            else:
-                cursor.execute(
-                    "SELECT * FROM episodes WHERE NOT processed ORDER BY published_at DESC"
-                )
-            return [Episode(**row) for row in cursor.fetchall()]
+        name = "episodes_unprocessed_numbered" if numbered_only else "episodes_unprocessed"
+        query = (
+            f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE {_unprocessed_predicate(numbered_only)}"
+            " ORDER BY published_at DESC"
+        )
+        params = []
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        if offset:
+            query += " OFFSET %s"
+            params.append(offset)
+        return self._iter_episodes(name, query, tuple(params))
+
+    def get_unprocessed(
+        self,
+        numbered_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[Episode]:
+        """Get unprocessed episodes, newest first.
+
+        Args:
+            numbered_only: If True, only return episodes with numbered titles
+                          (titles starting with a digit or containing #digit pattern).
+            limit: Maximum episodes to return. None for no limit.
+            offset: Number of episodes to skip first.
+        """
+        return list(self.iter_unprocessed(numbered_only, limit, offset))
+
+    def count_unprocessed(self, numbered_only: bool = False) -> int:
+        """Count unprocessed episodes without fetching them.
+
+        Args:
+            numbered_only: If True, only count episodes with numbered titles.
+        """
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM episodes WHERE {_unprocessed_predicate(numbered_only)}"
+            )
+            return cursor.fetchone()[0]
 
     def mark_processed(self, episode_id: int) -> None:
         """Mark an episode as processed."""
         with get_cursor() as cursor:
-            cursor.execute(
-                "UPDATE episodes SET processed = TRUE WHERE id = %s",
-                (episode_id,)
-            )
+            mark_episode_processed(cursor, episode_id)
+        _episode_cache.invalidate(episode_id)
+
+    def iter_all(self) -> Iterator[Episode]:
+        """Stream all episodes."""
+        return self._iter_episodes(
+            "episodes_all", f"SELECT {EPISODE_COLUMNS} FROM episodes ORDER BY published_at DESC"
+        )
 
     def get_all(self) -> list[Episode]:
         """Get all episodes."""
-        with get_cursor(commit=False) as cursor:
-            cursor.execute("SELECT * FROM episodes ORDER BY published_at DESC")
-            return [Episode(**row) for row in cursor.fetchall()]
+        return list(self.iter_all())
+
+    def iter_with_missing_word_confidence(self, limit: Optional[int] = None) -> Iterator[Episode]:
+        """Stream episodes that have a transcript but at least one segment with NULL word_confidence."""
+        # Semi-join: stops at the first NULL segment per episode instead of
+        # deduplicating every matching segment row
+        query = f"""
+            SELECT {EPISODE_COLUMNS}
+            FROM episodes e
+            WHERE EXISTS (
+                SELECT 1 FROM transcript_segments ts
+                WHERE ts.episode_id = e.id AND ts.word_confidence IS NULL
+            )
+            ORDER BY e.published_at DESC
+        """
+        params = ()
+        if limit:
+            query += " LIMIT %s"
+            params = (limit,)
+        return self._iter_episodes("episodes_missing_word_confidence", query, params)
 
     def get_with_missing_word_confidence(self, limit: Optional[int] = None) -> list[Episode]:
         """Get episodes that have a transcript but at least one segment with NULL word_confidence."""
-        with get_cursor(commit=False) as cursor:
-            query = """
-                SELECT DISTINCT e.*
-                FROM episodes e
-                INNER JOIN transcript_segments ts ON ts.episode_id = e.id
-                WHERE ts.word_confidence IS NULL
-                ORDER BY e.published_at DESC
-            """
-            if limit:
-                query += f" LIMIT {limit}"
-            cursor.execute(query)
-            return [Episode(**row) for row in cursor.fetchall()]
+        return list(self.iter_with_missing_word_confidence(limit))
+
+    def iter_without_youtube(self) -> Iterator[Episode]:
+        """Stream episodes that don't have a YouTube URL."""
+        return self._iter_episodes(
+            "episodes_without_youtube",
+            f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE youtube_url IS NULL ORDER BY published_at DESC"
+        )
 
     def get_without_youtube(self) -> list[Episode]:
         """Get episodes that don't have a YouTube URL."""
-        with get_cursor(commit=False) as cursor:
-            cursor.execute(
-                "SELECT * FROM episodes WHERE youtube_url IS NULL ORDER BY published_at DESC"
-            )
-            return [Episode(**row) for row in cursor.fetchall()]
+        return list(self.iter_without_youtube())
 
     def update_youtube_url(self, episode_id: int, youtube_url: str) -> None:
         """Update the YouTube URL for an episode and mark as free."""
@@ -131,6 +443,7 @@ class EpisodeRepository:
                 "UPDATE episodes SET youtube_url = %s, is_free = TRUE WHERE id = %s",
                 (youtube_url, episode_id)
             )
+        _episode_cache.invalidate(episode_id)
 
     def update_is_free(self, episode_id: int, is_free: bool) -> None:
         """Update the is_free flag for an episode."""
@@ -139,6 +452,7 @@ class EpisodeRepository:
                 "UPDATE episodes SET is_free = %s WHERE id = %s",
                 (is_free, episode_id)
             )
+        _episode_cache.invalidate(episode_id)
 
     def update_free_status(self, episode_id: int, youtube_url: Optional[str], is_free: bool) -> None:
         """Update both youtube_url and is_free for an episode."""
@@ -147,14 +461,21 @@ class EpisodeRepository:
                 "UPDATE episodes SET youtube_url = %s, is_free = %s WHERE id = %s",
                 (youtube_url, is_free, episode_id)
             )
+        _episode_cache.invalidate(episode_id)
+
+    def iter_free_episodes(self) -> Iterator[Episode]:
+        """Stream all free episodes (is_free=True or has youtube_url).
+
+        The WHERE clause matches the partial index from migration 017.
+        """
+        return self._iter_episodes(
+            "episodes_free",
+            f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE is_free = TRUE OR youtube_url IS NOT NULL ORDER BY published_at DESC"
+        )
 
     def get_free_episodes(self) -> list[Episode]:
         """Get all free episodes (is_free=True or has youtube_url)."""
-        with get_cursor(commit=False) as cursor:
-            cursor.execute(
-                "SELECT * FROM episodes WHERE is_free = TRUE OR youtube_url IS NOT NULL ORDER BY published_at DESC"
-            )
-            return [Episode(**row) for row in cursor.fetchall()]
+        return list(self.iter_free_episodes())
 
     def backfill_is_free_from_youtube_url(self) -> int:
         """Set is_free=TRUE for all episodes that have a youtube_url.
@@ -165,7 +486,9 @@ class EpisodeRepository:
             cursor.execute(
                 "UPDATE episodes SET is_free = TRUE WHERE youtube_url IS NOT NULL AND is_free = FALSE"
             )
-            return cursor.rowcount
+            updated = cursor.rowcount
+        _episode_cache.clear()
+        return updated
 
     def get_by_episode_numbers(self, numbers: list[int]) -> list[Episode]:
         """Get episodes by their episode numbers.
@@ -182,42 +505,43 @@ class EpisodeRepository:
         if not numbers:
             return []
 
-        with get_cursor(commit=False) as cursor:
-            # Build OR conditions for each episode number pattern
-            conditions = []
-            params = []
-            for num in numbers:
-                conditions.append("title LIKE %s")
-                params.append(f"{num} -%")
-
-            query = f"""
-                SELECT * FROM episodes
-                WHERE {" OR ".join(conditions)}
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
+            # One array parameter keeps the query text (and plan) the same for any count
+            cursor.execute(
+                f"""
+                SELECT {EPISODE_COLUMNS} FROM episodes
+                WHERE title LIKE ANY(%s)
                 ORDER BY published_at DESC
-            """
-            cursor.execute(query, tuple(params))
-            return [Episode(**row) for row in cursor.fetchall()]
+                """,
+                ([f"{num} -%" for num in numbers],)
+            )
+            return [Episode(*row) for row in cursor.fetchall()]
 
 
 class TranscriptRepository:
     """Data access for transcript segments."""
 
-    def bulk_insert(self, segments: list[TranscriptSegment]) -> None:
-        """Insert multiple transcript segments efficiently."""
-        if not segments:
+    def bulk_insert(self, segments: Iterable[TranscriptSegment]) -> None:
+        """Insert multiple transcript segments efficiently.
+
+        Rows are streamed to Postgres with COPY as they are read from
+        segments, so a generator of segments is never materialized.
+        """
+        if isinstance(segments, list) and not segments:
             return
 
+        rows = (
+            "\t".join((
+                _copy_value(s.episode_id), _copy_value(s.word), _copy_value(s.start_time),
+                _copy_value(s.end_time), _copy_value(s.segment_index),
+            )) + "\n"
+            for s in segments
+        )
         with get_cursor() as cursor:
-            values = [
-                (s.episode_id, s.word, s.start_time, s.end_time, s.segment_index)
-                for s in segments
-            ]
-            cursor.executemany(
-                """
-                INSERT INTO transcript_segments (episode_id, word, start_time, end_time, segment_index)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                values
+            cursor.copy_expert(
+                "COPY transcript_segments (episode_id, word, start_time, end_time, segment_index) FROM STDIN",
+                _IteratorFile(rows),
+                size=COPY_BUFFER_SIZE
             )
 
     def search(self, query: str, limit: int = 100, offset: int = 0) -> list[dict]:
@@ -226,24 +550,9 @@ class TranscriptRepository:
         Returns matches with episode info and timestamps.
         """
         with get_cursor(commit=False) as cursor:
-            # Use trigram similarity for fuzzy prefix matching
-            cursor.execute(
-                """
-                SELECT
-                    ts.word,
-                    ts.start_time,
-                    ts.end_time,
-                    e.id as episode_id,
-                    e.title as episode_title,
-                    e.patreon_id,
-                    e.published_at
-                FROM transcript_segments ts
-                JOIN episodes e ON ts.episode_id = e.id
-                WHERE ts.word ILIKE %s
-                ORDER BY e.published_at DESC, ts.start_time
-                LIMIT %s OFFSET %s
-                """,
-                (f"%{query}%", limit, offset)
+            # Substring match, served by the pg_trgm GIN index on word
+            execute_prepared(
+                cursor, "ts_search", TRANSCRIPT_SEARCH_SQL, (_like_contains(query), limit, offset)
             )
             return [dict(row) for row in cursor.fetchall()]
 
@@ -269,6 +578,6 @@ class TranscriptRepository:
                 ORDER BY published_at DESC, start_time
                 LIMIT %s
                 """,
-                (f"%{words[0]}%", limit)
+                (_like_contains(words[0]), limit)
             )
             return [dict(row) for row in cursor.fetchall()]
@@ -13,6 +13,14 @@ EXCLUDED_SHOWS = frozenset([
     "hell on earth",
 ])
 
+# Leading episode number and trailing date in parentheses: (M/D/YY) or (MM/DD/YY)
+_NUMBERED_RE = re.compile(r'^\d+.*\(\d{1,2}/\d{1,2}/\d{2,4}\)\s*$', re.DOTALL)
+
+_EXCLUDED_RE = re.compile(
+    "|".join(re.escape(show) for show in sorted(EXCLUDED_SHOWS)),
+    re.IGNORECASE,
+)
+
 
 def is_numbered_episode(title: str) -> bool:
     """
@@ -30,15 +38,7 @@ def is_numbered_episode(title: str) -> bool:
     if not title:
         return False
 
-    # Must start with digits
-    if not re.match(r'^\d+', title):
-        return False
-
-    # Must end with date in parentheses: (M/D/YY) or (MM/DD/YY)
-    if not re.search(r'\(\d{1,2}/\d{1,2}/\d{2,4}\)\s*$', title):
-        return False
-
-    return True
+    return _NUMBERED_RE.match(title) is not None
 
 
 def is_excluded_show(title: str) -> bool:
@@ -56,8 +56,7 @@ def is_excluded_show(title: str) -> bool:
     if not title:
         return False
 
-    title_lower = title.lower()
-    return any(show in title_lower for show in EXCLUDED_SHOWS)
+    return _EXCLUDED_RE.search(title) is not None
 
 
 def filter_episodes(
@@ -75,16 +74,24 @@ def filter_episodes(
     Returns:
         Filtered list of episodes.
     """
+    excluded = _EXCLUDED_RE.search
+    numbered = _NUMBERED_RE.match
+
     filtered = []
     for ep in episodes:
         title = ep.title
+        if not title:
+            # Untitled episodes are never excluded and never numbered
+            if not numbered_only:
+                filtered.append(ep)
+            continue
 
         # Always exclude certain shows
-        if is_excluded_show(title):
+        if excluded(title):
             continue
 
         # Optionally filter to numbered episodes only
-        if numbered_only and not is_numbered_episode(title):
+        if numbered_only and not numbered(title):
             continue
 
         filtered.append(ep)
@@ -8,6 +8,9 @@ that can be applied to transcript search queries.
 from dataclasses import dataclass, field
 from typing import Optional
 
+# SQL conditions per filter shape: (date_from, date_to, episode_number, content_type)
+_SHAPE_CACHE: dict[tuple, str] = {}
+
 
 @dataclass
 class EpisodeFilter:
@@ -104,28 +107,52 @@ class EpisodeFilter:
             # sql = "e.published_at >= %s"
             # params = ["2023-01-01"]
         """
-        conditions = []
-        params = []
+        shape = self._shape()
+        sql = _SHAPE_CACHE.get(shape)
+        if sql is None:
+            sql = _SHAPE_CACHE.setdefault(shape, self._conditions_for(shape))
 
+        params = []
         if self.date_from:
-            conditions.append("e.published_at >= %s")
             params.append(self.date_from)
-
         if self.date_to:
-            conditions.append("e.published_at <= %s")
             params.append(self.date_to + " 23:59:59")
-
         if self.episode_number is not None:
+            params.append(f"^0*{self.episode_number} - ")
+
+        return sql, params
+
+    def _shape(self) -> tuple:
+        """Return which filters are set; filters with equal shapes share SQL."""
+        return (
+            bool(self.date_from),
+            bool(self.date_to),
+            self.episode_number is not None,
+            self.content_type,
+        )
+
+    @staticmethod
+    def _conditions_for(shape: tuple) -> str:
+        """Render the SQL conditions for a filter shape."""
+        has_date_from, has_date_to, has_episode_number, content_type = shape
+        conditions = []
+
+        if has_date_from:
+            conditions.append("e.published_at >= %s")
+
+        if has_date_to:
+            conditions.append("e.published_at <= %s")
+
+        if has_episode_number:
             # Episode titles have format "NNNN - Title", extract and match the number
             conditions.append("e.title ~ %s")
-            params.append(f"^0*{self.episode_number} - ")
 
-        if self.content_type == "free":
+        if content_type == "free":
             conditions.append("e.is_free = true")
-        elif self.content_type == "premium":
+        elif content_type == "premium":
             conditions.append("e.is_free = false")
 
-        return " AND ".join(conditions), params
+        return " AND ".join(conditions)
 
     def build_clause(self) -> tuple[str, list]:
         """
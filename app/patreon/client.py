@@ -1,11 +1,23 @@
 import os
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Optional
 from dataclasses import dataclass
 
 PATREON_API_BASE = "https://www.patreon.com/api"
 CHAPO_CREATOR_ID = "372319"  # Chapo Trap House campaign ID
 
+# Keep-alive connections held open to patreon.com, and per-request timeout
+HTTP_POOL_MAXSIZE = 20
+REQUEST_TIMEOUT = 30  # seconds
+
+# Posts requested per page when paginating through all episodes
+PAGE_SIZE = 100
+
 @dataclass
 class PatreonEpisode:
     id: str
@@ -33,6 +45,11 @@ class PatreonClient:
             )
 
         self.session = requests.Session()
+        # Reuse TLS connections across paginated API calls
+        self.session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE, pool_block=True),
+        )
         self.session.cookies.set("session_id", self.session_id, domain=".patreon.com")
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
@@ -50,6 +67,11 @@ class PatreonClient:
         Returns:
             Tuple of (episodes list, next cursor or None).
         """
+        data = self._fetch_posts(limit, cursor)
+        return self._parse_episodes(data), self._next_cursor(data)
+
+    def _fetch_posts(self, limit: int, cursor: Optional[str]) -> dict:
+        """Request one page of posts and return the decoded JSON:API document."""
         params = {
             "include": "audio,audio_preview",
             "fields[post]": "title,published_at,post_file,audio",
@@ -65,33 +87,46 @@ class PatreonClient:
 
         response = self.session.get(
             f"{PATREON_API_BASE}/posts",
-            params=params
+            params=params,
+            timeout=REQUEST_TIMEOUT
         )
         response.raise_for_status()
+        return orjson.loads(response.content)
 
-        data = response.json()
-        episodes = []
+    @staticmethod
+    def _audio_map(data: dict) -> dict[str, Optional[str]]:
+        """Map audio media ids in a document's included resources to download URLs.
 
-        # Extract audio data from included resources
+        Entries keep the order they appear in, so the first audio resource is first.
+        """
         audio_map = {}
-        for included in data.get("included", []):
-            if included.get("type") == "media":
-                mimetype = included.get("attributes", {}).get("mimetype") or ""
-                if mimetype.startswith("audio/"):
-                    audio_map[included["id"]] = included.get("attributes", {}).get("download_url")
+        for included in data.get("included") or ():
+            if included.get("type") != "media":
+                continue
+            attrs = included.get("attributes") or {}
+            if (attrs.get("mimetype") or "").startswith("audio/"):
+                audio_map[included["id"]] = attrs.get("download_url")
+        return audio_map
+
+    @staticmethod
+    def _parse_episodes(data: dict) -> list[PatreonEpisode]:
+        """Build episodes from a page of posts, resolving their audio URLs."""
+        audio_url_for = PatreonClient._audio_map(data).get
 
-        for post in data.get("data", []):
-            attrs = post.get("attributes", {})
-            relationships = post.get("relationships", {})
+        episodes = []
+        append = episodes.append
+        for post in data.get("data") or ():
+            attrs = post.get("attributes") or {}
 
             # Get audio URL from relationships
             audio_url = None
-            audio_data = relationships.get("audio", {}).get("data")
-            if audio_data:
-                audio_id = audio_data.get("id")
-                audio_url = audio_map.get(audio_id)
+            relationships = post.get("relationships")
+            if relationships:
+                audio_data = (relationships.get("audio") or {}).get("data")
+                if audio_data:
+                    audio_url = audio_url_for(audio_data.get("id"))
 
-            episodes.append(PatreonEpisode(
+            append(PatreonEpisode(
                 id=post["id"],
                 title=attrs.get("title", "Untitled"),
                 audio_url=audio_url,
@@ -99,23 +134,26 @@ class PatreonClient:
                 duration_seconds=None,  # Duration not always available in API
             ))
 
-        # Get next cursor for pagination
-        next_cursor = None
-        links = data.get("links", {})
-        if "next" in links:
-            # Extract cursor from next URL
-            import urllib.parse
-            next_url = links["next"]
-            parsed = urllib.parse.urlparse(next_url)
-            query_params = urllib.parse.parse_qs(parsed.query)
-            next_cursor = query_params.get("page[cursor]", [None])[0]
+        return episodes
 
-        return episodes, next_cursor
+    @staticmethod
+    def _next_cursor(data: dict) -> Optional[str]:
+        """Extract the next page cursor from a page's links, if any."""
+        links = data.get("links", {})
+        if "next" not in links:
+            return None
+        parsed = urllib.parse.urlparse(links["next"])
+        query_params = urllib.parse.parse_qs(parsed.query)
+        return query_params.get("page[cursor]", [None])[0]
 
     def get_all_episodes(self, max_episodes: int = 1000) -> list[PatreonEpisode]:
         """
         Fetch all episodes, handling pagination.
 
+        Pages are chained by opaque cursors, so they cannot be requested out of
+        order. Instead the next page is requested in the background as soon as
+        its cursor is known, while the current page is being parsed.
+
         Args:
             max_episodes: Maximum total episodes to fetch.
 
@@ -123,14 +161,21 @@ class PatreonClient:
             List of all episodes.
         """
         all_episodes = []
-        cursor = None
 
-        while len(all_episodes) < max_episodes:
-            episodes, cursor = self.get_episodes(limit=100, cursor=cursor)
-            all_episodes.extend(episodes)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            data = self._fetch_posts(PAGE_SIZE, None)
+            while True:
+                cursor = self._next_cursor(data)
+                page_size = len(data.get("data", []))
+                next_page = None
+                if cursor and page_size and len(all_episodes) + page_size < max_episodes:
+                    next_page = executor.submit(self._fetch_posts, PAGE_SIZE, cursor)
 
-            if not cursor or not episodes:
-                break
+                all_episodes.extend(self._parse_episodes(data))
+
+                if next_page is None:
+                    break
+                data = next_page.result()
 
         return all_episodes[:max_episodes]
 
@@ -150,17 +195,10 @@ class PatreonClient:
                 "include": "audio",
                 "fields[post]": "title,post_file",
                 "fields[media]": "download_url,mimetype",
-            }
+            },
+            timeout=REQUEST_TIMEOUT
         )
         response.raise_for_status()
 
-        data = response.json()
-
-        # Find audio in included resources
-        for included in data.get("included", []):
-            if included.get("type") == "media":
-                attrs = included.get("attributes", {})
-                if attrs.get("mimetype", "").startswith("audio/"):
-                    return attrs.get("download_url")
-
-        return None
+        # First audio resource among the included media
+        return next(iter(self._audio_map(orjson.loads(response.content)).values()), None)
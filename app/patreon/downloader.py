@@ -1,13 +1,19 @@
+import io
 import os
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 from dataclasses import dataclass
 
 DEFAULT_DOWNLOAD_DIR = "downloads/audio"
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+DEFAULT_DOWNLOAD_WORKERS = 8
 
 @dataclass
 class DownloadResult:
@@ -15,6 +21,8 @@ class DownloadResult:
     file_path: Optional[str]
     error: Optional[str] = None
     file_size: int = 0
+    # Audio held in memory by download_to_memory, instead of file_path
+    audio: Optional[BinaryIO] = None
 
 class AudioDownloader:
     """Downloads audio files from Patreon with retry support."""
@@ -29,8 +37,14 @@ class AudioDownloader:
         """
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        # File name -> size for files in download_dir, scanned on first use
+        self._present: Optional[dict[str, int]] = None
 
         self.session = requests.Session()
+        # Enough pooled connections per host for download_many's workers
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_DOWNLOAD_WORKERS * 2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.cookies.set("session_id", session_id, domain=".patreon.com")
         self.session.headers.update({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
@@ -40,10 +54,52 @@ class AudioDownloader:
         """Get the local file path for an episode."""
         return self.download_dir / f"{episode_id}.{extension}"
 
+    def _present_files(self) -> dict[str, int]:
+        """Get sizes of files in download_dir from a single directory scan."""
+        if self._present is None:
+            with os.scandir(self.download_dir) as entries:
+                self._present = {
+                    entry.name: entry.stat().st_size
+                    for entry in entries if entry.is_file()
+                }
+        return self._present
+
     def is_downloaded(self, episode_id: str) -> bool:
-        """Check if an episode has already been downloaded."""
+        """Check if an episode has already been downloaded.
+
+        Answered from a directory listing taken once per downloader, so
+        checking many episodes costs one scan rather than a stat per episode.
+        """
+        return self._present_files().get(self.get_file_path(episode_id).name, 0) > 0
+
+    def cached_download(self, episode_id: str) -> Optional[DownloadResult]:
+        """
+        Get the result for an episode whose audio is already on disk.
+
+        Files only appear under their final name once fully written (partial
+        downloads stay in .tmp), so a present, non-empty file is complete and
+        needs no audio URL or request to reuse.
+
+        Args:
+            episode_id: Episode ID the file is named after.
+
+        Returns:
+            A successful DownloadResult for the local file, or None if it is missing.
+        """
+        if not self.is_downloaded(episode_id):
+            return None
         file_path = self.get_file_path(episode_id)
-        return file_path.exists() and file_path.stat().st_size > 0
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
+            # Removed since the directory was scanned (e.g. audio cleanup)
+            self._present_files().pop(file_path.name, None)
+            return None
+        return DownloadResult(
+            success=True,
+            file_path=str(file_path),
+            file_size=file_size
+        )
 
     def download(
         self,
@@ -62,20 +118,18 @@ class AudioDownloader:
         Returns:
             DownloadResult with success status and file path.
         """
-        if self.is_downloaded(episode_id):
-            file_path = self.get_file_path(episode_id)
-            return DownloadResult(
-                success=True,
-                file_path=str(file_path),
-                file_size=file_path.stat().st_size
-            )
+        cached = self.cached_download(episode_id)
+        if cached is not None:
+            return cached
 
         file_path = self.get_file_path(episode_id)
         temp_path = file_path.with_suffix(".tmp")
 
         for attempt in range(max_retries):
             try:
-                return self._download_with_resume(audio_url, file_path, temp_path)
+                result = self._download_with_resume(audio_url, file_path, temp_path)
+                self._present_files()[file_path.name] = result.file_size
+                return result
             except Exception as e:
                 if attempt < max_retries - 1:
                     time.sleep(RETRY_DELAY * (attempt + 1))
@@ -137,11 +191,11 @@ class AudioDownloader:
         # Get total size
         total_size = int(response.headers.get("content-length", 0)) + downloaded_size
 
-        # Download in chunks
+        # Copy the body straight to disk in large blocks; decode_content keeps
+        # gzip/deflate transfer encodings handled as iter_content would
+        response.raw.decode_content = True
         with open(temp_path, mode) as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+            shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
 
         # Rename temp file to final
         temp_path.rename(file_path)
@@ -152,6 +206,52 @@ class AudioDownloader:
             file_size=file_path.stat().st_size
         )
 
+    def download_to_memory(
+        self,
+        audio_url: str,
+        episode_id: str,
+        max_retries: int = MAX_RETRIES
+    ) -> DownloadResult:
+        """
+        Download an audio file into memory, without writing it to disk.
+
+        For audio that is only read once (transcribed, then discarded). Failed
+        attempts restart from the beginning rather than resuming.
+
+        Args:
+            audio_url: URL to download from.
+            episode_id: Episode ID, used only for error messages.
+            max_retries: Maximum number of retry attempts.
+
+        Returns:
+            DownloadResult whose audio is a BytesIO positioned at the start,
+            with file_path None.
+        """
+        for attempt in range(max_retries):
+            try:
+                response = self.session.get(audio_url, stream=True)
+                response.raise_for_status()
+                buffer = io.BytesIO()
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, buffer, DOWNLOAD_CHUNK_SIZE)
+                file_size = buffer.tell()
+                buffer.seek(0)
+                return DownloadResult(
+                    success=True,
+                    file_path=None,
+                    file_size=file_size,
+                    audio=buffer,
+                )
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    time.sleep(RETRY_DELAY * (attempt + 1))
+                else:
+                    return DownloadResult(
+                        success=False,
+                        file_path=None,
+                        error=f"Download of {episode_id} failed: {e}"
+                    )
+
     def download_episode(self, episode) -> DownloadResult:
         """
         Download audio for an episode object.
@@ -170,3 +270,24 @@ class AudioDownloader:
             )
 
         return self.download(episode.audio_url, episode.id)
+
+    def download_many(
+        self,
+        episodes: list,
+        max_workers: int = DEFAULT_DOWNLOAD_WORKERS
+    ) -> list[DownloadResult]:
+        """
+        Download audio for several episodes concurrently.
+
+        Args:
+            episodes: Episode objects with id and audio_url attributes.
+            max_workers: Maximum number of simultaneous downloads.
+
+        Returns:
+            DownloadResult for each episode, in the same order as episodes.
+        """
+        if not episodes:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(episodes))) as executor:
+            return list(executor.map(self.download_episode, episodes))
@@ -1,23 +1,104 @@
 """Episode processing pipeline - orchestrates fetch, download, transcribe, store."""
 import os
 import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from faster_whisper import decode_audio
+
 from app.patreon.client import PatreonClient, PatreonEpisode
-from app.patreon.downloader import AudioDownloader
-from app.transcription.whisper_transcriber import get_transcriber
+from app.patreon.downloader import AudioDownloader, DownloadResult
+from app.transcription.whisper_transcriber import TranscriptResult, get_transcriber
+from app.transcription.audio_cache import SAMPLING_RATE, DecodedAudioCache
 from app.transcription.storage import TranscriptStorage
-from app.transcription.diarization import get_diarizer, assign_speakers_to_words
+from app.transcription.diarization import (
+    get_diarizer,
+    assign_speakers_to_words,
+    waveform_input,
+    word_times,
+)
 from app.transcription.boundary_refinement import refine_speaker_boundaries
 from app.transcription.corrections import load_corrections, apply_corrections
 from app.db.repository import EpisodeRepository
 from app.db.models import Episode
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default episodes prefetched in process_unprocessed: concurrent downloads,
+# and episodes allowed to wait between stages (each holds its audio)
+DEFAULT_PREFETCH_EPISODES = 2
+
+_STAGE_DONE = object()
+
+# Whisper keeps only the last 223 tokens of initial_prompt; vocabulary hints
+# are cut to this estimated budget so the first hints are the ones kept
+VOCABULARY_PROMPT_TOKENS = 200
+
+# Rough Whisper tokens per whitespace-separated word of a name
+TOKENS_PER_WORD = 1.3
+
+_VOCABULARY_PROMPT_PREFIX = "Names mentioned: "
+
+
+@lru_cache(maxsize=8)
+def _read_vocabulary(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    """Non-empty stripped lines of a vocabulary file, without repeats.
+
+    Lines repeating an earlier one up to case are dropped, keeping the first
+    spelling. Keyed on the file's mtime and size as well as its path, so an
+    edited file is re-read while repeated pipelines reuse the parsed hints.
+    """
+    with open(path, "rb") as f:
+        lines = f.read().decode("utf-8").splitlines()
+    hints = {}
+    for line in filter(None, map(str.strip, lines)):
+        hints.setdefault(line.casefold(), line)
+    return tuple(hints.values())
+
+
+def _vocabulary_prompt(hints: list[str]) -> Optional[str]:
+    """Whisper initial_prompt naming as many hints as fit VOCABULARY_PROMPT_TOKENS.
+
+    Returns:
+        The prompt, or None if there are no hints.
+    """
+    budget = VOCABULARY_PROMPT_TOKENS - len(_VOCABULARY_PROMPT_PREFIX.split()) * TOKENS_PER_WORD
+    kept = []
+    for hint in hints:
+        budget -= len(hint.split()) * TOKENS_PER_WORD
+        if budget < 0:
+            logger.warning(
+                "Vocabulary prompt limited to %s of %s hints (~%s tokens)",
+                len(kept), len(hints), VOCABULARY_PROMPT_TOKENS,
+            )
+            break
+        kept.append(hint)
+    if not kept:
+        return None
+    return _VOCABULARY_PROMPT_PREFIX + ", ".join(kept) + "."
+
+
+def _cuda_available() -> bool:
+    """Whether torch can see a CUDA device (False when torch is not installed)."""
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def _count_speakers(segments) -> int:
+    """Number of distinct non-empty speaker labels across word segments."""
+    speakers = {s.speaker for s in segments}
+    speakers.discard(None)
+    speakers.discard("")
+    return len(speakers)
+
 
 class EpisodePipeline:
     """Orchestrates the full episode processing pipeline."""
@@ -26,6 +107,15 @@ class EpisodePipeline:
         self,
         session_id: Optional[str] = None,
         whisper_model: str = "base",
+        whisper_batch_size: Optional[int] = None,
+        whisper_precision: Optional[str] = None,
+        whisper_quantize: bool = False,
+        audio_cache_dir: Optional[str] = None,
+        diarization_cache_dir: Optional[str] = None,
+        prefetch_episodes: int = DEFAULT_PREFETCH_EPISODES,
+        num_gpus: int = 1,
+        parallel_diarization: bool = True,
+        cpu_diarization: str = "fast",
         download_dir: str = "downloads/audio",
         cleanup_audio: bool = True,
         enable_diarization: bool = True,
@@ -48,6 +138,24 @@ class EpisodePipeline:
         Args:
             session_id: Patreon session_id cookie (or from env).
             whisper_model: Whisper model size to use.
+            whisper_batch_size: Audio chunks decoded per batched Whisper forward
+                pass (None uses WHISPER_BATCH_SIZE, or sequential decoding).
+            whisper_precision: Whisper inference precision ("fp32", "fp16" or
+                "bf16"). None picks bf16/fp16 on GPU by capability, int8 on CPU.
+            whisper_quantize: Load int8-quantized Whisper weights.
+            audio_cache_dir: Directory to cache decoded 16 kHz audio in, so
+                re-transcribing an episode skips decoding (None disables).
+            diarization_cache_dir: Directory to cache diarization results in, so
+                re-running an episode skips pyannote (None disables).
+            prefetch_episodes: How many episodes process_unprocessed downloads
+                ahead of transcription; also the number of concurrent downloads.
+            num_gpus: Whisper models to load, one per CUDA device (cuda:0..N-1).
+                process_unprocessed transcribes that many episodes at once.
+            parallel_diarization: Diarize an episode while Whisper transcribes it,
+                rather than afterwards. Disable if both models do not fit in GPU
+                memory at once.
+            cpu_diarization: Diarization mode when no GPU is available: "full",
+                "fast" (coarser segmentation window) or "skip" (no diarization).
             download_dir: Directory for downloaded audio files.
             cleanup_audio: Delete audio files after successful transcription.
             enable_diarization: Whether to run speaker diarization.
@@ -68,6 +176,12 @@ class EpisodePipeline:
         if not self.session_id:
             raise ValueError("PATREON_SESSION_ID required")
 
+        if prefetch_episodes < 1:
+            raise ValueError("prefetch_episodes must be at least 1")
+        if num_gpus < 1:
+            raise ValueError("num_gpus must be at least 1")
+        self.prefetch_episodes = prefetch_episodes
+        self.parallel_diarization = parallel_diarization
         self.cleanup_audio = cleanup_audio
         self.enable_diarization = enable_diarization
         self.enable_speaker_id = enable_speaker_id
@@ -75,10 +189,11 @@ class EpisodePipeline:
         self.patreon = PatreonClient(self.session_id)
         self.downloader = AudioDownloader(self.session_id, download_dir)
         self.storage = TranscriptStorage()
+        self.audio_cache = DecodedAudioCache(audio_cache_dir) if audio_cache_dir else None
         self.episode_repo = EpisodeRepository()
         self.corrections = load_corrections(corrections_file)
         if self.corrections:
-            logger.info(f"Loaded {len(self.corrections)} word corrections")
+            logger.info("Loaded %s word corrections", len(self.corrections))
 
         # Initialize LLM corrector if enabled
         self.llm_corrector = None
@@ -92,19 +207,39 @@ class EpisodePipeline:
 
         # Load vocabulary hints from file and build initial_prompt for Whisper
         self.vocabulary_hints = self._load_vocabulary(vocabulary_file)
-        initial_prompt = None
-        if self.vocabulary_hints:
-            initial_prompt = "Names mentioned: " + ", ".join(self.vocabulary_hints) + "."
-        self.transcriber = get_transcriber(whisper_model, initial_prompt=initial_prompt, vad_filter=enable_vad)
+        initial_prompt = _vocabulary_prompt(self.vocabulary_hints)
+        self.transcribers = [
+            get_transcriber(
+                whisper_model,
+                initial_prompt=initial_prompt,
+                vad_filter=enable_vad,
+                batch_size=whisper_batch_size,
+                precision=whisper_precision,
+                quantize=whisper_quantize,
+                device_index=device_index,
+            )
+            for device_index in range(num_gpus)
+        ]
+        self.transcriber = self.transcribers[0]
+
+        # Diarization and speaker ID share one model across transcribe workers
+        self._speaker_lock = threading.Lock()
 
         # Initialize diarizer if enabled
         self.diarizer = None
-        if enable_diarization:
+        if enable_diarization and cpu_diarization == "skip" and not _cuda_available():
+            logger.warning("No GPU available and cpu_diarization is 'skip'. Diarization disabled.")
+        elif enable_diarization:
             try:
-                self.diarizer = get_diarizer(hf_token=hf_token, num_speakers=num_speakers)
+                self.diarizer = get_diarizer(
+                    hf_token=hf_token,
+                    num_speakers=num_speakers,
+                    cache_dir=diarization_cache_dir,
+                    cpu_mode=cpu_diarization,
+                )
                 logger.info("Speaker diarization enabled")
             except Exception as e:
-                logger.warning(f"Could not initialize diarizer: {e}. Diarization disabled.")
+                logger.warning("Could not initialize diarizer: %s. Diarization disabled.", e)
 
         # Initialize speaker identifier if enabled
         self.speaker_identifier = None
@@ -118,7 +253,7 @@ class EpisodePipeline:
                 )
                 logger.info("Speaker identification enabled")
             except Exception as e:
-                logger.warning(f"Could not initialize speaker identifier: {e}. Speaker ID disabled.")
+                logger.warning("Could not initialize speaker identifier: %s. Speaker ID disabled.", e)
 
     def _resolve_audio_url(self, episode: Episode) -> Optional[str]:
         """Fetch a fresh audio URL from Patreon, falling back to stored URL."""
@@ -128,7 +263,7 @@ class EpisodePipeline:
                 if fresh_url:
                     return fresh_url
             except Exception as e:
-                logger.warning(f"  Could not fetch fresh audio URL: {e}")
+                logger.warning("  Could not fetch fresh audio URL: %s", e)
         return episode.audio_url
 
     def _load_vocabulary(self, vocabulary_file: Optional[str]) -> list[str]:
@@ -145,19 +280,16 @@ class EpisodePipeline:
 
         path = Path(vocabulary_file)
         if not path.exists():
-            logger.warning(f"Vocabulary file not found: {vocabulary_file}")
+            logger.warning("Vocabulary file not found: %s", vocabulary_file)
             return []
 
         try:
-            hints = []
-            for line in path.read_text().splitlines():
-                line = line.strip()
-                if line:
-                    hints.append(line)
-            logger.info(f"Loaded {len(hints)} vocabulary hints from {vocabulary_file}")
+            stat = path.stat()
+            hints = list(_read_vocabulary(str(path), stat.st_mtime_ns, stat.st_size))
+            logger.info("Loaded %s vocabulary hints from %s", len(hints), vocabulary_file)
             return hints
         except Exception as e:
-            logger.warning(f"Failed to load vocabulary file: {e}")
+            logger.warning("Failed to load vocabulary file: %s", e)
             return []
 
     def sync_episodes(self, max_episodes: int = 100) -> list[Episode]:
@@ -170,24 +302,23 @@ class EpisodePipeline:
         Returns:
             List of Episode objects (new and existing).
         """
-        logger.info(f"Fetching up to {max_episodes} episodes from Patreon...")
+        logger.info("Fetching up to %s episodes from Patreon...", max_episodes)
         patreon_episodes = self.patreon.get_all_episodes(max_episodes)
-        logger.info(f"Found {len(patreon_episodes)} episodes")
+        logger.info("Found %s episodes", len(patreon_episodes))
 
-        episodes = []
-        for pe in patreon_episodes:
-            episode = Episode(
+        episodes = self.episode_repo.bulk_create([
+            Episode(
                 id=None,
                 patreon_id=pe.id,
                 title=pe.title,
                 audio_url=pe.audio_url,
-                published_at=datetime.fromisoformat(pe.published_at.replace("Z", "+00:00")) if pe.published_at else None,
+                published_at=datetime.fromisoformat(pe.published_at) if pe.published_at else None,
                 duration_seconds=pe.duration_seconds
             )
-            saved = self.episode_repo.create(episode)
-            episodes.append(saved)
+            for pe in patreon_episodes
+        ])
 
-        logger.info(f"Synced {len(episodes)} episodes to database")
+        logger.info("Synced %s episodes to database", len(episodes))
         return episodes
 
     def process_episode(self, episode: Episode, force: bool = False) -> bool:
@@ -209,90 +340,146 @@ class EpisodePipeline:
                 "Episode must be saved to database before processing."
             )
 
-        logger.info(f"Processing: {episode.title}")
+        logger.info("Processing: %s", episode.title)
 
         # Skip if already processed
         if episode.processed and not force:
-            logger.info(f"  Already processed, skipping")
+            logger.info("  Already processed, skipping")
             return True
 
+        download_result = self._download_stage(episode)
+        if download_result is None:
+            return False
+
+        transcript = self._transcribe_stage(episode, download_result)
+        if transcript is None:
+            return False
+
+        return self._store_stage(episode, download_result, transcript)
+
+    def _download_stage(self, episode: Episode) -> Optional[DownloadResult]:
+        """Resolve the audio URL and download it.
+
+        Returns:
+            The successful DownloadResult, or None if the episode cannot be downloaded.
+        """
+        # Audio left on disk by an earlier run needs no fresh URL or request
+        download_result = self.downloader.cached_download(episode.patreon_id)
+        if download_result is not None:
+            logger.info("  Using downloaded audio: %s bytes", download_result.file_size)
+            return download_result
+
         # Resolve audio URL (fresh from Patreon, fallback to stored)
         audio_url = self._resolve_audio_url(episode)
         if not audio_url:
-            logger.warning(f"  No audio URL available, skipping")
-            return False
+            logger.warning("  No audio URL available, skipping")
+            return None
 
         try:
-            # Download
-            logger.info(f"  Downloading audio...")
-            download_result = self.downloader.download(audio_url, episode.patreon_id)
+            logger.info("  Downloading audio...")
+            if self._download_in_memory(episode):
+                download_result = self.downloader.download_to_memory(audio_url, episode.patreon_id)
+            else:
+                download_result = self.downloader.download(audio_url, episode.patreon_id)
             if not download_result.success:
-                logger.error(f"  Download failed: {download_result.error}")
-                return False
-            logger.info(f"  Downloaded: {download_result.file_size} bytes")
+                logger.error("  Download failed: %s", download_result.error)
+                return None
+            logger.info("  Downloaded: %s bytes", download_result.file_size)
+            return download_result
+        except Exception as e:
+            logger.error("  Error processing episode: %s", e)
+            return None
+
+    def _download_in_memory(self, episode: Episode) -> bool:
+        """Whether to keep this episode's audio in memory instead of on disk.
+
+        Only when the audio would be deleted right after transcription anyway
+        and nothing but Whisper reads it: diarization and speaker
+        identification need a file path. Audio already on disk is reused.
+        """
+        return (
+            self.cleanup_audio
+            and self.diarizer is None
+            and not self.downloader.is_downloaded(episode.patreon_id)
+        )
+
+    def _transcribe_stage(
+        self,
+        episode: Episode,
+        download_result: DownloadResult,
+        transcriber=None,
+    ) -> Optional[TranscriptResult]:
+        """Transcribe downloaded audio, then label speakers and apply corrections.
 
+        Args:
+            episode: Episode being processed.
+            download_result: Its downloaded audio.
+            transcriber: Transcriber to use (default: self.transcriber).
+
+        Returns:
+            The finished transcript, or None if transcription failed.
+        """
+        try:
             # Transcribe
-            logger.info(f"  Transcribing...")
-            transcript = self.transcriber.transcribe(download_result.file_path)
-            logger.info(f"  Transcribed: {len(transcript.segments)} words")
+            logger.info("  Transcribing...")
+            audio = download_result.audio if download_result.audio is not None else download_result.file_path
+            if self.audio_cache:
+                audio = self.audio_cache.decoded(episode.patreon_id, audio)
+            elif self.diarizer:
+                # Decode once; Whisper and pyannote both take the samples
+                audio = decode_audio(audio, sampling_rate=SAMPLING_RATE)
+            transcriber = transcriber or self.transcriber
+            speakers = None
+            if self.diarizer and self.parallel_diarization:
+                # Whisper and pyannote are independent; run them side by side
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-diarize") as speaker_pool:
+                    speakers = speaker_pool.submit(self._speaker_stage, audio)
+                    transcript = transcriber.transcribe(audio)
+            else:
+                transcript = transcriber.transcribe(audio)
+            logger.info("  Transcribed: %s words", len(transcript.segments))
 
             # Speaker diarization (optional)
             if self.diarizer:
-                logger.info(f"  Running speaker diarization...")
                 try:
-                    speaker_segments = self.diarizer.diarize(download_result.file_path)
-
-                    # Speaker identification (optional) — map labels to real names
-                    label_map, score_map = {}, {}
-                    if self.speaker_identifier:
-                        logger.info(f"  Running speaker identification...")
-                        try:
-                            label_map, score_map = self.speaker_identifier.identify(
-                                download_result.file_path, speaker_segments,
-                                expected_speakers=self.expected_speakers,
-                            )
-                            if label_map:
-                                speaker_segments = self.speaker_identifier.relabel_segments(
-                                    speaker_segments, label_map, score_map
-                                )
-                                logger.info(f"  Identified speakers: {label_map}")
-                        except Exception as e:
-                            logger.warning(f"  Speaker identification failed (continuing with generic labels): {e}")
-
+                    speaker_segments, speaker_audio, label_map, score_map = (
+                        speakers.result() if speakers else self._speaker_stage(audio)
+                    )
+                    times = word_times(transcript.segments)
                     transcript.segments = assign_speakers_to_words(
-                        transcript.segments, speaker_segments
+                        transcript.segments, speaker_segments, times
                     )
 
                     # Boundary refinement — runs when speaker ID is active
                     if self.speaker_identifier and label_map:
-                        logger.info(f"  Refining speaker boundaries...")
+                        logger.info("  Refining speaker boundaries...")
                         try:
-                            audio_input = self.speaker_identifier._load_audio(
-                                download_result.file_path
-                            )
-                            transcript.segments = refine_speaker_boundaries(
-                                transcript.segments,
-                                speaker_segments,
-                                audio_input,
-                                self.speaker_identifier,
-                                label_map,
-                                score_map,
-                            )
-                            logger.info(f"  Boundary refinement complete")
+                            with self._speaker_lock:
+                                transcript.segments = refine_speaker_boundaries(
+                                    transcript.segments,
+                                    speaker_segments,
+                                    speaker_audio,
+                                    self.speaker_identifier,
+                                    label_map,
+                                    score_map,
+                                    times,
+                                )
+                            logger.info("  Boundary refinement complete")
                         except Exception as e:
-                            logger.warning(f"  Boundary refinement failed (continuing without): {e}")
+                            logger.warning("  Boundary refinement failed (continuing without): %s", e)
 
-                    speakers_found = len(set(
-                        s.speaker for s in transcript.segments if s.speaker
-                    ))
-                    logger.info(f"  Diarization complete: {speakers_found} unique speakers")
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "  Diarization complete: %s unique speakers",
+                            _count_speakers(transcript.segments),
+                        )
                 except Exception as e:
-                    logger.warning(f"  Diarization failed (continuing without): {e}")
+                    logger.warning("  Diarization failed (continuing without): %s", e)
 
             # Apply word corrections (after transcription, before storage)
             if self.corrections:
                 transcript.segments = apply_corrections(transcript.segments, self.corrections)
-                logger.info(f"  Applied {len(self.corrections)} word corrections")
+                logger.info("  Applied %s word corrections", len(self.corrections))
 
             # Apply LLM corrections (optional, after correction dictionary)
             if self.llm_corrector:
@@ -300,23 +487,70 @@ class EpisodePipeline:
                     s.word_confidence is not None for s in transcript.segments
                 )
                 if has_confidence:
-                    logger.info(f"  Running LLM correction...")
+                    logger.info("  Running LLM correction...")
                     transcript.segments = self.llm_corrector.correct_segments(
                         transcript.segments
                     )
-                    logger.info(f"  LLM correction complete")
+                    logger.info("  LLM correction complete")
                 else:
-                    logger.warning(f"  Skipping LLM correction: no word_confidence data")
+                    logger.warning("  Skipping LLM correction: no word_confidence data")
+
+            return transcript
+
+        except Exception as e:
+            logger.error("  Error processing episode: %s", e)
+            return None
+
+    def _speaker_stage(self, audio) -> tuple:
+        """Diarize decoded audio and map its speaker labels to known voices.
 
-            # Store
-            logger.info(f"  Storing transcript...")
-            self.storage.delete_episode_transcript(episode.id)  # Clear any existing
-            count = self.storage.store_transcript(episode.id, transcript)
-            logger.info(f"  Stored: {count} segments")
+        Needs only the audio, so it can run while Whisper transcribes.
 
-            # Mark processed
-            self.episode_repo.mark_processed(episode.id)
-            logger.info(f"  Done!")
+        Args:
+            audio: Mono float32 samples at SAMPLING_RATE.
+
+        Returns:
+            Tuple of (speaker_segments, speaker_audio, label_map, score_map).
+            speaker_audio is the waveform dict the speaker models read; the
+            maps are empty when speaker identification is off or fails.
+        """
+        with self._speaker_lock:
+            logger.info("  Running speaker diarization...")
+            # One in-memory waveform for diarization, identification and refinement
+            speaker_audio = waveform_input({"waveform": audio, "sample_rate": SAMPLING_RATE})
+            speaker_segments = self.diarizer.diarize(speaker_audio)
+
+            # Speaker identification (optional) — map labels to real names
+            label_map, score_map = {}, {}
+            if self.speaker_identifier:
+                logger.info("  Running speaker identification...")
+                try:
+                    label_map, score_map = self.speaker_identifier.identify(
+                        speaker_audio, speaker_segments,
+                        expected_speakers=self.expected_speakers,
+                    )
+                    if label_map:
+                        speaker_segments = self.speaker_identifier.relabel_segments(
+                            speaker_segments, label_map, score_map
+                        )
+                        logger.info("  Identified speakers: %s", label_map)
+                except Exception as e:
+                    logger.warning("  Speaker identification failed (continuing with generic labels): %s", e)
+
+        return speaker_segments, speaker_audio, label_map, score_map
+
+    def _store_stage(self, episode: Episode, download_result: DownloadResult, transcript: TranscriptResult) -> bool:
+        """Replace the episode's stored transcript, mark it processed and clean up audio.
+
+        Returns:
+            True if successful, False otherwise.
+        """
+        try:
+            # Store and mark processed in one transaction
+            logger.info("  Storing transcript...")
+            count = self.storage.replace_transcript(episode.id, transcript, mark_processed=True)
+            logger.info("  Stored: %s segments", count)
+            logger.info("  Done!")
 
             # Cleanup audio file
             if self.cleanup_audio and download_result.file_path:
@@ -325,19 +559,21 @@ class EpisodePipeline:
             return True
 
         except Exception as e:
-            logger.error(f"  Error processing episode: {e}")
+            logger.error("  Error processing episode: %s", e)
             return False
 
     def _cleanup_audio(self, file_path: str) -> None:
         """Delete an audio file after successful transcription."""
         try:
-            path = Path(file_path)
-            if path.exists():
-                size_mb = path.stat().st_size / (1024 * 1024)
-                path.unlink()
-                logger.info(f"  Cleaned up audio file ({size_mb:.1f} MB freed)")
+            # The size is only needed for the log line
+            size = os.path.getsize(file_path) if logger.isEnabledFor(logging.INFO) else None
+            os.unlink(file_path)
+            if size is not None:
+                logger.info("  Cleaned up audio file (%.1f MB freed)", size / (1024 * 1024))
+        except FileNotFoundError:
+            pass
         except OSError as e:
-            logger.warning(f"  Failed to clean up audio file: {e}")
+            logger.warning("  Failed to clean up audio file: %s", e)
 
     def process_single(self, episode_id: int, force: bool = False) -> bool:
         """
@@ -367,30 +603,102 @@ class EpisodePipeline:
             limit: Maximum episodes to process in one run. None for no limit.
             offset: Number of episodes to skip before processing.
             numbered_only: If True, only process numbered episodes.
-            force: If True, reprocess even if already processed.
+            force: Accepted for run()'s signature; the episodes fetched here
+                are never processed, so there is nothing to force.
 
         Returns:
             Dict with processing statistics.
         """
-        all_unprocessed = self.episode_repo.get_unprocessed(numbered_only=numbered_only)
-        if limit is None:
-            episodes = all_unprocessed[offset:]
-        else:
-            episodes = all_unprocessed[offset:offset + limit]
+        episodes = self.episode_repo.get_unprocessed(
+            numbered_only=numbered_only, limit=limit, offset=offset
+        )
         total = len(episodes)
-        logger.info(f"Found {len(all_unprocessed)} unprocessed episodes, processing {total}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Found %s unprocessed episodes, processing %s",
+                self.episode_repo.count_unprocessed(numbered_only=numbered_only), total,
+            )
 
         stats = {"total": total, "success": 0, "failed": 0, "skipped": 0}
-
-        for i, episode in enumerate(episodes, 1):
-            logger.info(f"[{i}/{total}] {episode.title}")
-            if not episode.audio_url:
-                stats["skipped"] += 1
-                continue
-            if self.process_episode(episode, force=force):
-                stats["success"] += 1
-            else:
-                stats["failed"] += 1
+        stats_lock = threading.Lock()
+
+        def count(outcome: str) -> None:
+            with stats_lock:
+                stats[outcome] += 1
+
+        # Stages run concurrently: the next episodes download while the current
+        # one transcribes, and a finished transcript is stored while the next
+        # is transcribed. Bounded queues cap how much audio waits on disk.
+        transcribe_q: queue.Queue = queue.Queue(maxsize=self.prefetch_episodes)
+        store_q: queue.Queue = queue.Queue(maxsize=self.prefetch_episodes)
+
+        def download_worker(episode: Episode) -> None:
+            if episode.id is None:
+                raise ValueError(
+                    f"Cannot process episode '{episode.title}': episode.id is None. "
+                    "Episode must be saved to database before processing."
+                )
+            # get_unprocessed filters on NOT processed, so no per-episode check
+            download_result = self._download_stage(episode)
+            if download_result is None:
+                count("failed")
+                return
+            transcribe_q.put((episode, download_result))
+
+        # One transcribe worker per loaded model (one per GPU); each takes the
+        # next downloaded episode as soon as it is free.
+        def transcribe_worker(transcriber) -> None:
+            # Load the model while the first downloads are still running
+            try:
+                transcriber.warm_up()
+            except Exception as e:
+                logger.warning("Transcriber warm-up failed (continuing): %s", e)
+            while (item := transcribe_q.get()) is not _STAGE_DONE:
+                episode, download_result = item
+                logger.info("Transcribing: %s", episode.title)
+                transcript = self._transcribe_stage(episode, download_result, transcriber)
+                if transcript is None:
+                    count("failed")
+                    continue
+                store_q.put((episode, download_result, transcript))
+            store_q.put(_STAGE_DONE)
+
+        def store_worker() -> None:
+            remaining = len(self.transcribers)
+            while remaining:
+                item = store_q.get()
+                if item is _STAGE_DONE:
+                    remaining -= 1
+                    continue
+                episode = item[0]
+                logger.info("Storing: %s", episode.title)
+                count("success" if self._store_stage(*item) else "failed")
+
+        workers = [
+            threading.Thread(target=transcribe_worker, args=(transcriber,), name=f"pipeline-transcribe-{i}")
+            for i, transcriber in enumerate(self.transcribers)
+        ]
+        workers.append(threading.Thread(target=store_worker, name="pipeline-store"))
+        for worker in workers:
+            worker.start()
+
+        futures = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.prefetch_episodes, thread_name_prefix="pipeline-download") as downloads:
+                for i, episode in enumerate(episodes, 1):
+                    logger.info("[%s/%s] %s", i, total, episode.title)
+                    if not episode.audio_url:
+                        count("skipped")
+                        continue
+                    futures.append(downloads.submit(download_worker, episode))
+        finally:
+            for _ in self.transcribers:
+                transcribe_q.put(_STAGE_DONE)
+            for worker in workers:
+                worker.join()
+
+        for future in futures:
+            future.result()
 
         return stats
 
@@ -412,102 +720,86 @@ class EpisodePipeline:
                 f"Cannot diarize episode '{episode.title}': episode.id is None."
             )
 
-        logger.info(f"Diarizing: {episode.title}")
+        logger.info("Diarizing: %s", episode.title)
 
         # Check if episode has transcript
         if not self.storage.has_transcript(episode.id):
-            logger.warning(f"  No transcript found, skipping")
-            return False
-
-        # Resolve audio URL (fresh from Patreon, fallback to stored)
-        audio_url = self._resolve_audio_url(episode)
-        if not audio_url:
-            logger.warning(f"  No audio URL available, skipping")
+            logger.warning("  No transcript found, skipping")
             return False
 
         # Check if diarizer is available
         if not self.diarizer:
-            logger.error(f"  Diarizer not initialized. Use --diarize flag or set HF_TOKEN.")
+            logger.error("  Diarizer not initialized. Use --diarize flag or set HF_TOKEN.")
             return False
 
-        try:
-            # Download audio
-            logger.info(f"  Downloading audio...")
-            download_result = self.downloader.download(audio_url, episode.patreon_id)
-            if not download_result.success:
-                logger.error(f"  Download failed: {download_result.error}")
+        # Audio left on disk by an earlier run needs no fresh URL or request
+        download_result = self.downloader.cached_download(episode.patreon_id)
+        if download_result is not None:
+            logger.info("  Using downloaded audio: %s bytes", download_result.file_size)
+        else:
+            # Resolve audio URL (fresh from Patreon, fallback to stored)
+            audio_url = self._resolve_audio_url(episode)
+            if not audio_url:
+                logger.warning("  No audio URL available, skipping")
                 return False
-            logger.info(f"  Downloaded: {download_result.file_size} bytes")
+
+        try:
+            if download_result is None:
+                logger.info("  Downloading audio...")
+                download_result = self.downloader.download(audio_url, episode.patreon_id)
+                if not download_result.success:
+                    logger.error("  Download failed: %s", download_result.error)
+                    return False
+                logger.info("  Downloaded: %s bytes", download_result.file_size)
 
             # Get existing transcript segments
-            logger.info(f"  Loading existing transcript...")
+            logger.info("  Loading existing transcript...")
             segments = self.storage.get_segments_for_diarization(episode.id)
-            logger.info(f"  Found {len(segments)} segments")
+            logger.info("  Found %s segments", len(segments))
 
-            # Run diarization
-            logger.info(f"  Running speaker diarization...")
-            speaker_segments = self.diarizer.diarize(download_result.file_path)
-            logger.info(f"  Found {len(speaker_segments)} speaker segments")
-
-            # Speaker identification (optional) — map labels to real names
-            label_map, score_map = {}, {}
-            if self.speaker_identifier:
-                logger.info(f"  Running speaker identification...")
-                try:
-                    label_map, score_map = self.speaker_identifier.identify(
-                        download_result.file_path, speaker_segments,
-                        expected_speakers=self.expected_speakers,
-                    )
-                    if label_map:
-                        speaker_segments = self.speaker_identifier.relabel_segments(
-                            speaker_segments, label_map, score_map
-                        )
-                        logger.info(f"  Identified speakers: {label_map}")
-                except Exception as e:
-                    logger.warning(f"  Speaker identification failed (continuing with generic labels): {e}")
+            # Diarize and identify speakers
+            audio = decode_audio(download_result.file_path, sampling_rate=SAMPLING_RATE)
+            speaker_segments, speaker_audio, label_map, score_map = self._speaker_stage(audio)
+            logger.info("  Found %s speaker segments", len(speaker_segments))
 
             # Assign speakers to words
-            from app.transcription.diarization import assign_speakers_to_words
-            updated_segments = assign_speakers_to_words(segments, speaker_segments)
+            times = word_times(segments)
+            updated_segments = assign_speakers_to_words(segments, speaker_segments, times)
 
             # Boundary refinement — runs when speaker ID is active
             if self.speaker_identifier and label_map:
-                logger.info(f"  Refining speaker boundaries...")
+                logger.info("  Refining speaker boundaries...")
                 try:
-                    audio_input = self.speaker_identifier._load_audio(
-                        download_result.file_path
-                    )
                     updated_segments = refine_speaker_boundaries(
                         updated_segments,
                         speaker_segments,
-                        audio_input,
+                        speaker_audio,
                         self.speaker_identifier,
                         label_map,
                         score_map,
+                        times,
                     )
-                    logger.info(f"  Boundary refinement complete")
+                    logger.info("  Boundary refinement complete")
                 except Exception as e:
-                    logger.warning(f"  Boundary refinement failed (continuing without): {e}")
+                    logger.warning("  Boundary refinement failed (continuing without): %s", e)
 
-            speakers_found = len(set(s.speaker for s in updated_segments if s.speaker))
-            logger.info(f"  Assigned {speakers_found} unique speakers")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("  Assigned %s unique speakers", _count_speakers(updated_segments))
 
             # Update database
-            logger.info(f"  Updating transcript with speaker labels...")
+            logger.info("  Updating transcript with speaker labels...")
             count = self.storage.update_speaker_labels(updated_segments)
-            logger.info(f"  Updated {count} segments")
+            logger.info("  Updated %s segments", count)
 
             # Cleanup audio file
             if self.cleanup_audio and download_result.file_path:
                 self._cleanup_audio(download_result.file_path)
 
-            logger.info(f"  Done!")
+            logger.info("  Done!")
             return True
 
         except Exception as e:
-            logger.error(f"  Error diarizing episode: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("  Error diarizing episode: %s", e)
             return False
 
     def run(self, sync: bool = True, max_sync: int = 100, process_limit: Optional[int] = 10, offset: int = 0, numbered_only: bool = False, force: bool = False) -> dict:
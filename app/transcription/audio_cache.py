@@ -0,0 +1,98 @@
+"""On-disk cache of decoded 16 kHz audio, so re-transcribing skips ffmpeg decoding."""
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+import numpy as np
+from faster_whisper import decode_audio
+
+logger = logging.getLogger(__name__)
+
+# Whisper's input sample rate
+SAMPLING_RATE = 16000
+
+# Bytes hashed per read when fingerprinting the source audio
+DIGEST_CHUNK_SIZE = 1 << 20
+
+
+def source_digest(source: Union[str, BinaryIO]) -> str:
+    """SHA-256 of an audio file's bytes, from a path or a seekable file object.
+
+    File objects are rewound afterwards so they can still be decoded.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(DIGEST_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        source.seek(0)
+    return digest.hexdigest()
+
+
+class DecodedAudioCache:
+    """Decoded mono 16 kHz waveforms stored as {patreon_id}.npz.
+
+    Whisper computes its log-Mel features from this waveform, and decoding plus
+    resampling the source is the part that does not depend on the model or
+    prompt. Samples are stored as int16, which is what the decoder produces,
+    so the cache is lossless at half the size of float32. Each entry records
+    the digest of the source audio and is ignored once the source changes.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, patreon_id: str) -> Path:
+        return self.cache_dir / f"{patreon_id}.npz"
+
+    def load(self, patreon_id: str, digest: str) -> Optional[np.ndarray]:
+        """Get the cached waveform as float32, or None if missing or stale."""
+        path = self.path_for(patreon_id)
+        try:
+            with np.load(path) as entry:
+                if str(entry["digest"]) != digest:
+                    return None
+                return entry["samples"].astype(np.float32) / 32768.0
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable audio cache entry {path}: {e}")
+            return None
+
+    def store(self, patreon_id: str, digest: str, audio: np.ndarray) -> None:
+        """Write a float32 waveform atomically, replacing any previous entry."""
+        samples = np.clip(np.round(audio * 32768.0), -32768, 32767).astype(np.int16)
+        path = self.path_for(patreon_id)
+        temp_path = path.with_suffix(".tmp.npz")
+        np.savez(temp_path, samples=samples, digest=np.array(digest))
+        os.replace(temp_path, path)
+
+    def decoded(self, patreon_id: str, source: Union[str, BinaryIO]) -> np.ndarray:
+        """Get the decoded waveform for an episode's audio, decoding on a miss.
+
+        Args:
+            patreon_id: Episode the audio belongs to.
+            source: Audio file path or seekable binary file object.
+
+        Returns:
+            Mono float32 samples at SAMPLING_RATE, accepted by WhisperTranscriber.transcribe.
+        """
+        digest = source_digest(source)
+        audio = self.load(patreon_id, digest)
+        if audio is not None:
+            logger.info(f"  Using cached decoded audio for {patreon_id}")
+            return audio
+
+        audio = decode_audio(source, sampling_rate=SAMPLING_RATE)
+        try:
+            self.store(patreon_id, digest, audio)
+        except OSError as e:
+            logger.warning(f"  Could not cache decoded audio: {e}")
+        return audio
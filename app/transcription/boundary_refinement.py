@@ -8,6 +8,15 @@ import logging
 from decimal import Decimal
 from typing import Optional
 
+import numpy as np
+
+from app.transcription.diarization import word_times
+
+try:
+    from pyannote.core import Segment
+except ImportError:  # only needed once speaker identification is running
+    Segment = None
+
 logger = logging.getLogger(__name__)
 
 # Window around each transition (seconds) within which words are considered
@@ -38,26 +47,51 @@ def find_boundary_words(segments: list) -> list[int]:
     """
     if not segments:
         return []
+    return _boundary_indices(segments, *word_times(segments))
 
-    # Find all transition times: midpoint between consecutive words that differ.
-    transition_times: list[float] = []
-    for i in range(len(segments) - 1):
-        if segments[i].speaker != segments[i + 1].speaker:
-            t = (float(segments[i].end_time) + float(segments[i + 1].start_time)) / 2.0
-            transition_times.append(t)
 
-    if not transition_times:
+def _boundary_indices(segments: list, starts: np.ndarray, ends: np.ndarray) -> list[int]:
+    """find_boundary_words on precomputed word times."""
+    speakers = np.array([w.speaker for w in segments], dtype=object)
+
+    # Find all transition times: midpoint between consecutive words that differ.
+    changes = speakers[1:] != speakers[:-1]
+    if not changes.any():
         return []
+    transition_times = np.sort((ends[:-1][changes] + starts[1:][changes]) / 2.0)
+
+    # Distance from each word's midpoint to its nearest transition, found by
+    # binary search in the sorted transitions rather than against every one.
+    midpoints = (starts + ends) / 2.0
+    right = np.searchsorted(transition_times, midpoints)
+    left = np.maximum(right - 1, 0)
+    right = np.minimum(right, len(transition_times) - 1)
+    nearest = np.minimum(
+        np.abs(midpoints - transition_times[left]),
+        np.abs(midpoints - transition_times[right]),
+    )
+
+    return np.flatnonzero(nearest <= BOUNDARY_WINDOW_SECONDS).tolist()
+
+
+def _candidate_speakers(words: list, idx: int) -> set:
+    """Speakers of a word and its immediate neighbours, excluding None."""
+    candidates = {w.speaker for w in words[max(idx - 1, 0):idx + 2]}
+    candidates.discard(None)
+    return candidates
 
-    boundary_indices: set[int] = set()
-    for idx, word in enumerate(segments):
-        midpoint = (float(word.start_time) + float(word.end_time)) / 2.0
-        for t in transition_times:
-            if abs(midpoint - t) <= BOUNDARY_WINDOW_SECONDS:
-                boundary_indices.add(idx)
-                break  # already counted for this word
 
-    return sorted(boundary_indices)
+def _has_rival(words: list, idx: int, ref_index: dict) -> bool:
+    """Whether a speaker other than the word's own, with a reference, is a candidate."""
+    current = words[idx].speaker
+    return any(spk != current and spk in ref_index for spk in _candidate_speakers(words, idx))
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit L2 norm, leaving all-zero rows at zero."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
 
 
 def refine_speaker_boundaries(
@@ -67,6 +101,7 @@ def refine_speaker_boundaries(
     identifier,
     label_map: dict,
     score_map: dict,
+    times: Optional[tuple[np.ndarray, np.ndarray]] = None,
 ) -> list:
     """Refine speaker assignments for boundary words using voice embeddings.
 
@@ -88,6 +123,8 @@ def refine_speaker_boundaries(
             compatibility with future use of speaker-level embeddings).
         audio: Audio input accepted by ``identifier.model.crop()`` — either a
             ``{"waveform": ..., "sample_rate": ...}`` dict or a file path.
+            A waveform dict lets all boundary words be embedded in batches
+            via ``identifier.embed_segments()``.
         identifier: A :class:`~app.transcription.speaker_identification.SpeakerIdentifier`
             instance with a loaded embedding model and ``load_reference_embeddings()``.
         label_map: Dict mapping diarization labels to speaker names (e.g.
@@ -95,6 +132,8 @@ def refine_speaker_boundaries(
             already contain names.
         score_map: Dict mapping diarization labels to confidence scores
             (currently informational, not used in reassignment logic).
+        times: :func:`~app.transcription.diarization.word_times` of ``words``,
+            if the caller already computed it for speaker assignment.
 
     Returns:
         The same ``words`` list with speaker assignments potentially updated.
@@ -103,7 +142,8 @@ def refine_speaker_boundaries(
         return words
 
     # Identify which words are boundary candidates.
-    boundary_indices = find_boundary_words(words)
+    starts, ends = times if times is not None else word_times(words)
+    boundary_indices = _boundary_indices(words, starts, ends)
     if not boundary_indices:
         return words
 
@@ -113,14 +153,38 @@ def refine_speaker_boundaries(
         logger.debug("No reference embeddings available — skipping boundary refinement")
         return words
 
-    from pyannote.core import Segment
-
-    n = len(words)
+    # Unit-length reference rows, so one matrix product scores a word against
+    # every speaker.
+    ref_index = {name: i for i, name in enumerate(references)}
+    ref_matrix = _unit_rows(np.stack([np.ravel(emb) for emb in references.values()]))
+
+    # With an in-memory waveform, embed every boundary word up front in
+    # batched forward passes instead of one model call per word, and score
+    # all of them in a single matrix product. Words that cannot change
+    # speaker are left out; one that becomes reassignable after a neighbour
+    # changes is embedded on its own below.
+    similarities: Optional[dict] = None
+    spans: dict = {}
+    if isinstance(audio, dict) and "waveform" in audio:
+        for idx in boundary_indices:
+            start, end = float(starts[idx]), float(ends[idx])
+            if end - start >= MIN_WORD_DURATION and _has_rival(words, idx, ref_index):
+                spans[idx] = (start, end)
+        try:
+            embeddings = identifier.embed_segments(audio, list(spans.values()))
+        except Exception as e:
+            logger.warning(f"Batched word embedding failed, embedding words one at a time: {e}")
+        else:
+            embedded = [(idx, emb) for idx, emb in zip(spans, embeddings) if emb is not None]
+            similarities = {}
+            if embedded:
+                scores = _unit_rows(np.stack([np.ravel(emb) for _, emb in embedded])) @ ref_matrix.T
+                similarities = {idx: row for (idx, _), row in zip(embedded, scores)}
 
     for idx in boundary_indices:
         word = words[idx]
-        start = float(word.start_time)
-        end = float(word.end_time)
+        start = float(starts[idx])
+        end = float(ends[idx])
         duration = end - start
 
         # Skip words too short to embed reliably.
@@ -128,24 +192,12 @@ def refine_speaker_boundaries(
             logger.debug(f"Skipping short word at {start:.3f}-{end:.3f} ({duration:.3f}s)")
             continue
 
-        # Determine current and adjacent speaker names.
+        # Candidate speakers to compare (current + adjacent).
         current_speaker = word.speaker
-        adjacent_speakers: set[Optional[str]] = set()
-        if idx > 0:
-            adjacent_speakers.add(words[idx - 1].speaker)
-        if idx < n - 1:
-            adjacent_speakers.add(words[idx + 1].speaker)
-
-        # Build the set of candidate speakers to compare (current + adjacent).
-        candidate_speakers = {current_speaker} | adjacent_speakers
-        candidate_speakers.discard(None)
+        candidate_speakers = _candidate_speakers(words, idx)
 
         # Filter to speakers that have reference embeddings.
-        candidate_refs = {
-            spk: references[spk]
-            for spk in candidate_speakers
-            if spk in references
-        }
+        candidate_refs = [spk for spk in candidate_speakers if spk in ref_index]
         if not candidate_refs:
             logger.debug(
                 f"No reference embeddings for candidates {candidate_speakers} "
@@ -153,19 +205,26 @@ def refine_speaker_boundaries(
             )
             continue
 
-        # Extract embedding for this word.
-        try:
-            segment = Segment(start, end)
-            word_emb = identifier.model.crop(audio, segment)
-        except Exception as e:
-            logger.debug(f"Failed to extract embedding for word {idx} ({start:.3f}-{end:.3f}): {e}")
+        # Skip the embedding when no other candidate could take the word.
+        if all(spk == current_speaker for spk in candidate_refs):
             continue
 
+        # Cosine similarity of this word's embedding to every reference.
+        if similarities is not None and idx in spans:
+            word_scores = similarities.get(idx)
+            if word_scores is None:
+                continue
+        else:
+            try:
+                segment = Segment(start, end)
+                word_emb = identifier.model.crop(audio, segment)
+            except Exception as e:
+                logger.debug(f"Failed to extract embedding for word {idx} ({start:.3f}-{end:.3f}): {e}")
+                continue
+            word_scores = ref_matrix @ _unit_rows(np.ravel(word_emb)[None, :])[0]
+
         # Score each candidate.
-        scores = {
-            spk: identifier.cosine_similarity(word_emb, ref_emb)
-            for spk, ref_emb in candidate_refs.items()
-        }
+        scores = {spk: float(word_scores[ref_index[spk]]) for spk in candidate_refs}
 
         current_score = scores.get(current_speaker, -1.0)
         best_speaker = max(scores, key=lambda s: scores[s])
@@ -4,11 +4,22 @@ Uses transcript data with speaker labels to identify clean speech segments,
 then extracts those segments from the audio file for use in speaker enrollment.
 """
 import logging
+import math
+import os
 import re
+import tempfile
+import wave
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
-from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+from heapq import nlargest
+from operator import attrgetter
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +28,26 @@ DEFAULT_MIN_DURATION = 10.0  # seconds
 DEFAULT_MAX_DURATION = 20.0  # seconds
 DEFAULT_MAX_CLIPS_PER_SPEAKER = 10
 
+# Transcript rows fetched per round trip when streaming an episode's words
+WORD_STREAM_BATCH_SIZE = 10000
+
+
+# Characters not allowed in file names on common filesystems
+_UNSAFE_PATH_CHARS = re.compile(r'[<>:"/\\|?*]')
+
+
+@lru_cache(maxsize=4096)
+def _sanitize_speaker_name(name: str) -> str:
+    """Cached body of ClipExtractor._sanitize_speaker_name; the same names recur every episode."""
+    # Replace problematic characters with underscores
+    sanitized = _UNSAFE_PATH_CHARS.sub('_', name)
+    # Remove leading/trailing whitespace and dots (problematic on Windows)
+    sanitized = sanitized.strip(' .')
+    # Ensure not empty
+    if not sanitized:
+        sanitized = "unknown_speaker"
+    return sanitized
+
 
 @dataclass
 class SpeechSegment:
@@ -39,6 +70,7 @@ class ClipExtractor:
         output_dir: str = DEFAULT_OUTPUT_DIR,
         min_duration: float = DEFAULT_MIN_DURATION,
         max_duration: float = DEFAULT_MAX_DURATION,
+        max_workers: Optional[int] = None,
     ):
         """Initialize the clip extractor.
 
@@ -46,6 +78,8 @@ class ClipExtractor:
             output_dir: Directory to save extracted clips (organized by speaker).
             min_duration: Minimum clip duration in seconds.
             max_duration: Maximum clip duration in seconds.
+            max_workers: Maximum concurrent ffmpeg processes per episode
+                (defaults to the CPU count).
         """
         if min_duration >= max_duration:
             raise ValueError(f"min_duration ({min_duration}) must be less than max_duration ({max_duration})")
@@ -55,6 +89,7 @@ class ClipExtractor:
         self.output_dir = Path(output_dir)
         self.min_duration = min_duration
         self.max_duration = max_duration
+        self.max_workers = max_workers or os.cpu_count() or 1
 
     @staticmethod
     def _sanitize_speaker_name(name: str) -> str:
@@ -66,36 +101,35 @@ class ClipExtractor:
         Returns:
             Sanitized name safe for use in file paths.
         """
-        # Replace problematic characters with underscores
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', name)
-        # Remove leading/trailing whitespace and dots (problematic on Windows)
-        sanitized = sanitized.strip(' .')
-        # Ensure not empty
-        if not sanitized:
-            sanitized = "unknown_speaker"
-        return sanitized
+        return _sanitize_speaker_name(name)
 
     def _get_speaker_segments_from_db(
         self,
         episode_id: int,
         speaker_name: Optional[str] = None
-    ) -> List[Tuple[str, Decimal, Decimal]]:
-        """Query transcript segments from database.
+    ) -> Iterator[Tuple[str, float, float]]:
+        """Stream transcript segments from the database.
+
+        Rows come from a server-side cursor in batches of
+        WORD_STREAM_BATCH_SIZE, so an episode's words are never all held as
+        rows at once. Times are cast to float8 in the query, so rows arrive
+        as floats rather than Decimals that would each need converting.
 
         Args:
             episode_id: Database ID of the episode.
             speaker_name: Optional speaker name to filter by.
 
-        Returns:
-            List of (speaker, start_time, end_time) tuples.
+        Yields:
+            (speaker, start_time, end_time) tuples in start_time order.
         """
         from app.db.connection import get_cursor
 
-        with get_cursor(commit=False) as cursor:
+        with get_cursor(commit=False, name="clip_extractor_words", cursor_factory=None) as cursor:
+            cursor.itersize = WORD_STREAM_BATCH_SIZE
             if speaker_name:
                 cursor.execute(
                     """
-                    SELECT speaker, start_time, end_time
+                    SELECT speaker, start_time::float8 AS start_time, end_time::float8 AS end_time
                     FROM transcript_segments
                     WHERE episode_id = %s AND speaker = %s
                     ORDER BY start_time
@@ -105,198 +139,438 @@ class ClipExtractor:
             else:
                 cursor.execute(
                     """
-                    SELECT speaker, start_time, end_time
+                    SELECT speaker, start_time::float8 AS start_time, end_time::float8 AS end_time
                     FROM transcript_segments
                     WHERE episode_id = %s AND speaker IS NOT NULL
                     ORDER BY start_time
                     """,
                     (episode_id,)
                 )
-
-            return [
-                (row["speaker"], row["start_time"], row["end_time"])
-                for row in cursor.fetchall()
-            ]
+            yield from cursor
 
     def _group_into_segments(
         self,
-        word_data: List[Tuple[str, Decimal, Decimal]],
+        word_data: Iterable[Tuple[str, float, float]],
         max_gap: float = 0.5
     ) -> List[SpeechSegment]:
         """Group consecutive words by same speaker into continuous segments.
 
         Args:
-            word_data: List of (speaker, start_time, end_time) tuples.
+            word_data: (speaker, start_time, end_time) tuples in time order,
+                times as floats (Decimals are also accepted). Read in a single
+                pass, so it may be a stream of database rows.
             max_gap: Maximum gap between words to still consider them continuous (seconds).
 
         Returns:
             List of SpeechSegment objects representing continuous speech.
         """
-        if not word_data:
+        speaker_list = []
+        start_list = array("d")
+        end_list = array("d")
+        for speaker, start, end in word_data:
+            speaker_list.append(speaker)
+            start_list.append(start)
+            end_list.append(end)
+
+        n = len(speaker_list)
+        if not n:
             return []
 
-        segments = []
-        current_speaker = word_data[0][0]
-        current_start = float(word_data[0][1])
-        current_end = float(word_data[0][2])
-        current_words = 1
-
-        for speaker, start, end in word_data[1:]:
-            start_f = float(start)
-            end_f = float(end)
-            gap = start_f - current_end
-
-            # Check if we should continue the current segment or start a new one
-            if speaker == current_speaker and gap <= max_gap:
-                # Continue current segment
-                current_end = end_f
-                current_words += 1
-            else:
-                # Save current segment if it meets duration requirements
-                duration = current_end - current_start
-                if self.min_duration <= duration <= self.max_duration:
-                    segments.append(SpeechSegment(
-                        speaker=current_speaker,
-                        start_time=current_start,
-                        end_time=current_end,
-                        word_count=current_words
-                    ))
-
-                # Start new segment
-                current_speaker = speaker
-                current_start = start_f
-                current_end = end_f
-                current_words = 1
-
-        # Don't forget the last segment
-        duration = current_end - current_start
-        if self.min_duration <= duration <= self.max_duration:
-            segments.append(SpeechSegment(
-                speaker=current_speaker,
-                start_time=current_start,
-                end_time=current_end,
-                word_count=current_words
-            ))
-
-        return segments
-
-    def _extract_audio_segment(
+        speakers = np.array(speaker_list, dtype=object)
+        starts = np.frombuffer(start_list, dtype=np.float64)
+        ends = np.frombuffer(end_list, dtype=np.float64)
+
+        # A new segment starts wherever the speaker changes or the gap since
+        # the previous word exceeds max_gap
+        breaks = (speakers[1:] != speakers[:-1]) | (starts[1:] - ends[:-1] > max_gap)
+        first = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        last = np.append(first[1:], n) - 1
+
+        durations = ends[last] - starts[first]
+        keep = np.flatnonzero((durations >= self.min_duration) & (durations <= self.max_duration))
+
+        return [
+            SpeechSegment(
+                speaker=speakers[first[i]],
+                start_time=float(starts[first[i]]),
+                end_time=float(ends[last[i]]),
+                word_count=int(last[i] - first[i] + 1)
+            )
+            for i in keep
+        ]
+
+    def _extract_in_process(
         self,
         audio_path: str,
-        segment: SpeechSegment,
-        output_path: Path
-    ) -> bool:
-        """Extract a single audio segment using ffmpeg.
+        segments: List[SpeechSegment],
+        output_paths: List[Path]
+    ) -> Optional[List[bool]]:
+        """Extract segments without spawning ffmpeg.
+
+        The episode is decoded once in-process (PyAV, via faster-whisper's
+        decode_audio) to 16 kHz mono samples, and each clip is written as
+        16-bit PCM WAV straight from its slice of them.
 
         Args:
             audio_path: Path to the source audio file.
-            segment: SpeechSegment defining the time range to extract.
-            output_path: Path where the extracted clip should be saved.
+            segments: SpeechSegments defining the time ranges to extract.
+            output_paths: Path for each segment's clip, in the same order.
 
         Returns:
-            True if extraction succeeded, False otherwise.
+            For each segment, True if its clip was written, False otherwise;
+            None if the audio could not be decoded.
         """
         try:
-            import subprocess
+            # Imported here so planning clips does not load faster-whisper
+            from faster_whisper import decode_audio
+            from app.transcription.audio_cache import SAMPLING_RATE
+
+            audio = decode_audio(audio_path, sampling_rate=SAMPLING_RATE)
+        except Exception as e:
+            logger.warning(f"Could not decode audio in-process, falling back to ffmpeg: {e}")
+            return None
+
+        results = []
+        for segment, output_path in zip(segments, output_paths):
+            # Drop any clip from an earlier run so a skipped segment is not
+            # left behind looking like it was written
+            output_path.unlink(missing_ok=True)
+            start = max(int(round(segment.start_time * SAMPLING_RATE)), 0)
+            end = int(round(segment.end_time * SAMPLING_RATE))
+            samples = np.clip(np.round(audio[start:end] * 32768.0), -32768, 32767).astype("<i2")
+            if not len(samples):
+                logger.warning(f"Failed to extract clip: {output_path.name} is past the end of the audio")
+                results.append(False)
+                continue
+            try:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with wave.open(str(output_path), "wb") as clip:
+                    clip.setnchannels(1)
+                    clip.setsampwidth(2)
+                    clip.setframerate(SAMPLING_RATE)
+                    clip.writeframes(samples.tobytes())
+            except OSError as e:
+                logger.warning(f"Failed to extract clip: {e}")
+                output_path.unlink(missing_ok=True)
+                results.append(False)
+                continue
+            logger.debug(f"Extracted clip: {output_path.name} ({segment.duration:.1f}s)")
+            results.append(True)
+        return results
+
+    def _normalize_episode(self, audio_path: str, output_path: Path) -> bool:
+        """Decode an episode once to 16 kHz mono PCM WAV, the clip format.
+
+        Clips can then be cut from the result by stream copy, without
+        decoding or resampling again.
 
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+        Args:
+            audio_path: Path to the source audio file.
+            output_path: Path for the normalized WAV.
+
+        Returns:
+            True if the WAV was written, False otherwise.
+        """
+        try:
+            import subprocess
 
-            # Use ffmpeg to extract the segment
-            # -ss: start time, -t: duration, -c copy would be faster but we want to normalize
             cmd = [
                 "ffmpeg",
-                "-y",  # Overwrite output file if exists
+                "-y",
                 "-i", audio_path,
-                "-ss", str(segment.start_time),
-                "-t", str(segment.duration),
                 "-ar", "16000",  # Resample to 16kHz (standard for speech models)
                 "-ac", "1",  # Convert to mono
-                "-q:a", "0",  # Best quality
-                str(output_path)
+                "-c:a", "pcm_s16le",
+                str(output_path),
             ]
-
-            result = subprocess.run(
+            subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 check=True
             )
-
-            logger.debug(f"Extracted clip: {output_path.name} ({segment.duration:.1f}s)")
-            return True
-
         except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to extract clip: {e.stderr.decode()}")
+            logger.warning(f"Failed to normalize audio: {e.stderr.decode()}")
             return False
         except Exception as e:
-            logger.warning(f"Failed to extract clip: {e}")
+            logger.warning(f"Failed to normalize audio: {e}")
             return False
+        return output_path.exists() and output_path.stat().st_size > 0
 
-    def extract_clips(
+    def _extract_audio_segments(
+        self,
+        audio_path: str,
+        segments: List[SpeechSegment],
+        output_paths: List[Path],
+        copy: bool = False
+    ) -> List[bool]:
+        """Extract several audio segments with a single ffmpeg run.
+
+        Every clip is a separate output of one ffmpeg process, so the source
+        is opened and decoded once rather than once per clip. Only the span
+        from the earliest clip start to the latest clip end is read.
+
+        Args:
+            audio_path: Path to the source audio file.
+            segments: SpeechSegments defining the time ranges to extract.
+            output_paths: Path for each segment's clip, in the same order.
+            copy: Source is already 16 kHz mono PCM WAV (see _normalize_episode),
+                so clips are stream-copied instead of re-encoded.
+
+        Returns:
+            For each segment, True if its clip was written, False otherwise.
+        """
+        if not segments:
+            return []
+
+        try:
+            import subprocess
+
+            # Seek the input to the first clip and stop after the last one;
+            # output -ss values are then relative to span_start
+            span_start = min(segment.start_time for segment in segments)
+            span_end = max(segment.end_time for segment in segments)
+            cmd = [
+                "ffmpeg",
+                "-y",  # Overwrite output files if they exist
+                "-ss", str(span_start),
+                "-t", str(span_end - span_start),
+                "-i", audio_path,
+            ]
+            for segment, output_path in zip(segments, output_paths):
+                # Ensure output directory exists, and drop any clip from an
+                # earlier run so a failed extraction is not reported as written
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.unlink(missing_ok=True)
+                # -ss: start time, -t: duration
+                cmd += ["-ss", str(segment.start_time - span_start), "-t", str(segment.duration)]
+                if copy:
+                    cmd += ["-c", "copy"]
+                else:
+                    cmd += [
+                        "-ar", "16000",  # Resample to 16kHz (standard for speech models)
+                        "-ac", "1",  # Convert to mono
+                        "-q:a", "0",  # Best quality
+                    ]
+                cmd.append(str(output_path))
+
+            subprocess.run(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True
+            )
+
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Failed to extract clips: {e.stderr.decode()}")
+            return [False] * len(segments)
+        except Exception as e:
+            logger.warning(f"Failed to extract clips: {e}")
+            return [False] * len(segments)
+
+        results = []
+        for segment, output_path in zip(segments, output_paths):
+            written = output_path.exists() and output_path.stat().st_size > 0
+            if written:
+                logger.debug(f"Extracted clip: {output_path.name} ({segment.duration:.1f}s)")
+            else:
+                logger.warning(f"Failed to extract clip: {output_path.name} was not written")
+            results.append(written)
+        return results
+
+    def _extract_in_parallel(
         self,
-        episode_id: int,
         audio_path: str,
+        segments: List[SpeechSegment],
+        output_paths: List[Path],
+        copy: bool = False
+    ) -> List[bool]:
+        """Extract segments with up to max_workers concurrent ffmpeg runs.
+
+        Segments are ordered by start time and split into contiguous runs, so
+        each ffmpeg process reads a different stretch of the source.
+
+        Args:
+            audio_path: Path to the source audio file.
+            segments: SpeechSegments defining the time ranges to extract.
+            output_paths: Path for each segment's clip, in the same order.
+            copy: Passed to _extract_audio_segments.
+
+        Returns:
+            For each segment, True if its clip was written, False otherwise.
+        """
+        if not segments:
+            return []
+
+        order = sorted(range(len(segments)), key=lambda i: segments[i].start_time)
+        chunk_size = math.ceil(len(order) / min(self.max_workers, len(order)))
+        chunks = [order[i:i + chunk_size] for i in range(0, len(order), chunk_size)]
+
+        results = [False] * len(segments)
+        with ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="clip-ffmpeg") as executor:
+            futures = [
+                executor.submit(
+                    self._extract_audio_segments,
+                    audio_path,
+                    [segments[i] for i in chunk],
+                    [output_paths[i] for i in chunk],
+                    copy,
+                )
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                for i, written in zip(chunk, future.result()):
+                    results[i] = written
+        return results
+
+    def _plan_clips(
+        self,
+        episode_id: int,
         speaker_name: Optional[str] = None,
         max_clips_per_speaker: int = DEFAULT_MAX_CLIPS_PER_SPEAKER
-    ) -> dict[str, List[str]]:
-        """Extract speaker clips from an episode.
+    ) -> dict[str, List[Tuple[SpeechSegment, Path]]]:
+        """Choose the clips to extract from an episode, without touching its audio.
 
         Args:
             episode_id: Database ID of the episode.
-            audio_path: Path to the episode audio file.
-            speaker_name: Optional speaker name to extract clips for (extracts all if None).
-            max_clips_per_speaker: Maximum number of clips to extract per speaker.
+            speaker_name: Optional speaker name to choose clips for (all if None).
+            max_clips_per_speaker: Maximum number of clips to choose per speaker.
 
         Returns:
-            Dict mapping speaker names to lists of extracted clip paths.
+            Dict mapping speaker names to (segment, output path) pairs.
         """
         logger.info(f"Extracting clips from episode {episode_id}...")
 
-        # Query transcript segments
-        word_data = self._get_speaker_segments_from_db(episode_id, speaker_name)
-
-        if not word_data:
-            logger.warning(f"No speaker-labeled segments found for episode {episode_id}")
-            return {}
-
-        # Group into continuous speech segments
-        all_segments = self._group_into_segments(word_data)
+        # Group the streamed transcript words into continuous speech segments
+        all_segments = self._group_into_segments(
+            self._get_speaker_segments_from_db(episode_id, speaker_name)
+        )
 
         if not all_segments:
-            logger.warning(f"No valid segments found (duration requirements: {self.min_duration}-{self.max_duration}s)")
+            logger.warning(
+                f"No valid speaker-labeled segments found for episode {episode_id} "
+                f"(duration requirements: {self.min_duration}-{self.max_duration}s)"
+            )
             return {}
 
         # Group segments by speaker
-        segments_by_speaker: dict[str, List[SpeechSegment]] = {}
+        segments_by_speaker: dict[str, List[SpeechSegment]] = defaultdict(list)
         for seg in all_segments:
-            if seg.speaker not in segments_by_speaker:
-                segments_by_speaker[seg.speaker] = []
             segments_by_speaker[seg.speaker].append(seg)
 
-        # Extract clips for each speaker
-        extracted_clips: dict[str, List[str]] = {}
-
+        plan: dict[str, List[Tuple[SpeechSegment, Path]]] = {}
         for speaker, segments in segments_by_speaker.items():
             logger.info(f"  {speaker}: {len(segments)} valid segments found")
 
-            # Sort by duration (prefer longer clips) and take the best ones
-            segments_sorted = sorted(segments, key=lambda s: s.duration, reverse=True)
-            segments_to_extract = segments_sorted[:max_clips_per_speaker]
+            # Take the longest clips without sorting the whole list
+            segments_to_extract = nlargest(
+                max_clips_per_speaker, segments, key=attrgetter("duration")
+            )
 
             # Sanitize speaker name for directory creation
             safe_speaker_name = self._sanitize_speaker_name(speaker)
             speaker_dir = self.output_dir / safe_speaker_name
             speaker_dir.mkdir(parents=True, exist_ok=True)
 
-            extracted_clips[speaker] = []
+            plan[speaker] = [
+                (segment, speaker_dir / f"episode_{episode_id}_clip_{idx:02d}.wav")
+                for idx, segment in enumerate(segments_to_extract)
+            ]
+
+        return plan
 
-            for idx, segment in enumerate(segments_to_extract):
-                output_path = speaker_dir / f"episode_{episode_id}_clip_{idx:02d}.wav"
+    def _extract_planned(
+        self,
+        audio_path: str,
+        plan: dict[str, List[Tuple[SpeechSegment, Path]]]
+    ) -> dict[str, List[str]]:
+        """Extract the clips chosen by _plan_clips, all speakers together.
 
-                if self._extract_audio_segment(audio_path, segment, output_path):
-                    extracted_clips[speaker].append(str(output_path))
+        The episode is decoded once in-process and every clip written from
+        the samples. If the audio cannot be decoded that way, ffmpeg decodes
+        and resamples it once to a temporary WAV that the clips are copied
+        out of, or failing that cuts them from the source directly.
 
-            logger.info(f"  {speaker}: Extracted {len(extracted_clips[speaker])} clips")
+        Returns:
+            Dict mapping speaker names to lists of extracted clip paths.
+        """
+        clips = [(speaker, segment, path) for speaker, pairs in plan.items() for segment, path in pairs]
+        segments = [segment for _, segment, _ in clips]
+        output_paths = [path for _, _, path in clips]
+
+        written = []
+        if clips:
+            written = self._extract_in_process(audio_path, segments, output_paths)
+        if written is None:
+            with tempfile.TemporaryDirectory(prefix="clip-extractor-") as temp_dir:
+                normalized = Path(temp_dir) / "episode.16k.wav"
+                if self._normalize_episode(audio_path, normalized):
+                    written = self._extract_in_parallel(str(normalized), segments, output_paths, copy=True)
+                else:
+                    written = self._extract_in_parallel(audio_path, segments, output_paths)
+
+        extracted_clips: dict[str, List[str]] = {speaker: [] for speaker in plan}
+        for (speaker, _, output_path), ok in zip(clips, written):
+            if ok:
+                extracted_clips[speaker].append(str(output_path))
+
+        for speaker, paths in extracted_clips.items():
+            logger.info(f"  {speaker}: Extracted {len(paths)} clips")
 
         return extracted_clips
+
+    def extract_clips(
+        self,
+        episode_id: int,
+        audio_path: str,
+        speaker_name: Optional[str] = None,
+        max_clips_per_speaker: int = DEFAULT_MAX_CLIPS_PER_SPEAKER
+    ) -> dict[str, List[str]]:
+        """Extract speaker clips from an episode.
+
+        Args:
+            episode_id: Database ID of the episode.
+            audio_path: Path to the episode audio file.
+            speaker_name: Optional speaker name to extract clips for (extracts all if None).
+            max_clips_per_speaker: Maximum number of clips to extract per speaker.
+
+        Returns:
+            Dict mapping speaker names to lists of extracted clip paths.
+        """
+        plan = self._plan_clips(episode_id, speaker_name, max_clips_per_speaker)
+        return self._extract_planned(audio_path, plan)
+
+    def extract_clips_many(
+        self,
+        episodes: List[Tuple[int, str]],
+        speaker_name: Optional[str] = None,
+        max_clips_per_speaker: int = DEFAULT_MAX_CLIPS_PER_SPEAKER
+    ) -> Iterator[Tuple[int, dict[str, List[str]]]]:
+        """Extract speaker clips from several episodes.
+
+        The next episode's transcript query and clip selection run in the
+        background while ffmpeg extracts the current episode's clips.
+
+        Args:
+            episodes: (episode_id, audio_path) pairs.
+            speaker_name: Optional speaker name to extract clips for (extracts all if None).
+            max_clips_per_speaker: Maximum number of clips to extract per speaker.
+
+        Yields:
+            (episode_id, clips) for each episode in order, clips as returned
+            by extract_clips.
+        """
+        if not episodes:
+            return
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="clip-plan") as executor:
+            next_plan = executor.submit(
+                self._plan_clips, episodes[0][0], speaker_name, max_clips_per_speaker
+            )
+            for i, (episode_id, audio_path) in enumerate(episodes):
+                plan = next_plan.result()
+                if i + 1 < len(episodes):
+                    next_plan = executor.submit(
+                        self._plan_clips, episodes[i + 1][0], speaker_name, max_clips_per_speaker
+                    )
+                yield episode_id, self._extract_planned(audio_path, plan)
@@ -1,13 +1,43 @@
 """Speaker diarization module for identifying speakers in audio."""
-import bisect
+import hashlib
+import math
 import os
 import logging
+import types
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import orjson
+
+from app.transcription.audio_cache import source_digest
 
 logger = logging.getLogger(__name__)
 
+# pyannote pipeline used by SpeakerDiarizer
+DIARIZATION_MODEL = "pyannote/speaker-diarization-3.1"
+
+# Default pyannote inference batch sizes. The 3.1 pipeline ships with 32 for
+# both, which overflows VRAM on 12 GB cards alongside Whisper; override with
+# PYANNOTE_EMB_BATCH / PYANNOTE_SEG_BATCH.
+DEFAULT_EMBEDDING_BATCH_SIZE = 8
+DEFAULT_SEGMENTATION_BATCH_SIZE = 8
+
+# What SpeakerDiarizer does without a GPU: "full" runs the pipeline as
+# configured, "fast" trades some accuracy for far fewer model passes, and
+# "skip" leaves diarization off entirely (see EpisodePipeline).
+CPU_DIARIZATION_MODES = ("full", "fast", "skip")
+
+# Segmentation window step (as a fraction of the window) for the "fast" CPU
+# mode. pyannote's default of 0.1 runs every second of audio through the
+# segmentation and embedding models ten times over; 0.5 does so twice.
+FAST_SEGMENTATION_STEP = 0.5
+
+# Slack (seconds) on float candidate-window bounds in assign_speakers_to_words
+_BOUND_EPSILON = 1e-6
+
 
 @dataclass
 class SpeakerSegment:
@@ -18,10 +48,141 @@ class SpeakerSegment:
     confidence: Optional[float] = None
 
 
+def waveform_input(audio: dict) -> dict:
+    """pyannote input for an in-memory waveform: a (channel, sample) float tensor.
+
+    Accepts mono samples as a numpy array or tensor. The result can be passed
+    to the diarizer, SpeakerIdentifier.identify and refine_speaker_boundaries
+    alike, so an episode is decoded once for all three.
+    """
+    import torch
+
+    waveform = audio["waveform"]
+    if isinstance(waveform, np.ndarray):
+        waveform = torch.from_numpy(np.ascontiguousarray(waveform, dtype=np.float32))
+    if waveform.dim() == 1:
+        waveform = waveform.unsqueeze(0)
+    return {"waveform": waveform, "sample_rate": audio["sample_rate"]}
+
+
+def _audio_digest(audio: Union[str, dict]) -> str:
+    """Digest of an audio file's bytes, or of an in-memory waveform's samples."""
+    if not isinstance(audio, dict):
+        return source_digest(audio)
+    samples = np.ascontiguousarray(np.asarray(audio["waveform"]), dtype=np.float32)
+    digest = hashlib.sha256(f"{audio['sample_rate']}|".encode())
+    digest.update(samples.data)
+    return digest.hexdigest()
+
+
+def _fast_get_embeddings(pipeline, file, binary_segmentations, exclude_overlap=False, hook=None):
+    """Embeddings per (chunk, speaker) pair, running the backbone once per chunk.
+
+    Drop-in for SpeakerDiarization.get_embeddings with WeSpeaker models: the
+    ResNet frame features depend only on the chunk waveform, so they are
+    computed once per chunk and only statistics pooling runs per speaker.
+    Pairs whose mask is empty get NaN embeddings, which pyannote's clustering
+    already discards, instead of a pooled embedding of silence.
+
+    Returns:
+        (num_chunks, num_speakers, dimension) array.
+    """
+    import torch
+
+    embedding = pipeline._embedding
+    model = embedding.model_
+    device = embedding.device
+
+    num_chunks, num_frames, num_speakers = binary_segmentations.data.shape
+    masks = np.nan_to_num(binary_segmentations.data, nan=0.0).astype(np.float32)
+
+    used_masks = masks
+    if exclude_overlap:
+        # Same rule as pyannote: use overlap-free frames unless too few remain
+        num_samples = binary_segmentations.sliding_window.duration * embedding.sample_rate
+        min_num_frames = math.ceil(num_frames * embedding.min_num_samples / num_samples)
+        clean_masks = masks * (np.sum(masks, axis=2, keepdims=True) < 2)
+        enough_clean = np.sum(clean_masks, axis=1, keepdims=True) > min_num_frames
+        used_masks = np.where(enough_clean, clean_masks, masks)
+
+    active = masks.sum(axis=1) > 0
+    embeddings = np.full((num_chunks, num_speakers, embedding.dimension), np.nan, dtype=np.float32)
+
+    batch_size = pipeline.embedding_batch_size
+    batch_count = math.ceil(num_chunks / batch_size)
+    if hook is not None:
+        hook("embeddings", None, total=batch_count, completed=0)
+
+    chunks = [chunk for chunk, _ in binary_segmentations]
+    autocast = device.type == "cuda"
+    for batch_num, first in enumerate(range(0, num_chunks, batch_size), 1):
+        chunk_ids = [c for c in range(first, min(first + batch_size, num_chunks)) if active[c].any()]
+        if chunk_ids:
+            waveforms = torch.vstack([
+                pipeline._audio.crop(file, chunks[c], mode="pad")[0][None] for c in chunk_ids
+            ]).to(device)
+            pair_rows, pair_chunks, pair_speakers = zip(*[
+                (row, c, spk) for row, c in enumerate(chunk_ids) for spk in np.flatnonzero(active[c])
+            ])
+            weights = torch.from_numpy(used_masks[list(pair_chunks), :, list(pair_speakers)]).to(device)
+            with torch.inference_mode():
+                with torch.autocast(device_type="cuda", dtype=torch.float16, enabled=autocast):
+                    frames = model.forward_frames(waveforms)
+                frames = frames.float()[list(pair_rows)]
+                pair_embeddings = model.forward_embedding(frames, weights=weights)
+            embeddings[list(pair_chunks), list(pair_speakers)] = pair_embeddings.cpu().numpy()
+
+        if hook is not None:
+            hook("embeddings", None, total=batch_count, completed=batch_num)
+
+    return embeddings
+
+
+def _install_fast_embeddings(pipeline) -> bool:
+    """Route a loaded diarization pipeline through _fast_get_embeddings.
+
+    Only applies when the embedding model exposes the WeSpeaker split
+    (forward_frames / forward_embedding); other models keep pyannote's path.
+
+    Returns:
+        True if the fast path was installed.
+    """
+    model = getattr(getattr(pipeline, "_embedding", None), "model_", None)
+    if not (hasattr(model, "forward_frames") and hasattr(model, "forward_embedding")):
+        return False
+
+    def get_embeddings(self, file, binary_segmentations, exclude_overlap=False, hook=None):
+        # Hyper-parameter tuning relies on pyannote's embedding cache
+        if self.training:
+            return type(self).get_embeddings(self, file, binary_segmentations, exclude_overlap, hook)
+        return _fast_get_embeddings(self, file, binary_segmentations, exclude_overlap, hook)
+
+    pipeline.get_embeddings = types.MethodType(get_embeddings, pipeline)
+    return True
+
+
+def _apply_fast_cpu_settings(pipeline) -> None:
+    """Coarsen a loaded pipeline's sliding window for CPU inference.
+
+    Embeddings are also restricted to non-overlapped speech, which keeps the
+    fewer, longer-spaced chunks from being dominated by crosstalk.
+    """
+    pipeline.segmentation_step = FAST_SEGMENTATION_STEP
+    pipeline._segmentation.step = FAST_SEGMENTATION_STEP * pipeline._segmentation.duration
+    pipeline.embedding_exclude_overlap = True
+
+
 class SpeakerDiarizer:
     """Performs speaker diarization on audio files using pyannote.audio."""
 
-    def __init__(self, hf_token: Optional[str] = None, num_speakers: Optional[int] = None):
+    def __init__(
+        self,
+        hf_token: Optional[str] = None,
+        num_speakers: Optional[int] = None,
+        embedding_batch_size: Optional[int] = None,
+        segmentation_batch_size: Optional[int] = None,
+        cpu_mode: str = "fast",
+    ):
         """
         Initialize the diarizer.
 
@@ -29,9 +190,24 @@ class SpeakerDiarizer:
             hf_token: HuggingFace token for accessing pyannote models.
                       Falls back to HF_TOKEN env var.
             num_speakers: Expected number of speakers (optional hint for diarization).
+            embedding_batch_size: Speaker embedding batch size. Falls back to
+                      PYANNOTE_EMB_BATCH env var, then DEFAULT_EMBEDDING_BATCH_SIZE.
+            segmentation_batch_size: Segmentation batch size. Falls back to
+                      PYANNOTE_SEG_BATCH env var, then DEFAULT_SEGMENTATION_BATCH_SIZE.
+            cpu_mode: One of CPU_DIARIZATION_MODES; "fast" coarsens the
+                      segmentation window when no GPU is available.
         """
+        if cpu_mode not in CPU_DIARIZATION_MODES:
+            raise ValueError(f"cpu_mode must be one of {', '.join(CPU_DIARIZATION_MODES)}")
         self.hf_token = hf_token or os.environ.get("HF_TOKEN")
         self.num_speakers = num_speakers
+        self.embedding_batch_size = embedding_batch_size or int(
+            os.environ.get("PYANNOTE_EMB_BATCH", DEFAULT_EMBEDDING_BATCH_SIZE)
+        )
+        self.segmentation_batch_size = segmentation_batch_size or int(
+            os.environ.get("PYANNOTE_SEG_BATCH", DEFAULT_SEGMENTATION_BATCH_SIZE)
+        )
+        self.cpu_mode = cpu_mode
         self._pipeline = None
 
     @property
@@ -57,14 +233,25 @@ class SpeakerDiarizer:
                     )
 
                 self._pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
+                    DIARIZATION_MODEL,
                     token=self.hf_token
                 )
+                self._pipeline.embedding_batch_size = self.embedding_batch_size
+                self._pipeline.segmentation_batch_size = self.segmentation_batch_size
                 if torch.cuda.is_available():
                     self._pipeline = self._pipeline.to(torch.device("cuda"))
                     logger.info("Loaded pyannote speaker diarization pipeline (GPU)")
+                elif self.cpu_mode == "fast":
+                    _apply_fast_cpu_settings(self._pipeline)
+                    logger.warning(
+                        "No GPU available; diarizing in fast CPU mode (coarser segmentation "
+                        "window, overlapped speech excluded from embeddings). "
+                        "Use cpu_diarization='full' for the pretrained settings."
+                    )
                 else:
                     logger.info("Loaded pyannote speaker diarization pipeline (CPU)")
+                if _install_fast_embeddings(self._pipeline):
+                    logger.info("Using shared-backbone speaker embeddings")
             except ImportError:
                 raise ImportError(
                     "pyannote.audio is required for speaker diarization. "
@@ -72,34 +259,48 @@ class SpeakerDiarizer:
                 )
         return self._pipeline
 
-    def diarize(self, audio_path: str) -> list[SpeakerSegment]:
+    @property
+    def variant(self) -> str:
+        """Label for inference settings that change results ("" for the defaults)."""
+        if self.cpu_mode != "fast":
+            return ""
+        import torch
+        return "" if torch.cuda.is_available() else "cpu-fast"
+
+    def diarize(self, audio: Union[str, dict]) -> list[SpeakerSegment]:
         """
-        Perform speaker diarization on an audio file.
+        Perform speaker diarization on an audio file or decoded waveform.
 
         Args:
-            audio_path: Path to the audio file.
+            audio: Path to the audio file, or {"waveform": samples, "sample_rate": rate}
+                   with mono samples already in memory (numpy array or tensor),
+                   which skips reading and decoding the file again.
 
         Returns:
             List of SpeakerSegment objects with speaker labels and timestamps.
         """
-        if not os.path.exists(audio_path):
-            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        if isinstance(audio, dict):
+            logger.info("Running speaker diarization on in-memory waveform")
+            audio_input = waveform_input(audio)
+        else:
+            if not os.path.exists(audio):
+                raise FileNotFoundError(f"Audio file not found: {audio}")
 
-        logger.info(f"Running speaker diarization on {audio_path}")
+            logger.info(f"Running speaker diarization on {audio}")
+
+            # Try loading audio as waveform via torchaudio to avoid torchcodec issues on Windows
+            try:
+                import torchaudio
+                waveform, sample_rate = torchaudio.load(audio)
+                audio_input = {"waveform": waveform, "sample_rate": sample_rate}
+            except Exception:
+                audio_input = audio
 
         # Run diarization pipeline
         kwargs = {}
         if self.num_speakers:
             kwargs["num_speakers"] = self.num_speakers
 
-        # Try loading audio as waveform via torchaudio to avoid torchcodec issues on Windows
-        try:
-            import torchaudio
-            waveform, sample_rate = torchaudio.load(audio_path)
-            audio_input = {"waveform": waveform, "sample_rate": sample_rate}
-        except Exception:
-            audio_input = audio_path
-
         diarization = self.pipeline(audio_input, **kwargs)
 
         segments = []
@@ -153,9 +354,23 @@ class SpeakerDiarizer:
         return None
 
 
+def word_times(words: list) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end times of word segments as float64 arrays.
+
+    Timestamps are Decimals from the transcriber and floats from the database.
+    Speaker assignment and boundary refinement both work on these arrays, so a
+    caller running both can convert once and pass the result to each.
+    """
+    n = len(words)
+    starts = np.fromiter((float(w.start_time) for w in words), dtype=np.float64, count=n)
+    ends = np.fromiter((float(w.end_time) for w in words), dtype=np.float64, count=n)
+    return starts, ends
+
+
 def assign_speakers_to_words(
     word_segments: list,
-    speaker_segments: list[SpeakerSegment]
+    speaker_segments: list[SpeakerSegment],
+    times: Optional[tuple[np.ndarray, np.ndarray]] = None,
 ) -> list:
     """
     Assign speaker labels to word segments based on diarization.
@@ -163,6 +378,7 @@ def assign_speakers_to_words(
     Args:
         word_segments: List of word segments with start_time/end_time.
         speaker_segments: List of SpeakerSegment from diarization.
+        times: word_times(word_segments), if the caller already has it.
 
     Returns:
         The same word segments with speaker field populated.
@@ -170,26 +386,35 @@ def assign_speakers_to_words(
     if not speaker_segments:
         return word_segments
 
-    # Build sorted list and parallel start_times list for binary search
+    # Sorted turn boundaries as float arrays so every word's candidate window
+    # comes from one vectorized binary search instead of a scan over all turns.
+    # Overlaps are computed in floats throughout: turns carry Decimal times
+    # while stored words carry floats, and the two do not mix arithmetically.
     sorted_speakers = sorted(speaker_segments, key=lambda s: s.start_time)
-    start_times = [s.start_time for s in sorted_speakers]
-
-    for word in word_segments:
-        word_start = word.start_time
-        word_end = word.end_time
-
-        # Use bisect to find candidate segments: only those with start_time < word_end
-        # can possibly overlap with the word.
-        right_idx = bisect.bisect_left(start_times, word_end)
-
+    turn_starts = np.fromiter((s.start_time for s in sorted_speakers), dtype=np.float64, count=len(sorted_speakers))
+    turn_ends = np.fromiter((s.end_time for s in sorted_speakers), dtype=np.float64, count=len(sorted_speakers))
+    word_starts, word_ends = times if times is not None else word_times(word_segments)
+    turn_bounds = list(zip(turn_starts.tolist(), turn_ends.tolist()))
+
+    # Only turns starting before the word ends can overlap it, and a turn that
+    # starts more than the longest turn duration before the word has already
+    # ended. The bounds are padded so rounding never drops a candidate; the
+    # overlap checks below discard anything extra.
+    longest_turn = float((turn_ends - turn_starts).max())
+    left_idx = np.searchsorted(turn_starts, word_starts - longest_turn - _BOUND_EPSILON, side="left")
+    right_idx = np.searchsorted(turn_starts, word_ends + _BOUND_EPSILON, side="right")
+
+    for word, word_start, word_end, lo, hi in zip(
+        word_segments, word_starts.tolist(), word_ends.tolist(), left_idx.tolist(), right_idx.tolist()
+    ):
         best_speaker = None
         best_confidence = None
-        max_overlap = Decimal(0)
-        second_max_overlap = Decimal(0)
-        for seg in sorted_speakers[:right_idx]:
-            if seg.end_time <= word_start:
-                continue  # segment ends before word starts — no overlap
-            overlap = min(word_end, seg.end_time) - max(word_start, seg.start_time)
+        max_overlap = 0.0
+        second_max_overlap = 0.0
+        for seg, (seg_start, seg_end) in zip(sorted_speakers[lo:hi], turn_bounds[lo:hi]):
+            if seg_end <= word_start or seg_start >= word_end:
+                continue  # no overlap with the word
+            overlap = min(word_end, seg_end) - max(word_start, seg_start)
             if overlap > max_overlap:
                 second_max_overlap = max_overlap
                 max_overlap = overlap
@@ -204,12 +429,12 @@ def assign_speakers_to_words(
 
         # Overlap detection: flag crosstalk when second-best speaker has significant overlap.
         # Conditions: second-best >= 30% of word duration AND >= 50% of best overlap.
-        if max_overlap > Decimal(0):
+        if max_overlap > 0.0:
             word_duration = word_end - word_start
-            if word_duration > Decimal(0):
+            if word_duration > 0.0:
                 is_overlap = (
-                    second_max_overlap >= word_duration * Decimal("0.3")
-                    and second_max_overlap >= max_overlap * Decimal("0.5")
+                    second_max_overlap >= word_duration * 0.3
+                    and second_max_overlap >= max_overlap * 0.5
                 )
                 word.is_overlap = is_overlap
             else:
@@ -220,6 +445,7 @@ def assign_speakers_to_words(
     # Bidirectional gap-filling: for unassigned words, pick the temporally
     # closer of the nearest preceding and following assigned words.
     n = len(word_segments)
+    word_mids = ((word_starts + word_ends) / 2).tolist()
 
     # Forward pass: for each position record the last assigned word before it
     prev_info = [None] * n  # (speaker, confidence, time_center)
@@ -229,7 +455,7 @@ def assign_speakers_to_words(
             last_assigned = (
                 word.speaker,
                 getattr(word, 'speaker_confidence', None),
-                (word.start_time + word.end_time) / 2,
+                word_mids[i],
             )
         prev_info[i] = last_assigned
 
@@ -242,7 +468,7 @@ def assign_speakers_to_words(
             next_assigned = (
                 word.speaker,
                 getattr(word, 'speaker_confidence', None),
-                (word.start_time + word.end_time) / 2,
+                word_mids[i],
             )
         next_info[i] = next_assigned
 
@@ -256,7 +482,7 @@ def assign_speakers_to_words(
         if prev is None and nxt is None:
             continue
 
-        word_mid = (word.start_time + word.end_time) / 2
+        word_mid = word_mids[i]
 
         if prev is None:
             chosen = nxt
@@ -274,18 +500,83 @@ def assign_speakers_to_words(
     return word_segments
 
 
+class CachedDiarizer:
+    """Diarizer wrapper that stores each result on disk and reuses it.
+
+    Diarization is deterministic for a given audio file, model and speaker
+    hint, so re-running an episode (retries, new speaker-ID settings) can
+    skip the pyannote forward pass. Entries are keyed by a digest of the
+    audio bytes (or decoded samples) together with the model name,
+    num_speakers and any non-default variant (e.g. the fast CPU mode), so a
+    changed download or setting is never served a stale result. Other attributes
+    are delegated to the wrapped diarizer.
+    """
+
+    def __init__(self, diarizer: SpeakerDiarizer, cache_dir: str, model_name: str = DIARIZATION_MODEL):
+        self.diarizer = diarizer
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.model_name = model_name
+
+    def __getattr__(self, name):
+        return getattr(self.diarizer, name)
+
+    def cache_path(self, audio: Union[str, dict]) -> Path:
+        """Cache file for an audio file or waveform under the current model and speaker hint."""
+        key = f"{_audio_digest(audio)}|{self.model_name}|{self.diarizer.num_speakers}"
+        if self.diarizer.variant:
+            key += f"|{self.diarizer.variant}"
+        return self.cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def diarize(self, audio: Union[str, dict]) -> list[SpeakerSegment]:
+        """Diarize an audio file or waveform, reading and writing the on-disk cache."""
+        if not isinstance(audio, dict) and not os.path.exists(audio):
+            raise FileNotFoundError(f"Audio file not found: {audio}")
+
+        path = self.cache_path(audio)
+        try:
+            rows = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable diarization cache entry {path}: {e}")
+        else:
+            logger.info("Using cached diarization")
+            return [
+                SpeakerSegment(speaker, Decimal(start), Decimal(end), confidence)
+                for speaker, start, end, confidence in rows
+            ]
+
+        segments = self.diarizer.diarize(audio)
+        rows = [[s.speaker, str(s.start_time), str(s.end_time), s.confidence] for s in segments]
+        temp_path = path.with_suffix(".tmp")
+        try:
+            temp_path.write_bytes(orjson.dumps(rows))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache diarization: {e}")
+        return segments
+
+
 def get_diarizer(
     hf_token: Optional[str] = None,
-    num_speakers: Optional[int] = None
-) -> SpeakerDiarizer:
+    num_speakers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cpu_mode: str = "fast",
+):
     """
     Factory function to get a diarizer instance.
 
     Args:
         hf_token: HuggingFace token. Defaults to HF_TOKEN env var.
         num_speakers: Expected number of speakers (optional).
+        cache_dir: Directory to cache diarization results in (optional).
+        cpu_mode: Diarization mode without a GPU (see CPU_DIARIZATION_MODES).
 
     Returns:
-        Configured SpeakerDiarizer instance.
+        Configured SpeakerDiarizer, wrapped in a CachedDiarizer when cache_dir is set.
     """
-    return SpeakerDiarizer(hf_token=hf_token, num_speakers=num_speakers)
+    diarizer = SpeakerDiarizer(hf_token=hf_token, num_speakers=num_speakers, cpu_mode=cpu_mode)
+    if cache_dir:
+        return CachedDiarizer(diarizer, cache_dir)
+    return diarizer
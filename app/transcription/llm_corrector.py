@@ -7,6 +7,7 @@ from typing import Optional, TYPE_CHECKING
 import anthropic
 
 from app.db.connection import get_cursor
+from app.db.repository import clear_episode_cache
 from app.transcription.llm_prompts import SYSTEM_PROMPT, make_user_prompt
 
 if TYPE_CHECKING:
@@ -308,6 +309,7 @@ class LLMCorrector:
                 (episode_id,),
             )
             row = cursor.fetchone()
+        clear_episode_cache(episode_id)
 
         if not row:
             logger.info("Episode %s already llm_corrected or not found", episode_id)
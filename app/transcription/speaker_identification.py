@@ -6,7 +6,7 @@ by comparing cluster embeddings against enrolled reference embeddings.
 import os
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -16,6 +16,14 @@ DEFAULT_MATCH_THRESHOLD = 0.70
 DEFAULT_NOISE_FLOOR = 0.30
 DEFAULT_EMBEDDINGS_DIR = "data/speaker_embeddings"
 
+# Spans embedded per forward pass by embed_segments
+EMBEDDING_BATCH_SIZE = 32
+
+# Longest zero padding a span may get in a batch, as a fraction of its own
+# length. Padded samples are masked out of pooling, but the model's input
+# normalization still sees them, so batches only group similar lengths.
+MAX_PADDING_FRACTION = 0.1
+
 
 class SpeakerIdentifier:
     """Identifies speakers by matching voice embeddings against references."""
@@ -91,14 +99,83 @@ class SpeakerIdentifier:
         logger.info(f"Loaded {len(self._references)} reference embeddings")
         return self._references
 
-    def _load_audio(self, audio_path: str) -> dict:
-        """Load audio as waveform dict to avoid torchcodec issues on Windows."""
+    def _load_audio(self, audio: Union[str, dict]) -> dict:
+        """Load audio as waveform dict to avoid torchcodec issues on Windows.
+
+        An already-loaded {"waveform", "sample_rate"} dict is used as is.
+        """
+        if isinstance(audio, dict):
+            return audio
         try:
             import torchaudio
-            waveform, sample_rate = torchaudio.load(audio_path)
+            waveform, sample_rate = torchaudio.load(audio)
             return {"waveform": waveform, "sample_rate": sample_rate}
         except Exception:
-            return {"audio": audio_path}
+            return {"audio": audio}
+
+    def embed_segments(self, audio_input: dict, spans: list) -> list:
+        """Embed many spans of an in-memory waveform in batched forward passes.
+
+        Spans are sorted by length and zero-padded to the longest in their
+        batch, with a mask so pooling ignores the padding. A span that cannot
+        be cropped gets None; if a batch fails, its spans are embedded one at
+        a time instead.
+
+        Args:
+            audio_input: {"waveform": (channel, sample) tensor, "sample_rate": int}.
+            spans: List of (start, end) times in seconds.
+
+        Returns:
+            List aligned with spans of embedding vectors (or None).
+        """
+        import torch
+        from pyannote.core import Segment
+
+        inference = self.model
+        model = inference.model
+
+        crops = {}
+        for i, (start, end) in enumerate(spans):
+            try:
+                crops[i], _ = model.audio.crop(audio_input, Segment(start, end))
+            except Exception as e:
+                logger.debug(f"Failed to crop segment {start}-{end}: {e}")
+
+        embeddings: list = [None] * len(spans)
+        order = sorted(crops, key=lambda i: crops[i].shape[-1])
+        while order:
+            # Grow the batch while the longest span needs little padding of the shortest
+            limit = crops[order[0]].shape[-1] * (1 + MAX_PADDING_FRACTION)
+            size = 1
+            while size < min(EMBEDDING_BATCH_SIZE, len(order)) and crops[order[size]].shape[-1] <= limit:
+                size += 1
+            batch, order = order[:size], order[size:]
+
+            max_len = crops[batch[-1]].shape[-1]
+            waveforms = torch.zeros(len(batch), crops[batch[0]].shape[0], max_len)
+            masks = torch.zeros(len(batch), max_len)
+            for row, i in enumerate(batch):
+                num_samples = crops[i].shape[-1]
+                waveforms[row, :, :num_samples] = crops[i]
+                masks[row, :num_samples] = 1.0
+
+            try:
+                with torch.inference_mode():
+                    outputs = model(
+                        waveforms.to(inference.device), weights=masks.to(inference.device)
+                    ).cpu().numpy()
+            except Exception as e:
+                logger.debug(f"Batched embedding failed, embedding {len(batch)} segments singly: {e}")
+                for i in batch:
+                    try:
+                        embeddings[i] = inference.crop(audio_input, Segment(*spans[i]))
+                    except Exception as e:
+                        logger.debug(f"Failed to extract embedding for segment {spans[i]}: {e}")
+                continue
+            for row, i in enumerate(batch):
+                embeddings[i] = outputs[row]
+
+        return embeddings
 
     def extract_cluster_embedding(
         self,
@@ -198,7 +275,7 @@ class SpeakerIdentifier:
 
     def identify(
         self,
-        audio_path: str,
+        audio: Union[str, dict],
         speaker_segments: list,
         expected_speakers: Optional[List[str]] = None,
     ) -> Tuple[Dict[str, str], Dict[str, float]]:
@@ -211,7 +288,8 @@ class SpeakerIdentifier:
         those names and all clusters are assigned to the closest match.
 
         Args:
-            audio_path: Path to the audio file.
+            audio: Path to the audio file, or a pre-loaded
+                {"waveform", "sample_rate"} dict to skip decoding it again.
             speaker_segments: List of SpeakerSegment objects from diarization.
             expected_speakers: Optional list of expected speaker names to
                 constrain matching (e.g., ["Will Menaker", "Felix Biederman"]).
@@ -247,7 +325,7 @@ class SpeakerIdentifier:
         logger.info(f"Identifying {len(unique_labels)} speakers against {len(references)} references")
 
         # Pre-load audio to avoid torchcodec issues on Windows
-        audio_input = self._load_audio(audio_path)
+        audio_input = self._load_audio(audio)
 
         # Extract embeddings for each cluster
         cluster_embeddings = {}
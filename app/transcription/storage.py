@@ -1,8 +1,9 @@
 from difflib import SequenceMatcher
-from typing import Optional, TYPE_CHECKING
-from decimal import Decimal
+from typing import Iterator, Optional, TYPE_CHECKING
+from psycopg2.extras import execute_values
 from app.db.connection import get_cursor
 from app.db.models import TranscriptSegment
+from app.db.repository import clear_episode_cache, mark_episode_processed
 
 # Lazy import to avoid loading whisper in production API
 if TYPE_CHECKING:
@@ -10,6 +11,67 @@ if TYPE_CHECKING:
 
 BATCH_SIZE = 1000
 
+# Above this many segments, unfiltered segment pages report an estimated total
+# (from the highest segment_index) instead of running an exact COUNT(*).
+APPROXIMATE_COUNT_THRESHOLD = 10000
+
+# TranscriptSegment's leading fields, in declaration order, so tuple rows
+# can be passed straight to the constructor
+SEGMENT_COLUMNS = "id, episode_id, word, start_time, end_time, segment_index, speaker"
+
+# Rows fetched per round trip when streaming paragraphs
+PARAGRAPH_STREAM_BATCH_SIZE = 200
+
+# Speaker-turn paragraphs for one episode. LAG() flags speaker changes, a
+# running SUM() numbers the paragraphs, and each paragraph is aggregated once.
+PARAGRAPHS_SQL = """
+    WITH labeled AS (
+        SELECT
+            ts.id,
+            ts.word,
+            ts.start_time,
+            ts.end_time,
+            ts.segment_index,
+            ts.speaker_confidence,
+            ts.word_confidence,
+            ts.is_overlap,
+            COALESCE(s.name, ts.speaker, 'Unknown Speaker') AS speaker
+        FROM transcript_segments ts
+        LEFT JOIN speakers s ON ts.speaker_id = s.id
+        WHERE ts.episode_id = %(episode_id)s
+    ),
+    breaks AS (
+        SELECT *,
+            CASE WHEN speaker IS DISTINCT FROM LAG(speaker) OVER w
+                 THEN 1 ELSE 0 END AS brk
+        FROM labeled
+        WINDOW w AS (ORDER BY segment_index)
+    ),
+    grouped AS (
+        SELECT *, SUM(brk) OVER (ORDER BY segment_index) AS paragraph
+        FROM breaks
+    )
+    SELECT
+        speaker,
+        string_agg(word, ' ' ORDER BY segment_index) AS text,
+        (array_agg(start_time ORDER BY segment_index))[1] AS start_time,
+        (array_agg(end_time ORDER BY segment_index DESC))[1] AS end_time,
+        array_agg(id ORDER BY segment_index) AS segment_ids,
+        MIN(speaker_confidence)::float8 AS speaker_confidence,
+        COALESCE(bool_or(is_overlap), FALSE) AS has_overlap,
+        json_agg(json_build_object(
+            'id', id,
+            'text', word,
+            'speaker_confidence', speaker_confidence::float8,
+            'word_confidence', word_confidence::float8
+        ) ORDER BY segment_index) AS words,
+        MIN(word_confidence)::float8 AS min_word_confidence,
+        MIN(segment_index) AS first_segment_index
+    FROM grouped
+    GROUP BY paragraph, speaker
+    ORDER BY first_segment_index
+"""
+
 class TranscriptStorage:
     """Stores transcripts in PostgreSQL with batch inserts."""
 
@@ -24,10 +86,41 @@ class TranscriptStorage:
         Returns:
             Number of segments stored.
         """
-        # Import here to avoid loading whisper in production API
-        from app.transcription.whisper_transcriber import TranscriptResult
+        return self.bulk_insert(self._segments_from_result(episode_id, result))
+
+    def replace_transcript(self, episode_id: int, result: "TranscriptResult", mark_processed: bool = False) -> int:
+        """
+        Replace an episode's transcript in a single transaction.
+
+        Deletes any existing segments and inserts the new ones on one cursor,
+        so the episode is never left half-written and the pipeline pays for
+        one connection checkout and one commit instead of two.
+
+        Args:
+            episode_id: Database ID of the episode.
+            result: TranscriptResult from whisper transcription.
+            mark_processed: Also mark the episode processed in the same
+                transaction, so it is never processed without its transcript.
 
-        segments = [
+        Returns:
+            Number of segments stored.
+        """
+        segments = self._segments_from_result(episode_id, result)
+        with get_cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM transcript_segments WHERE episode_id = %s",
+                (episode_id,)
+            )
+            count = self._insert_segments(cursor, segments)
+            if mark_processed:
+                mark_episode_processed(cursor, episode_id)
+        if mark_processed:
+            clear_episode_cache(episode_id)
+        return count
+
+    def _segments_from_result(self, episode_id: int, result: "TranscriptResult") -> list[TranscriptSegment]:
+        """Build TranscriptSegment rows from a transcription result."""
+        return [
             TranscriptSegment(
                 id=None,
                 episode_id=episode_id,
@@ -42,8 +135,6 @@ class TranscriptStorage:
             for idx, seg in enumerate(result.segments)
         ]
 
-        return self.bulk_insert(segments)
-
     def _resolve_speaker_id(self, cursor, speaker_name: Optional[str]) -> Optional[int]:
         """Resolve a speaker name to a speaker_id, creating the speaker if needed.
 
@@ -91,40 +182,44 @@ class TranscriptStorage:
         if not segments:
             return 0
 
+        with get_cursor() as cursor:
+            return self._insert_segments(cursor, segments)
+
+    def _insert_segments(self, cursor, segments: list[TranscriptSegment]) -> int:
+        """Insert segments in BATCH_SIZE batches on an open cursor."""
         total_inserted = 0
 
-        with get_cursor() as cursor:
-            # Pre-resolve speaker IDs for all unique speaker names
-            unique_speakers = set(s.speaker for s in segments if s.speaker)
-            speaker_id_cache = {}
-            for speaker_name in unique_speakers:
-                speaker_id_cache[speaker_name] = self._resolve_speaker_id(cursor, speaker_name)
+        # Pre-resolve speaker IDs for all unique speaker names
+        unique_speakers = set(s.speaker for s in segments if s.speaker)
+        speaker_id_cache = {}
+        for speaker_name in unique_speakers:
+            speaker_id_cache[speaker_name] = self._resolve_speaker_id(cursor, speaker_name)
+
+        # Process in batches
+        for i in range(0, len(segments), BATCH_SIZE):
+            batch = segments[i:i + BATCH_SIZE]
+            values = [
+                (s.episode_id, s.word, str(s.start_time), str(s.end_time),
+                 s.segment_index, s.speaker, speaker_id_cache.get(s.speaker),
+                 float(s.speaker_confidence) if s.speaker_confidence is not None else None,
+                 getattr(s, 'is_overlap', False),
+                 float(s.word_confidence) if s.word_confidence is not None else None)
+                for s in batch
+            ]
 
-            # Process in batches
-            for i in range(0, len(segments), BATCH_SIZE):
-                batch = segments[i:i + BATCH_SIZE]
-                values = [
-                    (s.episode_id, s.word, str(s.start_time), str(s.end_time),
-                     s.segment_index, s.speaker, speaker_id_cache.get(s.speaker),
-                     float(s.speaker_confidence) if s.speaker_confidence is not None else None,
-                     getattr(s, 'is_overlap', False),
-                     float(s.word_confidence) if s.word_confidence is not None else None)
-                    for s in batch
-                ]
-
-                # Use execute_values for efficient batch insert
-                args_str = ",".join(
-                    cursor.mogrify("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", v).decode("utf-8")
-                    for v in values
-                )
+            # Use execute_values for efficient batch insert
+            args_str = ",".join(
+                cursor.mogrify("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", v).decode("utf-8")
+                for v in values
+            )
 
-                cursor.execute(f"""
-                    INSERT INTO transcript_segments
-                    (episode_id, word, start_time, end_time, segment_index, speaker, speaker_id, speaker_confidence, is_overlap, word_confidence)
-                    VALUES {args_str}
-                """)
+            cursor.execute(f"""
+                INSERT INTO transcript_segments
+                (episode_id, word, start_time, end_time, segment_index, speaker, speaker_id, speaker_confidence, is_overlap, word_confidence)
+                VALUES {args_str}
+            """)
 
-                total_inserted += len(batch)
+            total_inserted += len(batch)
 
         return total_inserted
 
@@ -197,29 +292,17 @@ class TranscriptStorage:
         Returns:
             List of TranscriptSegment objects with id, start_time, end_time.
         """
-        with get_cursor(commit=False) as cursor:
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
             cursor.execute(
-                """
-                SELECT id, episode_id, word, start_time, end_time, segment_index, speaker
+                f"""
+                SELECT {SEGMENT_COLUMNS}
                 FROM transcript_segments
                 WHERE episode_id = %s
                 ORDER BY segment_index
                 """,
                 (episode_id,)
             )
-            rows = cursor.fetchall()
-            return [
-                TranscriptSegment(
-                    id=row["id"],
-                    episode_id=row["episode_id"],
-                    word=row["word"],
-                    start_time=Decimal(str(row["start_time"])),
-                    end_time=Decimal(str(row["end_time"])),
-                    segment_index=row["segment_index"],
-                    speaker=row["speaker"]
-                )
-                for row in rows
-            ]
+            return [TranscriptSegment(*row) for row in cursor.fetchall()]
 
     def update_speaker_labels(self, segments: list[TranscriptSegment]) -> int:
         """
@@ -259,6 +342,52 @@ class TranscriptStorage:
 
         return updated
 
+    def update_speaker_labels_pairs(self, pairs: list[tuple[int, str]]) -> int:
+        """
+        Apply manual speaker labels given as (segment_id, speaker) pairs.
+
+        Each batch is a single UPDATE ... FROM (VALUES ...). As with a manual
+        relabel through update_speaker_labels, speaker_confidence is cleared
+        and is_overlap reset.
+
+        Args:
+            pairs: List of (segment_id, speaker) tuples.
+
+        Returns:
+            Number of segments updated.
+        """
+        if not pairs:
+            return 0
+
+        updated = 0
+        with get_cursor() as cursor:
+            speaker_id_cache = {
+                speaker: self._resolve_speaker_id(cursor, speaker)
+                for speaker in {speaker for _, speaker in pairs if speaker}
+            }
+
+            for batch_start in range(0, len(pairs), BATCH_SIZE):
+                batch = pairs[batch_start:batch_start + BATCH_SIZE]
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE transcript_segments AS ts
+                    SET speaker = v.speaker,
+                        speaker_id = v.speaker_id,
+                        speaker_confidence = NULL,
+                        is_overlap = FALSE
+                    FROM (VALUES %s) AS v(id, speaker, speaker_id)
+                    WHERE ts.id = v.id
+                    """,
+                    [(segment_id, speaker, speaker_id_cache.get(speaker))
+                     for segment_id, speaker in batch],
+                    template="(%s, %s, %s::integer)",
+                    page_size=len(batch),
+                )
+                updated += cursor.rowcount
+
+        return updated
+
     def update_speakers_by_ids(self, segment_ids: list[int], speaker: str) -> int:
         """
         Update speaker label for transcript segments by their IDs.
@@ -291,21 +420,27 @@ class TranscriptStorage:
         episode_id: int,
         limit: int = 100,
         offset: int = 0,
-        speaker: Optional[str] = None
+        speaker: Optional[str] = None,
+        after_index: Optional[int] = None
     ) -> tuple[list[TranscriptSegment], int]:
         """
         Get paginated transcript segments for an episode.
 
+        When after_index is given, keyset pagination is used instead of
+        OFFSET: only segments with a segment_index greater than after_index
+        are returned, so deep pages cost the same as the first one.
+
         Args:
             episode_id: Database ID of the episode.
             limit: Maximum number of segments to return.
-            offset: Number of segments to skip.
+            offset: Number of segments to skip (ignored when after_index is set).
             speaker: Optional speaker filter.
+            after_index: Optional segment_index cursor from a previous page.
 
         Returns:
             Tuple of (segments list, total count).
         """
-        with get_cursor(commit=False) as cursor:
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
             # Build query with optional speaker filter
             where_clause = "WHERE episode_id = %s"
             params = [episode_id]
@@ -316,38 +451,182 @@ class TranscriptStorage:
 
             # Get total count
             cursor.execute(
-                f"SELECT COUNT(*) as count FROM transcript_segments {where_clause}",
+                f"SELECT COUNT(*) FROM transcript_segments {where_clause}",
                 params
             )
-            total = cursor.fetchone()["count"]
+            total = cursor.fetchone()[0]
 
             # Get paginated segments
+            if after_index is not None:
+                cursor.execute(
+                    f"""
+                    SELECT {SEGMENT_COLUMNS}
+                    FROM transcript_segments
+                    {where_clause} AND segment_index > %s
+                    ORDER BY segment_index
+                    LIMIT %s
+                    """,
+                    params + [after_index, limit]
+                )
+            else:
+                cursor.execute(
+                    f"""
+                    SELECT {SEGMENT_COLUMNS}
+                    FROM transcript_segments
+                    {where_clause}
+                    ORDER BY segment_index
+                    LIMIT %s OFFSET %s
+                    """,
+                    params + [limit, offset]
+                )
+
+            segments = [TranscriptSegment(*row) for row in cursor.fetchall()]
+
+            return segments, total
+
+    def get_episode_segments_page(
+        self,
+        episode_id: int,
+        limit: int = 100,
+        offset: int = 0,
+        speaker: Optional[str] = None,
+        after_index: Optional[int] = None,
+        columnar: bool = False,
+        count_mode: str = "auto"
+    ) -> Optional[dict]:
+        """
+        Get an episode, its speakers, a page of segments and the total count
+        in a single round trip.
+
+        The page is assembled by Postgres with json_build_object so the
+        episode lookup, DISTINCT speakers, segment page and COUNT(*) share
+        one query instead of four. One extra row is read past the page to
+        report has_more without needing a count.
+
+        With count_mode "auto", unfiltered pages of long episodes (more than
+        APPROXIMATE_COUNT_THRESHOLD segments) estimate the total from the
+        highest segment_index, an index-only lookup, rather than counting.
+        Deleted segments leave gaps in segment_index, so the estimate may run
+        slightly high; total_is_approximate flags it.
+
+        Args:
+            episode_id: Database ID of the episode.
+            limit: Maximum number of segments to return.
+            offset: Number of segments to skip (ignored when after_index is set).
+            speaker: Optional speaker filter.
+            after_index: Optional segment_index cursor from a previous page.
+            columnar: Return segments as parallel arrays (ids, words, starts,
+                ends, indices, speakers) under "columns" instead of a list of
+                row objects under "segments".
+            count_mode: "auto" (estimate when cheap, see above), "exact"
+                (always COUNT(*)) or "none" (skip the total; it is None).
+
+        Returns:
+            Dict with episode (id, title), speakers, segments (list of dicts)
+            or columns, has_more, total and total_is_approximate, or None if
+            the episode does not exist.
+        """
+        params = {
+            "episode_id": episode_id,
+            "speaker": speaker,
+            "after_index": after_index,
+            "limit": limit,
+            "probe_limit": limit + 1,
+            "offset": offset,
+            "approx_threshold": APPROXIMATE_COUNT_THRESHOLD,
+        }
+
+        filter_clause = "episode_id = %(episode_id)s"
+        if speaker is not None:
+            filter_clause += " AND speaker = %(speaker)s"
+
+        if after_index is not None:
+            page_clause = "AND segment_index > %(after_index)s ORDER BY segment_index LIMIT %(probe_limit)s"
+        else:
+            page_clause = "ORDER BY segment_index LIMIT %(probe_limit)s OFFSET %(offset)s"
+
+        if count_mode == "none":
+            count_cte = """
+                cnt AS (
+                    SELECT NULL::bigint AS total, FALSE AS approximate
+                )"""
+        elif count_mode == "exact" or speaker is not None:
+            count_cte = f"""
+                cnt AS (
+                    SELECT COUNT(*) AS total, FALSE AS approximate
+                    FROM transcript_segments
+                    WHERE {filter_clause}
+                )"""
+        else:
+            count_cte = f"""
+                est AS (
+                    SELECT COALESCE(MAX(segment_index) + 1, 0) AS n
+                    FROM transcript_segments
+                    WHERE {filter_clause}
+                ),
+                cnt AS (
+                    SELECT CASE WHEN est.n > %(approx_threshold)s THEN est.n
+                                ELSE (SELECT COUNT(*) FROM transcript_segments
+                                      WHERE {filter_clause})
+                           END AS total,
+                           est.n > %(approx_threshold)s AS approximate
+                    FROM est
+                )"""
+
+        if columnar:
+            segments_json = """'columns', (
+                        SELECT json_build_object(
+                            'ids', COALESCE(json_agg(id ORDER BY segment_index), '[]'::json),
+                            'words', COALESCE(json_agg(word ORDER BY segment_index), '[]'::json),
+                            'starts', COALESCE(json_agg(start_time ORDER BY segment_index), '[]'::json),
+                            'ends', COALESCE(json_agg(end_time ORDER BY segment_index), '[]'::json),
+                            'indices', COALESCE(json_agg(segment_index ORDER BY segment_index), '[]'::json),
+                            'speakers', COALESCE(json_agg(speaker ORDER BY segment_index), '[]'::json)
+                        ) FROM segs
+                    )"""
+        else:
+            segments_json = """'segments', COALESCE(
+                        (SELECT json_agg(segs ORDER BY segment_index) FROM segs), '[]'::json
+                    )"""
+
+        with get_cursor(commit=False, cursor_factory=None) as cursor:
             cursor.execute(
                 f"""
-                SELECT id, episode_id, word, start_time, end_time, segment_index, speaker
-                FROM transcript_segments
-                {where_clause}
-                ORDER BY segment_index
-                LIMIT %s OFFSET %s
+                WITH ep AS (
+                    SELECT id, title FROM episodes WHERE id = %(episode_id)s
+                ),
+                spk AS (
+                    SELECT DISTINCT speaker
+                    FROM transcript_segments
+                    WHERE episode_id = %(episode_id)s AND speaker IS NOT NULL
+                ),
+                probe AS (
+                    SELECT id, word, start_time, end_time, segment_index, speaker
+                    FROM transcript_segments
+                    WHERE {filter_clause}
+                    {page_clause}
+                ),
+                segs AS (
+                    SELECT * FROM probe ORDER BY segment_index LIMIT %(limit)s
+                ),{count_cte}
+                SELECT json_build_object(
+                    'episode', (SELECT row_to_json(ep) FROM ep),
+                    'speakers', COALESCE(
+                        (SELECT json_agg(speaker ORDER BY speaker) FROM spk), '[]'::json
+                    ),
+                    {segments_json},
+                    'has_more', (SELECT COUNT(*) FROM probe) > %(limit)s,
+                    'total', (SELECT total FROM cnt),
+                    'total_is_approximate', (SELECT approximate FROM cnt)
+                ) AS page
                 """,
-                params + [limit, offset]
+                params
             )
+            page = cursor.fetchone()[0]
 
-            rows = cursor.fetchall()
-            segments = [
-                TranscriptSegment(
-                    id=row["id"],
-                    episode_id=row["episode_id"],
-                    word=row["word"],
-                    start_time=Decimal(str(row["start_time"])),
-                    end_time=Decimal(str(row["end_time"])),
-                    segment_index=row["segment_index"],
-                    speaker=row["speaker"]
-                )
-                for row in rows
-            ]
-
-            return segments, total
+        if page["episode"] is None:
+            return None
+        return page
 
     def _log_edit(self, cursor, episode_id: int, segment_id: Optional[int],
                   field: str, old_value: Optional[str], new_value: Optional[str]) -> None:
@@ -437,6 +716,97 @@ class TranscriptStorage:
                                field='insert', old_value=None, new_value=word.strip())
             return new_id
 
+    def insert_segments_after(self, items: list[tuple[int, str]]) -> Optional[list[int]]:
+        """
+        Insert many segments in one transaction, each after an existing segment.
+
+        Words that share a reference segment are placed directly after it in
+        the order given. Subsequent segments are shifted in a single UPDATE and
+        the new rows are written with one multi-row INSERT.
+
+        Args:
+            items: List of (after_segment_id, word) tuples.
+
+        Returns:
+            IDs of the new segments in the same order as items, or None if any
+            reference segment wasn't found (nothing is inserted in that case).
+        """
+        if not items:
+            return []
+
+        ref_ids = list({after_id for after_id, _ in items})
+
+        with get_cursor() as cursor:
+            cursor.execute(
+                """SELECT id, episode_id, start_time, end_time, segment_index, speaker, speaker_id
+                   FROM transcript_segments WHERE id = ANY(%s)""",
+                (ref_ids,)
+            )
+            refs = {row["id"]: row for row in cursor.fetchall()}
+            if len(refs) != len(ref_ids):
+                return None
+
+            counts: dict[int, int] = {}
+            for after_id, _ in items:
+                counts[after_id] = counts.get(after_id, 0) + 1
+
+            # Each reference moves down by the words inserted before it in its episode
+            offsets: dict[int, int] = {}
+            running: dict[int, int] = {}
+            for ref in sorted(refs.values(), key=lambda r: (r["episode_id"], r["segment_index"])):
+                offsets[ref["id"]] = running.get(ref["episode_id"], 0)
+                running[ref["episode_id"]] = offsets[ref["id"]] + counts[ref["id"]]
+
+            execute_values(
+                cursor,
+                """UPDATE transcript_segments t
+                   SET segment_index = t.segment_index + s.shift
+                   FROM (
+                       SELECT ts.id, SUM(v.n) AS shift
+                       FROM transcript_segments ts
+                       JOIN (VALUES %s) AS v(episode_id, ref_index, n)
+                         ON ts.episode_id = v.episode_id AND ts.segment_index > v.ref_index
+                       GROUP BY ts.id
+                   ) s
+                   WHERE t.id = s.id""",
+                [(ref["episode_id"], ref["segment_index"], counts[ref_id])
+                 for ref_id, ref in refs.items()],
+                template="(%s::integer, %s::integer, %s::integer)"
+            )
+
+            placed: dict[int, int] = {}
+            rows = []
+            for after_id, word in items:
+                ref = refs[after_id]
+                placed[after_id] = placed.get(after_id, 0) + 1
+                rows.append((
+                    ref["episode_id"], word.strip(), ref["start_time"], ref["end_time"],
+                    ref["segment_index"] + offsets[after_id] + placed[after_id],
+                    ref["speaker"], ref["speaker_id"],
+                ))
+
+            inserted = execute_values(
+                cursor,
+                """INSERT INTO transcript_segments
+                   (episode_id, word, start_time, end_time, segment_index, speaker, speaker_id)
+                   VALUES %s
+                   RETURNING id""",
+                rows,
+                template="(%s, %s, %s, %s, %s, %s, %s)",
+                page_size=len(rows),
+                fetch=True
+            )
+            new_ids = [row["id"] for row in inserted]
+
+            execute_values(
+                cursor,
+                """INSERT INTO edit_history (episode_id, segment_id, field, old_value, new_value)
+                   VALUES %s""",
+                [(row[0], new_id, 'insert', None, row[1]) for row, new_id in zip(rows, new_ids)],
+                page_size=len(rows)
+            )
+            return new_ids
+
     def delete_segment(self, segment_id: int) -> bool:
         """
         Delete a specific transcript segment.
@@ -544,105 +914,62 @@ class TranscriptStorage:
         Get transcript segments grouped by speaker turns (paragraphs).
         A new paragraph starts when the speaker changes.
 
+        Grouping is done in Postgres: LAG() flags speaker changes, a running
+        SUM() of those flags numbers the paragraphs, and each paragraph is
+        aggregated in a single pass.
+
         Args:
             episode_id: Database ID of the episode.
 
         Returns:
-            List of paragraph dicts with speaker, text, start_time, end_time, segment_ids.
+            List of paragraph dicts with speaker, text, start_time, end_time, segment_ids,
+            speaker_confidence (minimum), has_overlap, words and min_word_confidence.
         """
         with get_cursor(commit=False) as cursor:
-            cursor.execute(
-                """
-                SELECT
-                    ts.id,
-                    ts.word,
-                    ts.start_time,
-                    ts.end_time,
-                    ts.segment_index,
-                    ts.speaker,
-                    ts.speaker_confidence,
-                    ts.word_confidence,
-                    ts.is_overlap,
-                    s.name as speaker_name
-                FROM transcript_segments ts
-                LEFT JOIN speakers s ON ts.speaker_id = s.id
-                WHERE ts.episode_id = %s
-                ORDER BY ts.segment_index
-                """,
-                (episode_id,)
-            )
+            cursor.execute(PARAGRAPHS_SQL, {"episode_id": episode_id})
+            paragraphs = [dict(row) for row in cursor.fetchall()]
 
-            rows = cursor.fetchall()
-
-            if not rows:
-                return []
+        for paragraph in paragraphs:
+            paragraph.pop("first_segment_index", None)
+        return paragraphs
 
-            # Group consecutive segments by speaker into paragraphs
-            paragraphs = []
-            current_paragraph = None
-
-            for row in rows:
-                speaker = row["speaker_name"] or row["speaker"] or "Unknown Speaker"
-
-                confidence = float(row["speaker_confidence"]) if row["speaker_confidence"] is not None else None
-                word_conf = float(row["word_confidence"]) if row["word_confidence"] is not None else None
-
-                word_entry = {
-                    "id": row["id"],
-                    "text": row["word"],
-                    "speaker_confidence": confidence,
-                    "word_confidence": word_conf,
-                }
+    def iter_episode_paragraphs(self, episode_id: int) -> Iterator[dict]:
+        """
+        Stream an episode's paragraphs through a server-side cursor.
 
-                # Start new paragraph if speaker changed or this is the first segment
-                is_overlap = bool(row["is_overlap"])
-
-                if current_paragraph is None or current_paragraph["speaker"] != speaker:
-                    if current_paragraph:
-                        paragraphs.append(current_paragraph)
-
-                    current_paragraph = {
-                        "speaker": speaker,
-                        "text": row["word"],
-                        "start_time": float(row["start_time"]),
-                        "end_time": float(row["end_time"]),
-                        "segment_ids": [row["id"]],
-                        "speaker_confidence": confidence,
-                        "has_overlap": is_overlap,
-                        "words": [word_entry],
-                        "min_word_confidence": word_conf,
-                    }
-                else:
-                    # Add to current paragraph
-                    current_paragraph["text"] += " " + row["word"]
-                    current_paragraph["end_time"] = float(row["end_time"])
-                    current_paragraph["segment_ids"].append(row["id"])
-                    current_paragraph["words"].append(word_entry)
-                    # Any word with overlap makes the paragraph flagged
-                    if is_overlap:
-                        current_paragraph["has_overlap"] = True
-                    # Use minimum confidence in the paragraph
-                    if confidence is not None:
-                        if current_paragraph["speaker_confidence"] is None:
-                            current_paragraph["speaker_confidence"] = confidence
-                        else:
-                            current_paragraph["speaker_confidence"] = min(
-                                current_paragraph["speaker_confidence"], confidence
-                            )
-                    # Track minimum word confidence
-                    if word_conf is not None:
-                        if current_paragraph["min_word_confidence"] is None:
-                            current_paragraph["min_word_confidence"] = word_conf
-                        else:
-                            current_paragraph["min_word_confidence"] = min(
-                                current_paragraph["min_word_confidence"], word_conf
-                            )
+        Every row carries the episode header (episode_title,
+        manually_reviewed) alongside one paragraph, so a missing episode
+        yields nothing at all and no separate existence check is needed.
+        An episode without segments yields a single row whose paragraph is
+        None. The connection is held until the generator is exhausted or
+        closed.
 
-            # Add the last paragraph
-            if current_paragraph:
-                paragraphs.append(current_paragraph)
+        Args:
+            episode_id: Database ID of the episode.
 
-            return paragraphs
+        Yields:
+            Dicts with episode_title, manually_reviewed and paragraph (as
+            returned by get_episode_paragraphs, or None).
+        """
+        with get_cursor(commit=False, name=f"paragraphs_{episode_id}") as cursor:
+            cursor.itersize = PARAGRAPH_STREAM_BATCH_SIZE
+            cursor.execute(
+                f"""
+                SELECT
+                    e.title AS episode_title,
+                    e.manually_reviewed,
+                    CASE WHEN p.first_segment_index IS NULL THEN NULL
+                         ELSE to_jsonb(p) - 'first_segment_index'
+                    END AS paragraph
+                FROM episodes e
+                LEFT JOIN LATERAL ({PARAGRAPHS_SQL}) p ON TRUE
+                WHERE e.id = %(episode_id)s
+                ORDER BY p.first_segment_index
+                """,
+                {"episode_id": episode_id}
+            )
+            for row in cursor:
+                yield row
 
     def edit_paragraph(self, segment_ids: list[int], new_text: str) -> dict:
         """
@@ -818,10 +1145,13 @@ class TranscriptStorage:
         start_segment_id: int,
         end_segment_id: int,
         speaker_id: int
-    ) -> int:
+    ) -> Optional[int]:
         """
         Assign a speaker to a range of segments.
 
+        Validates the speaker, resolves the range, logs the old speaker_ids to
+        edit_history and applies the update in a single statement.
+
         Args:
             episode_id: Database ID of the episode.
             start_segment_id: First segment ID in the range.
@@ -829,74 +1159,55 @@ class TranscriptStorage:
             speaker_id: Speaker ID from speakers table.
 
         Returns:
-            Number of segments updated.
+            Number of segments updated, or None if the speaker does not exist.
         """
         with get_cursor() as cursor:
-            # Get the segment indices for the range
-            # Handle both single word (start == end) and range selections
-            if start_segment_id == end_segment_id:
-                # Single word selection
-                cursor.execute(
-                    """
-                    SELECT segment_index
-                    FROM transcript_segments
-                    WHERE id = %s AND episode_id = %s
-                    """,
-                    (start_segment_id, episode_id)
-                )
-                row = cursor.fetchone()
-                if not row:
-                    return 0
-                start_index = end_index = row["segment_index"]
-            else:
-                # Range selection
-                cursor.execute(
-                    """
-                    SELECT segment_index
-                    FROM transcript_segments
-                    WHERE id IN (%s, %s) AND episode_id = %s
-                    ORDER BY segment_index
-                    """,
-                    (start_segment_id, end_segment_id, episode_id)
-                )
-                rows = cursor.fetchall()
-
-                if len(rows) != 2:
-                    return 0
-
-                start_index = rows[0]["segment_index"]
-                end_index = rows[1]["segment_index"]
-
-            # Fetch old speaker_ids before updating (for edit log)
+            # Single word (start == end) and range selections both resolve to
+            # an inclusive segment_index range; the range is only valid if
+            # every endpoint was found in this episode.
             cursor.execute(
                 """
-                SELECT id, speaker_id, episode_id
-                FROM transcript_segments
-                WHERE episode_id = %s
-                AND segment_index BETWEEN %s AND %s
-                """,
-                (episode_id, start_index, end_index)
-            )
-            old_segments = cursor.fetchall()
-
-            # Update all segments in the range
-            cursor.execute(
-                """
-                UPDATE transcript_segments
-                SET speaker_id = %s
-                WHERE episode_id = %s
-                AND segment_index BETWEEN %s AND %s
+                WITH spk AS (
+                    SELECT id FROM speakers WHERE id = %(speaker_id)s
+                ),
+                bounds AS (
+                    SELECT MIN(segment_index) AS lo, MAX(segment_index) AS hi,
+                           COUNT(*) AS found
+                    FROM transcript_segments
+                    WHERE id IN (%(start_id)s, %(end_id)s) AND episode_id = %(episode_id)s
+                ),
+                old AS (
+                    SELECT ts.id, ts.speaker_id
+                    FROM transcript_segments ts, bounds, spk
+                    WHERE ts.episode_id = %(episode_id)s
+                    AND ts.segment_index BETWEEN bounds.lo AND bounds.hi
+                    AND bounds.found = CASE WHEN %(start_id)s = %(end_id)s THEN 1 ELSE 2 END
+                ),
+                updated AS (
+                    UPDATE transcript_segments ts
+                    SET speaker_id = %(speaker_id)s
+                    FROM old
+                    WHERE ts.id = old.id
+                    RETURNING ts.id
+                ),
+                logged AS (
+                    INSERT INTO edit_history (episode_id, segment_id, field, old_value, new_value)
+                    SELECT %(episode_id)s, old.id, 'speaker', old.speaker_id::text, %(speaker_id)s::text
+                    FROM old
+                )
+                SELECT
+                    EXISTS (SELECT 1 FROM spk) AS speaker_exists,
+                    (SELECT COUNT(*) FROM updated) AS updated
                 """,
-                (speaker_id, episode_id, start_index, end_index)
+                {
+                    "episode_id": episode_id,
+                    "start_id": start_segment_id,
+                    "end_id": end_segment_id,
+                    "speaker_id": speaker_id,
+                }
             )
+            row = cursor.fetchone()
 
-            updated = cursor.rowcount
-
-            # Log an edit for each changed segment
-            for seg in old_segments:
-                self._log_edit(cursor, episode_id=seg["episode_id"], segment_id=seg["id"],
-                               field='speaker',
-                               old_value=str(seg["speaker_id"]) if seg["speaker_id"] is not None else None,
-                               new_value=str(speaker_id))
-
-            return updated
+            if not row["speaker_exists"]:
+                return None
+            return row["updated"]
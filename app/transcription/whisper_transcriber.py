@@ -2,12 +2,24 @@ import logging
 import os
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
 _logger = logging.getLogger(__name__)
 
+# Floating-point precisions accepted by WhisperTranscriber, as CTranslate2 compute types
+PRECISION_COMPUTE_TYPES = {
+    "fp32": "float32",
+    "fp16": "float16",
+    "bf16": "bfloat16",
+}
+
+# Silent audio decoded by warm_up; Whisper pads every window to 30 s, so
+# one second already runs the encoder at full size
+WARMUP_SAMPLES = 16000
+
 @dataclass
 class WordSegment:
     word: str
@@ -32,34 +44,106 @@ class WhisperTranscriber:
         model_name: str = "large-v3",
         initial_prompt: str = None,
         vad_filter: bool = False,
+        batch_size: Optional[int] = None,
+        precision: Optional[str] = None,
+        quantize: bool = False,
+        device_index: int = 0,
     ):
+        """
+        Args:
+            model_name: faster-whisper model name.
+            initial_prompt: Vocabulary prompt passed to every transcription.
+            vad_filter: Strip non-speech with Silero VAD before decoding.
+            batch_size: Decode this many ~30s chunks of a file per forward pass
+                with faster-whisper's batched pipeline. None decodes sequentially.
+                Batched decoding always splits audio on VAD speech boundaries.
+            precision: "fp32", "fp16" or "bf16". None picks per device (see model).
+            quantize: Load int8 weights. On GPU activations keep the float
+                precision (e.g. int8_float16); on CPU everything runs in int8
+                through CTranslate2's MKL (x86) or Ruy (ARM) kernels.
+            device_index: CUDA device to load the model on. Ignored on CPU.
+
+        Raises:
+            ValueError: If precision is not one of PRECISION_COMPUTE_TYPES.
+        """
+        if precision is not None and precision not in PRECISION_COMPUTE_TYPES:
+            raise ValueError(
+                f"Unknown precision {precision!r}; expected one of {sorted(PRECISION_COMPUTE_TYPES)}"
+            )
         self.model_name = model_name
         self.initial_prompt = initial_prompt
         self.vad_filter = vad_filter
+        self.batch_size = batch_size
+        self.precision = precision
+        self.quantize = quantize
+        self.device_index = device_index
         self._model = None
+        self._batched = None
 
     @property
     def model(self):
-        """Lazy load the model with optimal device/compute settings."""
+        """Lazy load the model with optimal device/compute settings.
+
+        An explicit precision wins, then WHISPER_COMPUTE_TYPE, then the device
+        default: bfloat16 on Ampere or newer GPUs, float16 on older GPUs and
+        int8 on CPU. quantize then swaps in int8 weights.
+        """
         if self._model is None:
             import torch
+            device_index = 0
             if torch.cuda.is_available():
                 device = "cuda"
-                compute_type = "float16"
+                device_index = self.device_index
+                major, _ = torch.cuda.get_device_capability(device_index)
+                compute_type = "bfloat16" if major >= 8 else "float16"
             else:
                 device = "cpu"
                 compute_type = "int8"
             compute_type = os.environ.get("WHISPER_COMPUTE_TYPE", compute_type)
+            if self.precision:
+                compute_type = PRECISION_COMPUTE_TYPES[self.precision]
+            if self.quantize:
+                if device == "cuda" and not compute_type.startswith("int8"):
+                    compute_type = f"int8_{compute_type}"
+                elif device == "cpu":
+                    compute_type = "int8"
             self._model = WhisperModel(
                 self.model_name,
                 device=device,
+                device_index=device_index,
                 compute_type=compute_type,
             )
         return self._model
 
-    def transcribe(self, audio_path: str) -> TranscriptResult:
-        """Transcribe an audio file with word-level timestamps."""
-        if not os.path.exists(audio_path):
+    @property
+    def batched(self) -> BatchedInferencePipeline:
+        """Lazy batched pipeline sharing the loaded model."""
+        if self._batched is None:
+            self._batched = BatchedInferencePipeline(model=self.model)
+        return self._batched
+
+    def warm_up(self) -> None:
+        """Load the model and run one short silent decode.
+
+        Pays for model loading, CUDA context creation and kernel selection up
+        front, so the first episode's transcription does not.
+        """
+        segments, _ = self.model.transcribe(
+            np.zeros(WARMUP_SAMPLES, dtype=np.float32),
+            language="en",
+            beam_size=1,
+            without_timestamps=True,
+        )
+        for _ in segments:
+            pass
+
+    def transcribe(self, audio_path: Union[str, BinaryIO, np.ndarray]) -> TranscriptResult:
+        """Transcribe audio with word-level timestamps.
+
+        Accepts a file path, an open binary file object, or mono float32
+        samples already decoded at 16 kHz.
+        """
+        if isinstance(audio_path, str) and not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         kwargs = dict(
@@ -72,7 +156,7 @@ class WhisperTranscriber:
             no_repeat_ngram_size=3,
         )
 
-        if self.vad_filter:
+        if self.vad_filter or self.batch_size:
             kwargs["vad_filter"] = True
             kwargs["vad_parameters"] = dict(
                 min_speech_duration_ms=250,
@@ -81,7 +165,12 @@ class WhisperTranscriber:
                 threshold=0.5,
             )
 
-        segments_gen, info = self.model.transcribe(audio_path, **kwargs)
+        if self.batch_size:
+            segments_gen, info = self.batched.transcribe(
+                audio_path, batch_size=self.batch_size, **kwargs
+            )
+        else:
+            segments_gen, info = self.model.transcribe(audio_path, **kwargs)
 
         segments = []
         words_list = []
@@ -121,7 +210,25 @@ def get_transcriber(
     model_name: Optional[str] = None,
     initial_prompt: Optional[str] = None,
     vad_filter: bool = False,
+    batch_size: Optional[int] = None,
+    precision: Optional[str] = None,
+    quantize: bool = False,
+    device_index: int = 0,
 ) -> WhisperTranscriber:
-    """Factory function to get a transcriber instance."""
+    """Factory function to get a transcriber instance.
+
+    model_name and batch_size default to the WHISPER_MODEL and
+    WHISPER_BATCH_SIZE environment variables.
+    """
     model = model_name or os.environ.get("WHISPER_MODEL", "large-v3")
-    return WhisperTranscriber(model_name=model, initial_prompt=initial_prompt, vad_filter=vad_filter)
+    if batch_size is None and os.environ.get("WHISPER_BATCH_SIZE"):
+        batch_size = int(os.environ["WHISPER_BATCH_SIZE"])
+    return WhisperTranscriber(
+        model_name=model,
+        initial_prompt=initial_prompt,
+        vad_filter=vad_filter,
+        batch_size=batch_size,
+        precision=precision,
+        quantize=quantize,
+        device_index=device_index,
+    )
@@ -1,5 +1,9 @@
 """YouTube/Patreon audio alignment utilities."""
 import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Optional
@@ -9,8 +13,15 @@ from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
 from ..db.connection import get_cursor
+from ..db.repository import EPISODE_CACHE_TTL_SECONDS
 from .timestamp import extract_video_id
 
+# Bounds for the in-process cache of per-episode anchor tables. Anchors are
+# written by manage.py in another process, so entries expire on the same TTL
+# as the episode cache rather than waiting for an explicit clear.
+ALIGNMENT_CACHE_MAXSIZE = 1024
+ALIGNMENT_CACHE_TTL_SECONDS = EPISODE_CACHE_TTL_SECONDS
+
 
 @dataclass
 class AnchorPoint:
@@ -290,18 +301,68 @@ def align_episode(episode_id: int, youtube_url: str) -> AlignmentResult:
     )
 
 
-def get_youtube_time(episode_id: int, patreon_time: float) -> Optional[float]:
-    """Convert a Patreon timestamp to YouTube timestamp using stored anchors.
+class _AlignmentCache:
+    """Thread-safe LRU cache of anchor tables with a per-entry time to live."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, episode_id: int) -> Optional[tuple[tuple[float, ...], tuple[float, ...]]]:
+        with self._lock:
+            entry = self._entries.get(episode_id)
+            if entry is None:
+                return None
+            expires_at, table = entry
+            if expires_at < time.monotonic():
+                del self._entries[episode_id]
+                return None
+            self._entries.move_to_end(episode_id)
+            return table
+
+    def put(self, episode_id: int, table: tuple[tuple[float, ...], tuple[float, ...]]) -> None:
+        with self._lock:
+            self._entries[episode_id] = (time.monotonic() + self.ttl, table)
+            self._entries.move_to_end(episode_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_alignment_cache = _AlignmentCache(ALIGNMENT_CACHE_MAXSIZE, ALIGNMENT_CACHE_TTL_SECONDS)
+
+
+def clear_alignment_cache() -> None:
+    """Drop every cached anchor table, e.g. after anchors were rewritten."""
+    _alignment_cache.clear()
+
+
+def _load_alignment(episode_id: int) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """Load the stored anchor table for an episode.
+
+    Results are cached per episode so that converting many timestamps for the
+    same episode (e.g. one per search result) only hits the database once.
+    Entries expire after ALIGNMENT_CACHE_TTL_SECONDS, so anchors written by
+    another process show up without a restart. Episodes without anchors are
+    not cached, so a newly aligned episode is picked up on the next lookup.
 
     Args:
         episode_id: Episode ID.
-        patreon_time: Time in the Patreon audio (seconds).
 
     Returns:
-        Corresponding YouTube time (seconds), or None if no anchors.
+        Tuple of (patreon_times, youtube_times), both sorted by patreon time.
+        Both are empty if the episode has no anchors.
     """
+    table = _alignment_cache.get(episode_id)
+    if table is not None:
+        return table
+
     with get_cursor(commit=False) as cursor:
-        # Get anchor points for this episode
         cursor.execute(
             """
             SELECT patreon_time, youtube_time
@@ -313,41 +374,49 @@ def get_youtube_time(episode_id: int, patreon_time: float) -> Optional[float]:
         )
         anchors = cursor.fetchall()
 
-    if not anchors:
+    patreon_times = tuple(float(row["patreon_time"]) for row in anchors)
+    youtube_times = tuple(float(row["youtube_time"]) for row in anchors)
+    table = (patreon_times, youtube_times)
+    if patreon_times:
+        _alignment_cache.put(episode_id, table)
+    return table
+
+
+def get_youtube_time(episode_id: int, patreon_time: float) -> Optional[float]:
+    """Convert a Patreon timestamp to YouTube timestamp using stored anchors.
+
+    Args:
+        episode_id: Episode ID.
+        patreon_time: Time in the Patreon audio (seconds).
+
+    Returns:
+        Corresponding YouTube time (seconds), or None if no anchors.
+    """
+    patreon_times, youtube_times = _load_alignment(episode_id)
+    if not patreon_times:
         return None
 
-    # Compute offset from anchors using interpolation
     # Find the two closest anchors (before and after)
-    before = None
-    after = None
-
-    for row in anchors:
-        pt = float(row["patreon_time"])
-        yt = float(row["youtube_time"])
-        if pt <= patreon_time:
-            before = (pt, yt)
-        if pt >= patreon_time and after is None:
-            after = (pt, yt)
+    before_idx = bisect_right(patreon_times, patreon_time) - 1
+    after_idx = bisect_left(patreon_times, patreon_time)
+    has_before = before_idx >= 0
+    has_after = after_idx < len(patreon_times)
 
     # If we only have anchors on one side, use simple offset
-    if before and not after:
-        offset = before[0] - before[1]
+    if has_before and not has_after:
+        offset = patreon_times[before_idx] - youtube_times[before_idx]
         return patreon_time - offset
-    if after and not before:
-        offset = after[0] - after[1]
+    if has_after and not has_before:
+        offset = patreon_times[after_idx] - youtube_times[after_idx]
         return patreon_time - offset
 
-    # Interpolate between two anchors
-    if before and after:
-        # Linear interpolation
-        p1, y1 = before
-        p2, y2 = after
-        if p2 == p1:
-            return y1
-        ratio = (patreon_time - p1) / (p2 - p1)
-        return y1 + ratio * (y2 - y1)
-
-    return None
+    # Linear interpolation between two anchors
+    p1, y1 = patreon_times[before_idx], youtube_times[before_idx]
+    p2, y2 = patreon_times[after_idx], youtube_times[after_idx]
+    if p2 == p1:
+        return y1
+    ratio = (patreon_time - p1) / (p2 - p1)
+    return y1 + ratio * (y2 - y1)
 
 
 def store_anchor_points(episode_id: int, result: AlignmentResult) -> int:
@@ -383,4 +452,5 @@ def store_anchor_points(episode_id: int, result: AlignmentResult) -> int:
             values
         )
 
+    clear_alignment_cache()
     return len(result.anchor_points)
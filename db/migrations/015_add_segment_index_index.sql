@@ -0,0 +1,3 @@
+-- Index for keyset pagination of transcript segments within an episode
+CREATE INDEX IF NOT EXISTS idx_transcript_segments_episode_segment_index
+    ON transcript_segments(episode_id, segment_index);
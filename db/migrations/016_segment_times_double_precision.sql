@@ -0,0 +1,5 @@
+-- Store word timings as double precision so reads come back as Python floats
+-- instead of Decimal (15 significant digits is ample for word-level timings)
+ALTER TABLE transcript_segments
+    ALTER COLUMN start_time TYPE double precision USING start_time::double precision,
+    ALTER COLUMN end_time TYPE double precision USING end_time::double precision;
@@ -0,0 +1,9 @@
+-- Converge is_free for episodes already matched to a YouTube upload
+UPDATE episodes SET is_free = TRUE WHERE youtube_url IS NOT NULL AND is_free = FALSE;
+
+-- Partial index covering the free-episode listing (newest first).
+-- The predicate matches EpisodeRepository.iter_free_episodes exactly so the
+-- planner can use it; keep the two in sync.
+CREATE INDEX IF NOT EXISTS idx_episodes_free_published
+    ON episodes(published_at DESC)
+    WHERE is_free = TRUE OR youtube_url IS NOT NULL;
@@ -0,0 +1,5 @@
+-- Episodes with segments still lacking word confidence, for the
+-- EXISTS probe in EpisodeRepository.iter_with_missing_word_confidence
+CREATE INDEX IF NOT EXISTS idx_transcript_segments_missing_word_confidence
+    ON transcript_segments(episode_id)
+    WHERE word_confidence IS NULL;
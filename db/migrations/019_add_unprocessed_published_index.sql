@@ -0,0 +1,6 @@
+-- Unprocessed episodes newest first, so EpisodeRepository.iter_unprocessed
+-- can read just LIMIT rows (after OFFSET) instead of sorting the backlog.
+-- The predicate matches its WHERE NOT processed; keep the two in sync.
+CREATE INDEX IF NOT EXISTS idx_episodes_unprocessed_published
+    ON episodes(published_at DESC)
+    WHERE NOT processed;
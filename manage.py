@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Crankiac management CLI."""
 import argparse
+import logging
 import os
 import sys
 
@@ -31,6 +32,14 @@ def process(args):
         match_threshold=args.match_threshold,
         expected_speakers=expected_speakers,
         enable_vad=args.vad,
+        whisper_precision=args.precision,
+        whisper_quantize=args.quantize,
+        audio_cache_dir=args.audio_cache_dir,
+        diarization_cache_dir=args.diarization_cache_dir,
+        prefetch_episodes=args.prefetch,
+        num_gpus=args.gpus,
+        parallel_diarization=not args.serial_diarization,
+        cpu_diarization=args.cpu_diarization,
     )
 
     # Handle single episode processing by ID
@@ -141,7 +150,7 @@ def process(args):
 
         # Get unprocessed episodes and apply custom filtering
         repo = EpisodeRepository()
-        all_unprocessed = repo.get_unprocessed(numbered_only=False)  # Get all, we'll filter ourselves
+        all_unprocessed = repo.iter_unprocessed(numbered_only=False)  # Stream all, we'll filter ourselves
 
         # Custom filter: include numbered episodes + specifically included shows
         filtered = []
@@ -230,6 +239,7 @@ def diarize(args):
         enable_speaker_id=args.identify_speakers,
         match_threshold=args.match_threshold,
         expected_speakers=expected_speakers,
+        diarization_cache_dir=args.diarization_cache_dir,
     )
 
     repo = EpisodeRepository()
@@ -500,6 +510,7 @@ def backfill_is_free(args):
 def cleanup_episodes(args):
     """Delete all episodes except specified episode numbers."""
     from app.db.connection import get_cursor
+    from app.db.repository import clear_episode_cache
 
     keep_episodes = args.keep
     if not keep_episodes:
@@ -563,6 +574,7 @@ def cleanup_episodes(args):
 
         deleted = cursor.rowcount
         print(f"✅ Deleted {deleted} episodes")
+    clear_episode_cache()
 
     print("\nVerifying...")
     with get_cursor(commit=False) as cursor:
@@ -576,7 +588,7 @@ def cleanup_episodes(args):
 def llm_correct_cmd(args):
     """Run LLM-based correction on low-confidence transcript words."""
     from app.db.connection import get_cursor
-    from app.db.repository import EpisodeRepository
+    from app.db.repository import EpisodeRepository, clear_episode_cache
     from app.db.models import Episode
     from app.transcription.llm_corrector import LLMCorrector
 
@@ -735,6 +747,7 @@ def llm_correct_cmd(args):
                         "UPDATE episodes SET llm_corrected = FALSE WHERE id = %s",
                         (episode.id,)
                     )
+                clear_episode_cache(episode.id)
 
             count = corrector.correct_episode(episode.id)
             if count == -1:
@@ -916,6 +929,7 @@ def extract_clips(args):
         output_dir=args.output_dir,
         min_duration=args.min_duration,
         max_duration=args.max_duration,
+        max_workers=args.workers,
     )
 
     # Handle single episode by ID
@@ -985,6 +999,8 @@ def extract_clips(args):
         processed = 0
         skipped = 0
 
+        titles = {}
+        jobs = []
         for episode in episodes:
             audio_path = str(downloader.get_file_path(episode.patreon_id))
 
@@ -993,14 +1009,15 @@ def extract_clips(args):
                 skipped += 1
                 continue
 
-            print(f"  Processing: {episode.title[:50]}...")
+            titles[episode.id] = episode.title
+            jobs.append((episode.id, audio_path))
 
-            clips = extractor.extract_clips(
-                episode_id=episode.id,
-                audio_path=audio_path,
-                speaker_name=args.speaker,
-                max_clips_per_speaker=args.max_clips
-            )
+        for episode_id, clips in extractor.extract_clips_many(
+            jobs,
+            speaker_name=args.speaker,
+            max_clips_per_speaker=args.max_clips
+        ):
+            print(f"  Processed: {titles[episode_id][:50]}...")
 
             if clips:
                 clip_count = sum(len(paths) for paths in clips.values())
@@ -1048,6 +1065,8 @@ def extract_clips(args):
     processed = 0
     skipped = 0
 
+    titles = {}
+    jobs = []
     for ep in episodes:
         episode_id = ep["id"]
         title = ep["title"]
@@ -1060,14 +1079,15 @@ def extract_clips(args):
             skipped += 1
             continue
 
-        print(f"  Processing: {title[:50]}...")
+        titles[episode_id] = title
+        jobs.append((episode_id, audio_path))
 
-        clips = extractor.extract_clips(
-            episode_id=episode_id,
-            audio_path=audio_path,
-            speaker_name=args.speaker,
-            max_clips_per_speaker=args.max_clips
-        )
+    for episode_id, clips in extractor.extract_clips_many(
+        jobs,
+        speaker_name=args.speaker,
+        max_clips_per_speaker=args.max_clips
+    ):
+        print(f"  Processed: {titles[episode_id][:50]}...")
 
         if clips:
             clip_count = sum(len(paths) for paths in clips.values())
@@ -1214,9 +1234,17 @@ def main():
     # Processing options
     process_parser.add_argument("--model", default="large-v3", help="Whisper model (tiny/base/small/medium/large/large-v3/turbo)")
     process_parser.add_argument("--no-cleanup", action="store_true", help="Keep audio files after transcription")
+    process_parser.add_argument("--precision", choices=["fp32", "fp16", "bf16"], default=None, help="Whisper inference precision (default: bf16/fp16 on GPU by capability, int8 on CPU)")
+    process_parser.add_argument("--quantize", action="store_true", help="Load int8-quantized Whisper weights (int8_float16 etc. on GPU, int8 on CPU)")
+    process_parser.add_argument("--audio-cache-dir", metavar="DIR", default=None, help="Cache decoded audio here so re-transcribing an episode skips decoding")
+    process_parser.add_argument("--diarization-cache-dir", metavar="DIR", default=None, help="Cache diarization results here so re-running an episode skips pyannote")
+    process_parser.add_argument("--prefetch", type=int, default=2, metavar="N", help="Episodes to download ahead of transcription (default: 2)")
+    process_parser.add_argument("--gpus", type=int, default=1, metavar="N", help="Load a Whisper model on each of cuda:0..N-1 and transcribe N episodes at once (default: 1)")
     # Diarization options
     process_parser.add_argument("--diarize", action="store_true", help="Enable speaker diarization")
     process_parser.add_argument("--num-speakers", type=int, default=None, help="Hint for number of speakers (optional)")
+    process_parser.add_argument("--serial-diarization", action="store_true", help="Diarize after transcription instead of alongside it (uses less GPU memory)")
+    process_parser.add_argument("--cpu-diarization", choices=["full", "fast", "skip"], default="fast", help="Diarization without a GPU: full pipeline, coarser fast mode, or skip (default: fast)")
     # Speaker identification options
     process_parser.add_argument("--identify-speakers", action="store_true", help="Enable speaker identification via voice embeddings")
     process_parser.add_argument("--match-threshold", type=float, default=0.70, help="Cosine similarity threshold for speaker matching (default: 0.70)")
@@ -1236,6 +1264,7 @@ def main():
     diarize_parser.add_argument("--episode", type=int, metavar="ID", help="Diarize a specific episode by database ID")
     diarize_parser.add_argument("--num-speakers", type=int, default=None, help="Hint for number of speakers (optional)")
     diarize_parser.add_argument("--no-cleanup", action="store_true", help="Keep audio files after diarization")
+    diarize_parser.add_argument("--diarization-cache-dir", metavar="DIR", default=None, help="Cache diarization results here so re-running an episode skips pyannote")
     # Speaker identification options
     diarize_parser.add_argument("--identify-speakers", action="store_true", help="Enable speaker identification via voice embeddings")
     diarize_parser.add_argument("--match-threshold", type=float, default=0.70, help="Cosine similarity threshold for speaker matching (default: 0.70)")
@@ -1322,9 +1351,11 @@ def main():
     clips_parser.add_argument("--min-duration", type=float, default=10.0, help="Minimum clip duration in seconds (default: 10.0)")
     clips_parser.add_argument("--max-duration", type=float, default=20.0, help="Maximum clip duration in seconds (default: 20.0)")
     clips_parser.add_argument("--output-dir", default="data/reference_audio", help="Directory to save clips (default: data/reference_audio)")
+    clips_parser.add_argument("--workers", type=int, default=None, help="Concurrent ffmpeg processes per episode (default: CPU count)")
     clips_parser.add_argument("--verbose", "-v", action="store_true", help="Show detailed output including clip paths")
 
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
 
     if args.command == "migrate":
         migrate()
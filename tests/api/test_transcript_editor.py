@@ -68,7 +68,7 @@ class TestGetSpeakers:
 
         # Should return known speakers
         assert 'known_speakers' in data
-        assert data['known_speakers'] == KNOWN_SPEAKERS
+        assert data['known_speakers'] == list(KNOWN_SPEAKERS)
 
         # Should return distinct speakers from episode
         assert 'episode_speakers' in data
@@ -125,6 +125,15 @@ class TestEndpointsReturn200:
 class TestConnectionContextManagers:
     """Tests for connection context manager behavior."""
 
+    def setup_method(self):
+        # Each test patches psycopg2.connect, so start from an empty pool
+        from app.db.connection import close_all_connections
+        close_all_connections()
+
+    def teardown_method(self):
+        from app.db.connection import close_all_connections
+        close_all_connections()
+
     def test_get_cursor_context_manager(self):
         """Verify get_cursor works as context manager."""
         mock_conn = MagicMock()
@@ -0,0 +1,147 @@
+"""
+Integration tests for grouping transcript words into paragraphs.
+
+Paragraph grouping runs in Postgres (PARAGRAPHS_SQL), so these tests insert
+real words and check the paragraphs TranscriptStorage reads back.
+"""
+import pytest
+import os
+from datetime import datetime
+
+
+# (segment_index, word, start, end, speaker, speaker_confidence, word_confidence, is_overlap)
+WORDS = [
+    (0, "hello", 0.0, 0.5, "SPEAKER_00", 0.9, 0.8, False),
+    (1, "there", 0.5, 1.0, "SPEAKER_00", 0.7, 0.6, False),
+    (2, "yeah", 1.0, 1.4, "SPEAKER_01", 0.5, 0.95, True),
+    (3, "right", 1.4, 2.0, "SPEAKER_01", 0.6, 0.3, False),
+    (4, "anyway", 2.0, 2.5, "SPEAKER_00", 0.8, None, False),
+    (5, "um", 2.5, 2.7, None, None, None, False),
+]
+
+
+@pytest.fixture
+def episode_with_words():
+    """Create an episode whose words alternate between two speakers."""
+    from app.db.connection import get_cursor
+
+    episode_id = None
+    try:
+        with get_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO episodes (patreon_id, title, published_at, processed, is_free)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING id
+                """,
+                ("test-integration-paragraphs", "Paragraph Test Episode", datetime(2023, 6, 15), True, True)
+            )
+            episode_id = cursor.fetchone()["id"]
+
+            ids = {}
+            # Insert out of order so grouping has to follow segment_index
+            for idx, word, start, end, speaker, speaker_conf, word_conf, overlap in reversed(WORDS):
+                cursor.execute(
+                    """
+                    INSERT INTO transcript_segments
+                    (episode_id, word, start_time, end_time, segment_index, speaker,
+                     speaker_confidence, word_confidence, is_overlap)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                    """,
+                    (episode_id, word, start, end, idx, speaker, speaker_conf, word_conf, overlap)
+                )
+                ids[idx] = cursor.fetchone()["id"]
+
+        yield episode_id, [ids[idx] for idx in range(len(WORDS))]
+    finally:
+        if episode_id is not None:
+            with get_cursor() as cursor:
+                cursor.execute("DELETE FROM episodes WHERE id = %s", (episode_id,))
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    os.environ.get("TEST_DATABASE_URL") is None and os.environ.get("DATABASE_URL") is None,
+    reason="Requires PostgreSQL database (set TEST_DATABASE_URL or DATABASE_URL)"
+)
+def test_get_episode_paragraphs_groups_speaker_turns(episode_with_words):
+    """A new paragraph starts at every speaker change, including back to an earlier speaker."""
+    from app.transcription.storage import TranscriptStorage
+
+    episode_id, ids = episode_with_words
+    paragraphs = TranscriptStorage().get_episode_paragraphs(episode_id)
+
+    assert [p["speaker"] for p in paragraphs] == [
+        "SPEAKER_00", "SPEAKER_01", "SPEAKER_00", "Unknown Speaker",
+    ]
+    assert [p["text"] for p in paragraphs] == ["hello there", "yeah right", "anyway", "um"]
+    assert [p["segment_ids"] for p in paragraphs] == [ids[0:2], ids[2:4], ids[4:5], ids[5:6]]
+    assert [p["start_time"] for p in paragraphs] == pytest.approx([0.0, 1.0, 2.0, 2.5])
+    assert [p["end_time"] for p in paragraphs] == pytest.approx([1.0, 2.0, 2.5, 2.7])
+    assert all("first_segment_index" not in p for p in paragraphs)
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    os.environ.get("TEST_DATABASE_URL") is None and os.environ.get("DATABASE_URL") is None,
+    reason="Requires PostgreSQL database (set TEST_DATABASE_URL or DATABASE_URL)"
+)
+def test_get_episode_paragraphs_aggregates_overlap_and_confidence(episode_with_words):
+    """has_overlap and minimum confidences are aggregated per paragraph, not per episode."""
+    from app.transcription.storage import TranscriptStorage
+
+    episode_id, _ = episode_with_words
+    paragraphs = TranscriptStorage().get_episode_paragraphs(episode_id)
+
+    assert [p["has_overlap"] for p in paragraphs] == [False, True, False, False]
+    assert paragraphs[0]["speaker_confidence"] == pytest.approx(0.7)
+    assert paragraphs[1]["speaker_confidence"] == pytest.approx(0.5)
+    assert paragraphs[3]["speaker_confidence"] is None
+    assert paragraphs[0]["min_word_confidence"] == pytest.approx(0.6)
+    assert paragraphs[1]["min_word_confidence"] == pytest.approx(0.3)
+    assert paragraphs[2]["min_word_confidence"] is None
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    os.environ.get("TEST_DATABASE_URL") is None and os.environ.get("DATABASE_URL") is None,
+    reason="Requires PostgreSQL database (set TEST_DATABASE_URL or DATABASE_URL)"
+)
+def test_get_episode_paragraphs_includes_words_array(episode_with_words):
+    """Each paragraph carries its words, in order, with per-word confidences."""
+    from app.transcription.storage import TranscriptStorage
+
+    episode_id, ids = episode_with_words
+    paragraphs = TranscriptStorage().get_episode_paragraphs(episode_id)
+
+    words = paragraphs[1]["words"]
+    assert [w["id"] for w in words] == ids[2:4]
+    assert [w["text"] for w in words] == ["yeah", "right"]
+    assert [w["speaker_confidence"] for w in words] == pytest.approx([0.5, 0.6])
+    assert [w["word_confidence"] for w in words] == pytest.approx([0.95, 0.3])
+    assert paragraphs[2]["words"] == [
+        {"id": ids[4], "text": "anyway", "speaker_confidence": pytest.approx(0.8), "word_confidence": None}
+    ]
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    os.environ.get("TEST_DATABASE_URL") is None and os.environ.get("DATABASE_URL") is None,
+    reason="Requires PostgreSQL database (set TEST_DATABASE_URL or DATABASE_URL)"
+)
+def test_iter_episode_paragraphs_matches_get_episode_paragraphs(episode_with_words):
+    """The streaming variant groups the same paragraphs and carries the episode header."""
+    from app.transcription.storage import TranscriptStorage
+
+    episode_id, _ = episode_with_words
+    storage = TranscriptStorage()
+    rows = list(storage.iter_episode_paragraphs(episode_id))
+    expected = storage.get_episode_paragraphs(episode_id)
+
+    assert {row["episode_title"] for row in rows} == {"Paragraph Test Episode"}
+    streamed = [row["paragraph"] for row in rows]
+    assert [(p["speaker"], p["text"], p["segment_ids"]) for p in streamed] == [
+        (p["speaker"], p["text"], p["segment_ids"]) for p in expected
+    ]
+    assert [p["has_overlap"] for p in streamed] == [p["has_overlap"] for p in expected]
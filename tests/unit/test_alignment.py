@@ -7,6 +7,8 @@ import pytest
 from app.youtube.alignment import (
     AnchorPoint,
     AlignmentResult,
+    clear_alignment_cache,
+    get_youtube_time,
     store_anchor_points,
 )
 
@@ -148,3 +150,92 @@ class TestStoreAnchorPoints:
 
         count = store_anchor_points(episode_id=1, result=result)
         assert count == 5
+
+
+class TestGetYoutubeTime:
+    """Tests for get_youtube_time and the cached anchor loader."""
+
+    def setup_method(self):
+        clear_alignment_cache()
+
+    def teardown_method(self):
+        clear_alignment_cache()
+
+    def _mock_anchors(self, mock_get_cursor, rows):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = rows
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        return mock_cursor
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_no_anchors_returns_none(self, mock_get_cursor):
+        """Episodes without anchors have no YouTube time."""
+        self._mock_anchors(mock_get_cursor, [])
+        assert get_youtube_time(1, 10.0) is None
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_interpolates_between_anchors(self, mock_get_cursor):
+        """Times between two anchors are linearly interpolated."""
+        self._mock_anchors(mock_get_cursor, [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("20.0")},
+            {"patreon_time": Decimal("30.0"), "youtube_time": Decimal("42.0")},
+        ])
+        assert get_youtube_time(1, 20.0) == pytest.approx(31.0)
+        assert get_youtube_time(1, 10.0) == pytest.approx(20.0)
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_uses_offset_outside_anchor_range(self, mock_get_cursor):
+        """Times before the first or after the last anchor use that anchor's offset."""
+        self._mock_anchors(mock_get_cursor, [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("15.0")},
+            {"patreon_time": Decimal("30.0"), "youtube_time": Decimal("32.0")},
+        ])
+        assert get_youtube_time(1, 5.0) == pytest.approx(10.0)
+        assert get_youtube_time(1, 40.0) == pytest.approx(42.0)
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_anchors_loaded_once_per_episode(self, mock_get_cursor):
+        """Repeated lookups for an episode reuse the cached anchor table."""
+        mock_cursor = self._mock_anchors(mock_get_cursor, [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("15.0")},
+        ])
+        for t in (1.0, 2.0, 3.0):
+            get_youtube_time(1, t)
+        assert mock_cursor.execute.call_count == 1
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_store_anchor_points_invalidates_cache(self, mock_get_cursor):
+        """Storing new anchors clears cached anchor tables."""
+        mock_cursor = self._mock_anchors(mock_get_cursor, [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("15.0")},
+        ])
+        get_youtube_time(1, 1.0)
+        store_anchor_points(1, AlignmentResult(anchor_points=[
+            AnchorPoint(patreon_time=Decimal("1"), youtube_time=Decimal("2")),
+        ]))
+        get_youtube_time(1, 1.0)
+        # load, delete+insert, load again
+        assert mock_cursor.execute.call_count == 3
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_episodes_without_anchors_are_not_cached(self, mock_get_cursor):
+        """An episode looked up before it was aligned picks up anchors on the next lookup."""
+        mock_cursor = self._mock_anchors(mock_get_cursor, [])
+        assert get_youtube_time(1, 20.0) is None
+        mock_cursor.fetchall.return_value = [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("15.0")},
+        ]
+        assert get_youtube_time(1, 20.0) == pytest.approx(25.0)
+        assert mock_cursor.execute.call_count == 2
+
+    @patch("app.youtube.alignment.get_cursor")
+    def test_expired_anchor_tables_are_reloaded(self, mock_get_cursor):
+        """Anchor tables older than the TTL are fetched again."""
+        mock_cursor = self._mock_anchors(mock_get_cursor, [
+            {"patreon_time": Decimal("10.0"), "youtube_time": Decimal("15.0")},
+        ])
+        with patch("app.youtube.alignment.time.monotonic", side_effect=[0.0, 10_000.0, 10_000.0]):
+            get_youtube_time(1, 1.0)
+            get_youtube_time(1, 1.0)
+        assert mock_cursor.execute.call_count == 2
@@ -648,7 +648,7 @@ def test_update_segment_speakers_success(client):
     with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
         mock_storage = MagicMock()
         mock_storage_class.return_value = mock_storage
-        mock_storage.update_speaker_labels.return_value = 2
+        mock_storage.update_speaker_labels_pairs.return_value = 2
 
         response = client.patch("/api/transcripts/segments/speaker", json={
             "updates": [
@@ -664,14 +664,68 @@ def test_update_segment_speakers_success(client):
         assert "requested" in data
         assert data["requested"] == 2
 
-        # Verify the storage method was called
-        assert mock_storage.update_speaker_labels.called
-        call_args = mock_storage.update_speaker_labels.call_args[0][0]
-        assert len(call_args) == 2
-        assert call_args[0].id == 123
-        assert call_args[0].speaker == "Matt"
-        assert call_args[1].id == 124
-        assert call_args[1].speaker == "Trey"
+        # Verify the storage method was called with (id, speaker) pairs
+        assert mock_storage.update_speaker_labels_pairs.called
+        call_args = mock_storage.update_speaker_labels_pairs.call_args[0][0]
+        assert call_args == [(123, "Matt"), (124, "Trey")]
+
+
+@pytest.mark.unit
+def test_bulk_insert_segments_requires_segments(client):
+    """Test bulk insert without a segments array returns 400."""
+    response = client.post("/api/transcripts/segments/bulk-insert", json={})
+    assert response.status_code == 400
+
+    response = client.post("/api/transcripts/segments/bulk-insert", json={"segments": []})
+    assert response.status_code == 400
+
+
+@pytest.mark.unit
+def test_bulk_insert_segments_validates_items(client):
+    """Test bulk insert rejects items without an integer after_id or a word."""
+    response = client.post("/api/transcripts/segments/bulk-insert", json={
+        "segments": [{"after_id": "1", "word": "hi"}]
+    })
+    assert response.status_code == 400
+    assert "after_id" in response.json["error"]
+
+    response = client.post("/api/transcripts/segments/bulk-insert", json={
+        "segments": [{"after_id": 1, "word": "  "}]
+    })
+    assert response.status_code == 400
+    assert "word" in response.json["error"]
+
+
+@pytest.mark.unit
+def test_bulk_insert_segments_success(client):
+    """Test bulk insert returns the new IDs in request order."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.insert_segments_after.return_value = [501, 502]
+
+        response = client.post("/api/transcripts/segments/bulk-insert", json={
+            "segments": [{"after_id": 10, "word": "hello"}, {"after_id": 10, "word": "there"}]
+        })
+
+        assert response.status_code == 201
+        assert response.json == {"ids": [501, 502], "created": 2}
+        mock_storage.insert_segments_after.assert_called_once_with([(10, "hello"), (10, "there")])
+
+
+@pytest.mark.unit
+def test_bulk_insert_segments_missing_reference(client):
+    """Test bulk insert returns 404 when a reference segment is missing."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.insert_segments_after.return_value = None
+
+        response = client.post("/api/transcripts/segments/bulk-insert", json={
+            "segments": [{"after_id": 999, "word": "hello"}]
+        })
+
+        assert response.status_code == 404
 
 
 @pytest.mark.unit
@@ -681,7 +735,7 @@ def test_update_segment_speakers_partial_success(client):
         mock_storage = MagicMock()
         mock_storage_class.return_value = mock_storage
         # Only 1 segment was actually updated (e.g., other didn't exist)
-        mock_storage.update_speaker_labels.return_value = 1
+        mock_storage.update_speaker_labels_pairs.return_value = 1
 
         response = client.patch("/api/transcripts/segments/speaker", json={
             "updates": [
@@ -848,13 +902,9 @@ def test_get_episode_speakers_success(client):
         mock_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
         # Mock fetchone for episode check returns the episode
-        mock_ctx.fetchone.return_value = {"id": 1}
-        # Mock fetchall for distinct speakers
-        mock_ctx.fetchall.return_value = [
-            {"speaker": "Matt"},
-            {"speaker": "Will"},
-            {"speaker": "Felix"}
-        ]
+        mock_ctx.fetchone.return_value = (1,)
+        # Mock fetchall for distinct speakers (tuple rows)
+        mock_ctx.fetchall.return_value = [("Matt",), ("Will",), ("Felix",)]
 
         response = client.get("/api/transcripts/episode/1/speakers")
         assert response.status_code == 200
@@ -881,3 +931,239 @@ def test_get_episode_speakers_not_found(client):
         assert response.status_code == 404
         assert "error" in response.json
         assert response.json["error"] == "Episode not found"
+
+
+# Tests for GET /api/transcripts/episode/<id>/segments endpoint
+def _segments_page(indices, total=20, has_more=True):
+    return {
+        "episode": {"id": 1, "title": "Episode"},
+        "speakers": ["Matt"],
+        "segments": [
+            {"id": 100 + i, "word": f"w{i}", "start_time": float(i),
+             "end_time": float(i + 1), "segment_index": i, "speaker": "Matt"}
+            for i in indices
+        ],
+        "has_more": has_more,
+        "total": total,
+        "total_is_approximate": False,
+    }
+
+
+@pytest.mark.unit
+def test_get_episode_segments_with_after_cursor(client):
+    """Test that the after cursor is passed through and next_cursor returned."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.get_episode_segments_page.return_value = _segments_page([11, 12])
+
+        response = client.get("/api/transcripts/episode/1/segments?limit=2&after=10")
+        assert response.status_code == 200
+        data = response.json
+        assert data["after"] == 10
+        assert data["has_more"] is True
+        assert data["next_cursor"] == 12
+        assert data["total"] == 20
+        assert data["total_is_approximate"] is False
+        assert data["episode_title"] == "Episode"
+        assert data["episode_speakers"] == ["Matt"]
+        assert [s["segment_index"] for s in data["segments"]] == [11, 12]
+        assert mock_storage.get_episode_segments_page.call_args.kwargs["after_index"] == 10
+
+
+@pytest.mark.unit
+def test_get_episode_segments_last_page_has_no_cursor(client):
+    """Test that a short page returns a null next_cursor."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.get_episode_segments_page.return_value = _segments_page([19], has_more=False)
+
+        response = client.get("/api/transcripts/episode/1/segments?limit=2&after=18")
+        assert response.status_code == 200
+        assert response.json["next_cursor"] is None
+
+
+@pytest.mark.unit
+def test_get_episode_segments_not_found(client):
+    """Test that a missing episode returns 404."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.get_episode_segments_page.return_value = None
+
+        response = client.get("/api/transcripts/episode/999/segments")
+        assert response.status_code == 404
+        assert response.json["error"] == "Episode not found"
+
+
+@pytest.mark.unit
+def test_get_episode_segments_invalid_after_returns_400(client):
+    """Test that a non-integer after cursor returns 400."""
+    response = client.get("/api/transcripts/episode/1/segments?after=abc")
+    assert response.status_code == 400
+    assert "error" in response.json
+
+
+@pytest.mark.unit
+def test_get_episode_segments_columnar_format(client):
+    """Test format=columns returns parallel arrays and a cursor from indices."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        page = _segments_page([])
+        del page["segments"]
+        page["columns"] = {
+            "ids": [101, 102], "words": ["a", "b"], "starts": [1.0, 2.0],
+            "ends": [2.0, 3.0], "indices": [1, 2], "speakers": ["Matt", None],
+        }
+        mock_storage.get_episode_segments_page.return_value = page
+
+        response = client.get("/api/transcripts/episode/1/segments?limit=2&format=columns")
+        assert response.status_code == 200
+        data = response.json
+        assert "segments" not in data
+        assert data["columns"]["words"] == ["a", "b"]
+        assert data["next_cursor"] == 2
+        assert mock_storage.get_episode_segments_page.call_args.kwargs["columnar"] is True
+
+
+# Tests for PATCH /api/transcripts/assign-speaker endpoint
+@pytest.mark.unit
+def test_assign_speaker_unknown_speaker_returns_404(client):
+    """Test that an unknown speaker_id returns 404 without a separate lookup."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.assign_speaker_to_range.return_value = None
+
+        response = client.patch("/api/transcripts/assign-speaker", json={
+            "episode_id": 1, "start_segment_id": 10, "end_segment_id": 12, "speaker_id": 99
+        })
+        assert response.status_code == 404
+        assert response.json["error"] == "Speaker not found"
+
+
+@pytest.mark.unit
+def test_assign_speaker_empty_range_returns_404(client):
+    """Test that a range with no segments returns 404."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.assign_speaker_to_range.return_value = 0
+
+        response = client.patch("/api/transcripts/assign-speaker", json={
+            "episode_id": 1, "start_segment_id": 10, "end_segment_id": 12, "speaker_id": 2
+        })
+        assert response.status_code == 404
+        assert response.json["error"] == "No segments found in range"
+
+
+@pytest.mark.unit
+def test_assign_speaker_success(client):
+    """Test a successful range assignment returns the updated count."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.assign_speaker_to_range.return_value = 3
+
+        response = client.patch("/api/transcripts/assign-speaker", json={
+            "episode_id": 1, "start_segment_id": 10, "end_segment_id": 12, "speaker_id": 2
+        })
+        assert response.status_code == 200
+        assert response.json == {"updated": 3, "episode_id": 1, "speaker_id": 2}
+
+
+@pytest.mark.unit
+def test_assign_speaker_rejects_boolean_ids(client):
+    """Test that JSON booleans are not accepted as integer ids."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        response = client.patch("/api/transcripts/assign-speaker", json={
+            "episode_id": 1, "start_segment_id": True, "end_segment_id": 12, "speaker_id": 2
+        })
+        assert response.status_code == 400
+        assert response.json["error"] == "start_segment_id must be an integer"
+        mock_storage_class.return_value.assign_speaker_to_range.assert_not_called()
+
+
+@pytest.mark.unit
+def test_assign_speaker_missing_field(client):
+    """Test that a missing field is reported by name."""
+    response = client.patch("/api/transcripts/assign-speaker", json={
+        "episode_id": 1, "start_segment_id": 10, "end_segment_id": 12
+    })
+    assert response.status_code == 400
+    assert response.json["error"] == "speaker_id field required"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("query,expected_mode", [
+    ("", "auto"),
+    ("?speaker=Matt", "none"),
+    ("?speaker=Matt&exact_total=1", "exact"),
+    ("?exact_total=1", "exact"),
+])
+def test_get_episode_segments_count_mode(client, query, expected_mode):
+    """Test filtered views skip the count unless exact_total=1 is requested."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.get_episode_segments_page.return_value = _segments_page([1], has_more=False)
+
+        response = client.get(f"/api/transcripts/episode/1/segments{query}")
+        assert response.status_code == 200
+        assert mock_storage.get_episode_segments_page.call_args.kwargs["count_mode"] == expected_mode
+
+
+# Tests for GET /api/transcripts/episode/<id>/paragraphs endpoint
+@pytest.mark.unit
+def test_get_episode_paragraphs_success(client):
+    """Test paragraphs endpoint streams episode header and paragraphs."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.iter_episode_paragraphs.return_value = iter([
+            {"episode_title": 'Episode "1"', "manually_reviewed": True,
+             "paragraph": {"speaker": "Matt", "text": "hi", "segment_ids": [1]}},
+            {"episode_title": 'Episode "1"', "manually_reviewed": True,
+             "paragraph": {"speaker": "Will", "text": "yo", "segment_ids": [2]}},
+        ])
+
+        response = client.get("/api/transcripts/episode/1/paragraphs")
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        data = response.json
+        assert data["episode_id"] == 1
+        assert data["episode_title"] == 'Episode "1"'
+        assert data["manually_reviewed"] is True
+        assert data["total"] == 2
+        assert [p["speaker"] for p in data["paragraphs"]] == ["Matt", "Will"]
+
+
+@pytest.mark.unit
+def test_get_episode_paragraphs_empty_episode(client):
+    """Test an episode without segments streams an empty paragraph list."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.iter_episode_paragraphs.return_value = iter([
+            {"episode_title": "Episode", "manually_reviewed": False, "paragraph": None},
+        ])
+
+        response = client.get("/api/transcripts/episode/1/paragraphs")
+        assert response.status_code == 200
+        assert response.json["paragraphs"] == []
+        assert response.json["total"] == 0
+
+
+@pytest.mark.unit
+def test_get_episode_paragraphs_not_found(client):
+    """Test paragraphs endpoint returns 404 for a missing episode."""
+    with patch("app.transcription.storage.TranscriptStorage") as mock_storage_class:
+        mock_storage = MagicMock()
+        mock_storage_class.return_value = mock_storage
+        mock_storage.iter_episode_paragraphs.return_value = iter([])
+
+        response = client.get("/api/transcripts/episode/999/paragraphs")
+        assert response.status_code == 404
+        assert response.json["error"] == "Episode not found"
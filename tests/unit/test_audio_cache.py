@@ -0,0 +1,59 @@
+"""Tests for the decoded audio cache."""
+import io
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.transcription.audio_cache import DecodedAudioCache, source_digest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DecodedAudioCache(str(tmp_path / "features"))
+
+
+@pytest.mark.unit
+def test_source_digest_matches_for_path_and_file_object(tmp_path):
+    """Paths and file objects with the same bytes share a digest; objects are rewound."""
+    path = tmp_path / "a.mp3"
+    path.write_bytes(b"audio bytes")
+    buffer = io.BytesIO(b"audio bytes")
+
+    assert source_digest(str(path)) == source_digest(buffer)
+    assert buffer.tell() == 0
+
+
+@pytest.mark.unit
+def test_store_and_load_round_trip_int16_samples(cache):
+    """Samples on the int16 grid survive the cache unchanged."""
+    audio = np.array([0, 1, -1, 16384, -32768], dtype=np.float32) / 32768.0
+    cache.store("ep1", "d1", audio)
+
+    loaded = cache.load("ep1", "d1")
+
+    assert loaded.dtype == np.float32
+    np.testing.assert_array_equal(loaded, audio)
+
+
+@pytest.mark.unit
+def test_load_ignores_stale_or_missing_entries(cache):
+    cache.store("ep1", "d1", np.zeros(4, dtype=np.float32))
+
+    assert cache.load("ep1", "other") is None
+    assert cache.load("missing", "d1") is None
+
+
+@pytest.mark.unit
+def test_decoded_decodes_once_per_source(cache):
+    """A second request for the same audio is served from the cache."""
+    samples = np.linspace(-0.5, 0.5, 8, dtype=np.float32)
+    samples = np.round(samples * 32768) / 32768
+
+    with patch("app.transcription.audio_cache.decode_audio", return_value=samples) as mock_decode:
+        first = cache.decoded("ep1", io.BytesIO(b"mp3"))
+        second = cache.decoded("ep1", io.BytesIO(b"mp3"))
+        cache.decoded("ep1", io.BytesIO(b"changed"))
+
+    assert mock_decode.call_count == 2
+    np.testing.assert_array_equal(first, second)
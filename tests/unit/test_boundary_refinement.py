@@ -140,6 +140,34 @@ def test_find_boundary_words_unassigned_speaker_ignored():
     assert 2 in result
 
 
+@pytest.mark.unit
+def test_find_boundary_words_matches_pairwise_scan():
+    """Nearest-transition search selects the same words as comparing every pair."""
+    rng = np.random.RandomState(7)
+    t = 0.0
+    speaker = "Alice"
+    words = []
+    for _ in range(500):
+        if rng.uniform() < 0.05:
+            speaker = rng.choice(["Alice", "Bob", None])
+        start = t + rng.uniform(0.0, 0.8)
+        end = start + rng.uniform(0.05, 0.6)
+        words.append(make_word(round(start, 3), round(end, 3), speaker))
+        t = end
+
+    transitions = [
+        (float(a.end_time) + float(b.start_time)) / 2.0
+        for a, b in zip(words, words[1:]) if a.speaker != b.speaker
+    ]
+    expected = [
+        i for i, w in enumerate(words)
+        if any(abs((float(w.start_time) + float(w.end_time)) / 2.0 - t) <= 2.0 for t in transitions)
+    ]
+
+    assert 0 < len(expected) < len(words)
+    assert find_boundary_words(words) == expected
+
+
 # ---------------------------------------------------------------------------
 # refine_speaker_boundaries
 # ---------------------------------------------------------------------------
@@ -373,3 +401,185 @@ def test_refine_speaker_boundaries_only_checks_adjacent_speakers():
     )
     # Carol is not adjacent → word should NOT be reassigned to Carol
     assert result[1].speaker in ("Alice", "Bob")
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_batches_waveform_embeddings():
+    """With an in-memory waveform, boundary words are embedded in one batch call."""
+    alice_emb = make_embedding(seed=1)
+    bob_emb = make_embedding(seed=2)
+    identifier = _make_identifier_with_references({"Alice": alice_emb, "Bob": bob_emb})
+    identifier.model = MagicMock()
+    identifier.embed_segments.return_value = [bob_emb.copy(), bob_emb.copy()]
+    audio = {"waveform": MagicMock(), "sample_rate": 16000}
+
+    words = [
+        make_word(0.0, 0.5, "Alice"),
+        make_word(0.5, 1.0, "Bob"),
+        make_word(1.0, 1.05, "Bob"),  # too short to embed
+    ]
+    result = refine_speaker_boundaries(
+        words, [], audio, identifier, {"Alice": "Alice", "Bob": "Bob"}, {}
+    )
+
+    identifier.embed_segments.assert_called_once_with(audio, [(0.0, 0.5), (0.5, 1.0)])
+    identifier.model.crop.assert_not_called()
+    assert [w.speaker for w in result] == ["Bob", "Bob", "Bob"]
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_batch_failure_falls_back_to_crop():
+    """If batched embedding fails, each word is embedded with model.crop."""
+    alice_emb = make_embedding(seed=1)
+    bob_emb = make_embedding(seed=2)
+    identifier = _make_identifier_with_references({"Alice": alice_emb, "Bob": bob_emb})
+    identifier.model = MagicMock()
+    identifier.model.crop.return_value = bob_emb.copy()
+    identifier.embed_segments.side_effect = RuntimeError("out of memory")
+    audio = {"waveform": MagicMock(), "sample_rate": 16000}
+
+    words = [
+        make_word(0.0, 0.5, "Alice"),
+        make_word(0.5, 1.0, "Bob"),
+    ]
+    result = refine_speaker_boundaries(
+        words, [], audio, identifier, {"Alice": "Alice", "Bob": "Bob"}, {}
+    )
+
+    # Once word 0 moves to Bob, word 1 has no rival speaker and is not embedded
+    assert identifier.model.crop.call_count == 1
+    assert result[0].speaker == "Bob"
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_matrix_scores_match_pairwise_cosine():
+    """Matrix-product scoring reassigns exactly as pairwise cosine similarity would."""
+    from app.transcription.speaker_identification import SpeakerIdentifier
+
+    rng = np.random.RandomState(3)
+    names = ["Alice", "Bob", "Carol"]
+    references = {name: make_embedding(seed=i) * (i + 1) for i, name in enumerate(names)}
+    words = [make_word(i * 0.5, i * 0.5 + 0.4, names[(i // 3) % 3]) for i in range(30)]
+    word_embs = {i: references[names[rng.randint(3)]] + rng.randn(192) * 0.5 for i in range(30)}
+
+    identifier = _make_identifier_with_references(references)
+    identifier.model = MagicMock()
+    identifier.model.crop.side_effect = lambda audio, seg: word_embs[int(round(seg.start / 0.5))]
+
+    # Expected result: the original per-pair loop
+    expected = [w.speaker for w in words]
+    for idx in find_boundary_words(words):
+        candidates = {expected[idx]} | {expected[j] for j in (idx - 1, idx + 1) if 0 <= j < len(words)}
+        scores = {spk: SpeakerIdentifier.cosine_similarity(word_embs[idx], references[spk]) for spk in candidates}
+        best = max(scores, key=lambda s: scores[s])
+        if best != expected[idx] and scores[best] >= scores[expected[idx]] + 0.05:
+            expected[idx] = best
+
+    refine_speaker_boundaries(words, [], "audio.wav", identifier, {n: n for n in names}, {})
+
+    assert [w.speaker for w in words] == expected
+    assert expected != [names[(i // 3) % 3] for i in range(30)]
+    identifier.cosine_similarity.assert_not_called()
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_converts_each_timestamp_once():
+    """Decimal timestamps are converted to float once per refinement pass."""
+    conversions = []
+
+    class CountingDecimal(Decimal):
+        def __float__(self):
+            conversions.append(self)
+            return super().__float__()
+
+    words = [make_word(i * 0.5, i * 0.5 + 0.4, "Alice" if i < 3 else "Bob") for i in range(6)]
+    for w in words:
+        w.start_time = CountingDecimal(w.start_time)
+        w.end_time = CountingDecimal(w.end_time)
+
+    identifier = _make_identifier_with_references({"Alice": make_embedding(seed=1), "Bob": make_embedding(seed=2)})
+    identifier.model = MagicMock()
+    identifier.model.crop.return_value = make_embedding(seed=1)
+
+    refine_speaker_boundaries(words, [], "audio.wav", identifier, {}, {})
+
+    # Words 0 and 5 only neighbour their own speaker, so they are not embedded
+    assert identifier.model.crop.call_count == 4
+    assert len(conversions) == 2 * len(words)
+
+
+@pytest.mark.unit
+def test_shared_word_times_convert_timestamps_once_across_assignment_and_refinement():
+    """Speaker assignment and refinement can share one word_times conversion."""
+    from app.transcription.diarization import SpeakerSegment, assign_speakers_to_words, word_times
+
+    conversions = []
+
+    class CountingDecimal(Decimal):
+        def __float__(self):
+            conversions.append(self)
+            return super().__float__()
+
+    words = [make_word(i * 0.5, i * 0.5 + 0.4, None) for i in range(6)]
+    for w in words:
+        w.start_time = CountingDecimal(w.start_time)
+        w.end_time = CountingDecimal(w.end_time)
+    turns = [
+        SpeakerSegment("Alice", Decimal("0"), Decimal("1.5")),
+        SpeakerSegment("Bob", Decimal("1.5"), Decimal("3")),
+    ]
+
+    identifier = _make_identifier_with_references({"Alice": make_embedding(seed=1), "Bob": make_embedding(seed=2)})
+    identifier.model = MagicMock()
+    identifier.model.crop.return_value = make_embedding(seed=1)
+
+    times = word_times(words)
+    assign_speakers_to_words(words, turns, times)
+    assert [w.speaker for w in words] == ["Alice"] * 3 + ["Bob"] * 3
+    refine_speaker_boundaries(words, turns, "audio.wav", identifier, {}, {}, times)
+
+    assert identifier.model.crop.called
+    assert len(conversions) == 2 * len(words)
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_skips_words_without_rival_speaker():
+    """Words whose only referenced candidate is their own speaker are not embedded."""
+    alice_emb = make_embedding(seed=1)
+    identifier = _make_identifier_with_references({"Alice": alice_emb})
+    identifier.model = MagicMock()
+    identifier.model.crop.return_value = alice_emb
+
+    words = [
+        make_word(0.0, 0.5, "Alice"),
+        make_word(0.5, 1.0, "Unknown_1"),  # no reference embedding
+    ]
+    refine_speaker_boundaries(words, [], "audio.wav", identifier, {}, {})
+
+    # Only word 1 can move (to Alice); word 0 has no referenced rival
+    assert identifier.model.crop.call_count == 1
+    assert words[1].speaker == "Alice"
+
+
+@pytest.mark.unit
+def test_refine_speaker_boundaries_embeds_late_rival_singly():
+    """A word that gains a rival after a neighbour moves is embedded on its own."""
+    alice_emb = make_embedding(seed=1)
+    bob_emb = make_embedding(seed=2)
+    identifier = _make_identifier_with_references({"Alice": alice_emb, "Bob": bob_emb})
+    identifier.model = MagicMock()
+    identifier.model.crop.return_value = alice_emb.copy()
+    identifier.embed_segments.return_value = [bob_emb.copy(), bob_emb.copy()]
+    audio = {"waveform": MagicMock(), "sample_rate": 16000}
+
+    words = [
+        make_word(0.0, 0.5, "Bob"),
+        make_word(0.5, 1.0, "Alice"),
+        make_word(1.0, 1.5, "Alice"),
+    ]
+    refine_speaker_boundaries(words, [], audio, identifier, {}, {})
+
+    # Words 0 and 1 were batched; word 1 moving to Bob gives word 2 a rival
+    identifier.embed_segments.assert_called_once_with(audio, [(0.0, 0.5), (0.5, 1.0)])
+    assert identifier.model.crop.call_count == 1
+    assert [w.speaker for w in words] == ["Bob", "Bob", "Alice"]
@@ -1,11 +1,14 @@
+import numpy as np
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from decimal import Decimal
 
 from app.transcription.clip_extractor import (
+    WORD_STREAM_BATCH_SIZE,
     ClipExtractor,
     SpeechSegment,
+    _sanitize_speaker_name,
 )
 
 
@@ -58,6 +61,17 @@ def test_sanitize_speaker_name():
     assert ClipExtractor._sanitize_speaker_name("") == "unknown_speaker"
 
 
+@pytest.mark.unit
+def test_sanitize_speaker_name_is_cached():
+    """Repeated speaker names reuse the sanitized value."""
+    _sanitize_speaker_name.cache_clear()
+    assert ClipExtractor._sanitize_speaker_name("Matt/Chris") == "Matt_Chris"
+    assert ClipExtractor._sanitize_speaker_name("Matt/Chris") == "Matt_Chris"
+    info = _sanitize_speaker_name.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
 @pytest.mark.unit
 def test_group_into_segments():
     """Word data is grouped into continuous speech segments."""
@@ -122,6 +136,73 @@ def test_group_into_segments_filters_by_duration():
     assert segments[0].duration == 4.0
 
 
+@pytest.mark.unit
+def test_group_into_segments_matches_word_by_word_scan():
+    """Vectorized grouping finds the same segments as walking the words in order."""
+    import random
+
+    rng = random.Random(3)
+    word_data = []
+    t = Decimal("0")
+    for _ in range(2000):
+        t += Decimal(rng.choice([0, 0, 0, 1, 2, 5, 8])) / 10
+        end = t + Decimal(rng.randint(1, 9)) / 10
+        word_data.append((rng.choice(["Matt", "Matt", "Will", "Felix"]), t, end))
+        t = end
+
+    def scan(max_gap):
+        segments, run = [], [word_data[0]]
+        for word in word_data[1:]:
+            if word[0] == run[-1][0] and float(word[1]) - float(run[-1][2]) <= max_gap:
+                run.append(word)
+                continue
+            segments.append(run)
+            run = [word]
+        segments.append(run)
+        return [
+            (r[0][0], float(r[0][1]), float(r[-1][2]), len(r)) for r in segments
+            if 1.0 <= float(r[-1][2]) - float(r[0][1]) <= 4.0
+        ]
+
+    extractor = ClipExtractor(min_duration=1.0, max_duration=4.0)
+    segments = extractor._group_into_segments(word_data, max_gap=0.5)
+
+    assert len(segments) > 10
+    assert [(s.speaker, s.start_time, s.end_time, s.word_count) for s in segments] == scan(0.5)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("speaker_name", [None, "Matt"])
+def test_speaker_segments_query_streams_float_times(speaker_name):
+    """Words stream from a server-side cursor with times cast to float8 in SQL."""
+    extractor = ClipExtractor()
+
+    with patch("app.db.connection.get_cursor") as mock_cursor:
+        cursor = mock_cursor.return_value.__enter__.return_value
+        cursor.__iter__.return_value = iter([("Matt", 1.5, 2.25)])
+        rows = list(extractor._get_speaker_segments_from_db(5, speaker_name))
+
+    assert mock_cursor.call_args[1]["name"] == "clip_extractor_words"
+    assert mock_cursor.call_args[1]["cursor_factory"] is None
+    assert cursor.itersize == WORD_STREAM_BATCH_SIZE
+    sql = cursor.execute.call_args[0][0]
+    assert "start_time::float8 AS start_time" in sql
+    assert "end_time::float8 AS end_time" in sql
+    assert rows == [("Matt", 1.5, 2.25)]
+
+
+@pytest.mark.unit
+def test_group_into_segments_reads_a_stream_once():
+    """Grouping consumes a one-shot iterator of rows, as streamed from the cursor."""
+    extractor = ClipExtractor(min_duration=1.0, max_duration=5.0)
+    rows = iter([("Matt", 0.0, 0.8), ("Matt", 1.0, 2.5), ("Will", 3.0, 3.2)])
+
+    segments = extractor._group_into_segments(rows)
+
+    assert segments == [SpeechSegment("Matt", 0.0, 2.5, 2)]
+    assert extractor._group_into_segments(iter([])) == []
+
+
 @pytest.mark.unit
 def test_extract_clips_no_segments(tmp_path):
     """extract_clips handles episodes with no speaker-labeled segments."""
@@ -140,6 +221,241 @@ def test_extract_clips_no_segments(tmp_path):
         assert result == {}
 
 
+def _word_rows(*spans):
+    """Transcript rows (tuples of float8 times, as the query returns) for one word per span."""
+    return [(speaker, float(start), float(end)) for speaker, start, end in spans]
+
+
+def _write_outputs(cmd, **kwargs):
+    """subprocess.run stand-in for ffmpeg that writes every .wav output."""
+    for arg in cmd:
+        if arg.endswith(".wav"):
+            Path(arg).write_bytes(b"RIFF")
+    return MagicMock(returncode=0)
+
+
+def _extract_with_fake_ffmpeg(extractor, rows, run=_write_outputs):
+    """Run extract_clips through the ffmpeg fallback, as when PyAV cannot decode the source."""
+    with patch("app.db.connection.get_cursor") as mock_cursor, \
+         patch("faster_whisper.decode_audio", side_effect=ValueError("unsupported")), \
+         patch("subprocess.run", side_effect=run) as mock_run:
+        mock_cursor.return_value.__enter__.return_value.__iter__.return_value = iter(rows)
+        clips = extractor.extract_clips(episode_id=7, audio_path="/fake/ep.mp3")
+    return clips, [c[0][0] for c in mock_run.call_args_list]
+
+
+ROWS = _word_rows(
+    ("Matt", 0.0, 2.0), ("Matt", 10.0, 13.0),
+    ("Will", 20.0, 22.0), ("Matt", 30.0, 34.0),
+)
+
+
+@pytest.mark.unit
+def test_plan_clips_keeps_longest_segments_per_speaker(tmp_path):
+    """Only the longest max_clips_per_speaker segments are planned, longest first."""
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=10.0)
+
+    with patch("app.db.connection.get_cursor") as mock_cursor:
+        mock_cursor.return_value.__enter__.return_value.__iter__.return_value = iter(ROWS)
+        plan = extractor._plan_clips(7, None, max_clips_per_speaker=2)
+
+    assert [seg.duration for seg, _ in plan["Matt"]] == [4.0, 3.0]
+    assert [seg.duration for seg, _ in plan["Will"]] == [2.0]
+
+
+@pytest.mark.unit
+def test_extract_clips_single_worker_runs_ffmpeg_once(tmp_path):
+    """With one worker, every clip is copied out of the normalized episode in one ffmpeg run."""
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=5.0, max_workers=1)
+
+    clips, commands = _extract_with_fake_ffmpeg(extractor, ROWS)
+
+    assert len(commands) == 2
+    normalize, cmd = commands
+    assert normalize[normalize.index("-i") + 1] == "/fake/ep.mp3"
+    assert normalize[-3:-1] == ["-c:a", "pcm_s16le"]
+    assert cmd.count("-i") == 1
+    assert cmd[cmd.index("-i") + 1] == normalize[-1]
+    # Input seeks to the first clip and reads through the last one
+    assert cmd[cmd.index("-i") - 4:cmd.index("-i")] == ["-ss", "0.0", "-t", "34.0"]
+    assert len([a for a in cmd if "episode_7_clip" in a]) == 4
+    assert cmd.count("copy") == 4 and "-ar" not in cmd
+    # Longest Matt clip first
+    assert clips["Matt"] == [
+        str(tmp_path / "Matt" / f"episode_7_clip_{i:02d}.wav") for i in range(3)
+    ]
+    assert clips["Will"] == [str(tmp_path / "Will" / "episode_7_clip_00.wav")]
+    # The normalized episode is temporary
+    assert not Path(normalize[-1]).exists()
+
+
+@pytest.mark.unit
+def test_extract_clips_reencodes_from_source_when_normalizing_fails(tmp_path):
+    """If the episode cannot be normalized, clips are decoded from the source."""
+    import subprocess
+
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=5.0, max_workers=1)
+
+    def run(cmd, **kwargs):
+        if "pcm_s16le" in cmd:
+            raise subprocess.CalledProcessError(1, "ffmpeg", stderr=b"no space")
+        return _write_outputs(cmd)
+
+    clips, commands = _extract_with_fake_ffmpeg(extractor, ROWS, run)
+
+    cmd = commands[-1]
+    assert cmd[cmd.index("-i") + 1] == "/fake/ep.mp3"
+    assert "copy" not in cmd and cmd.count("-ar") == 4
+    assert sum(len(paths) for paths in clips.values()) == 4
+
+
+@pytest.mark.unit
+def test_extract_clips_splits_time_ranges_across_workers(tmp_path):
+    """Clips are split into contiguous time ranges, one ffmpeg run per worker."""
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=5.0, max_workers=2)
+
+    clips, commands = _extract_with_fake_ffmpeg(extractor, ROWS)
+
+    clip_commands = commands[1:]
+    assert len(clip_commands) == 2
+    spans = sorted(
+        (float(cmd[cmd.index("-i") - 3]), float(cmd[cmd.index("-i") - 1])) for cmd in clip_commands
+    )
+    assert spans == [(0.0, 13.0), (20.0, 14.0)]
+    late = next(cmd for cmd in clip_commands if cmd[cmd.index("-i") - 3] == "20.0")
+    # Output seeks are relative to the input seek
+    assert late[late.index("-i") + 2:late.index("-i") + 4] == ["-ss", "0.0"]
+    assert sorted(len(paths) for paths in clips.values()) == [1, 3]
+
+
+@pytest.mark.unit
+def test_extract_clips_keeps_results_of_successful_workers(tmp_path):
+    """A failed ffmpeg run only loses the clips in its own time range."""
+    import subprocess
+
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=5.0, max_workers=2)
+
+    def run(cmd, **kwargs):
+        if "pcm_s16le" not in cmd and cmd[cmd.index("-i") - 3] == "20.0":
+            raise subprocess.CalledProcessError(1, "ffmpeg", stderr=b"bad input")
+        return _write_outputs(cmd)
+
+    clips, _ = _extract_with_fake_ffmpeg(extractor, ROWS, run)
+
+    assert clips["Will"] == []
+    assert clips["Matt"] == [
+        str(tmp_path / "Matt" / "episode_7_clip_01.wav"),
+        str(tmp_path / "Matt" / "episode_7_clip_02.wav"),
+    ]
+
+
+@pytest.mark.unit
+def test_extract_clips_many_plans_next_episode_during_extraction(tmp_path):
+    """The next episode's clips are chosen while the current one is extracted."""
+    import threading
+
+    extractor = ClipExtractor(output_dir=str(tmp_path), min_duration=1.0, max_duration=5.0, max_workers=1)
+    planned_second = threading.Event()
+
+    def rows_for(episode_id, speaker_name=None):
+        if episode_id == 2:
+            planned_second.set()
+        return [("Matt", Decimal(str(episode_id)), Decimal(str(episode_id + 2)))]
+
+    def decode(audio_path, sampling_rate):
+        if audio_path == "/fake/1.mp3":
+            assert planned_second.wait(timeout=5)
+        return np.zeros(10 * sampling_rate, dtype=np.float32)
+
+    with patch.object(extractor, "_get_speaker_segments_from_db", side_effect=rows_for), \
+         patch("faster_whisper.decode_audio", side_effect=decode):
+        results = list(extractor.extract_clips_many([(1, "/fake/1.mp3"), (2, "/fake/2.mp3")]))
+
+    assert [episode_id for episode_id, _ in results] == [1, 2]
+    assert results[0][1] == {"Matt": [str(tmp_path / "Matt" / "episode_1_clip_00.wav")]}
+    assert results[1][1] == {"Matt": [str(tmp_path / "Matt" / "episode_2_clip_00.wav")]}
+    assert list(extractor.extract_clips_many([])) == []
+
+
+@pytest.mark.unit
+def test_extract_clips_in_process_writes_pcm_wav(tmp_path):
+    """Clips are cut from one in-process decode as 16 kHz mono 16-bit WAV, without ffmpeg."""
+    import wave
+
+    source = tmp_path / "episode.wav"
+    rate = 8000
+    t = np.arange(40 * rate) / rate
+    with wave.open(str(source), "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        tone = (0.3 * np.sin(2 * np.pi * 440 * t) * 32767).astype("<i2")
+        f.writeframes(np.repeat(tone, 2).tobytes())
+
+    extractor = ClipExtractor(output_dir=str(tmp_path / "clips"), min_duration=1.0, max_duration=5.0)
+    with patch("app.db.connection.get_cursor") as mock_cursor, \
+         patch("subprocess.run") as mock_run:
+        mock_cursor.return_value.__enter__.return_value.__iter__.return_value = iter(ROWS)
+        clips = extractor.extract_clips(episode_id=7, audio_path=str(source))
+
+    mock_run.assert_not_called()
+    longest = tmp_path / "clips" / "Matt" / "episode_7_clip_00.wav"
+    assert clips["Matt"][0] == str(longest)
+    assert sum(len(paths) for paths in clips.values()) == 4
+    with wave.open(str(longest), "rb") as clip:
+        assert (clip.getnchannels(), clip.getsampwidth(), clip.getframerate()) == (1, 2, 16000)
+        # Matt's 30.0-34.0s segment
+        assert clip.getnframes() == 4 * 16000
+        samples = np.frombuffer(clip.readframes(clip.getnframes()), dtype="<i2")
+    assert np.abs(samples).max() > 0.2 * 32767
+
+
+@pytest.mark.unit
+def test_extract_in_process_reports_clips_past_the_end(tmp_path):
+    """A segment beyond the decoded audio is reported as not written, and no stale clip is left."""
+    extractor = ClipExtractor(output_dir=str(tmp_path))
+    segments = [SpeechSegment("Matt", 0.0, 1.0, 3), SpeechSegment("Matt", 20.0, 21.0, 3)]
+    outputs = [tmp_path / "a.wav", tmp_path / "b.wav"]
+    outputs[1].write_bytes(b"RIFF stale clip from an earlier run")
+
+    with patch("faster_whisper.decode_audio", return_value=np.zeros(16000 * 5, dtype=np.float32)):
+        assert extractor._extract_in_process("/fake/ep.mp3", segments, outputs) == [True, False]
+    assert not outputs[1].exists()
+
+
+@pytest.mark.unit
+def test_extract_audio_segments_reports_missing_outputs(tmp_path):
+    """Clips ffmpeg did not write are reported as failed, even if a stale file existed."""
+    extractor = ClipExtractor(output_dir=str(tmp_path))
+    segments = [SpeechSegment("Matt", 0.0, 12.0, 30), SpeechSegment("Matt", 20.0, 31.0, 28)]
+    outputs = [tmp_path / "a.wav", tmp_path / "b.wav"]
+    outputs[1].write_bytes(b"stale")
+
+    def run_ffmpeg(cmd, **kwargs):
+        outputs[0].write_bytes(b"RIFF")
+        return MagicMock(returncode=0)
+
+    with patch("subprocess.run", side_effect=run_ffmpeg):
+        assert extractor._extract_audio_segments("/fake/ep.mp3", segments, outputs) == [True, False]
+
+
+@pytest.mark.unit
+def test_extract_audio_segments_ffmpeg_failure(tmp_path):
+    """An ffmpeg error fails every clip of the run."""
+    import subprocess
+
+    extractor = ClipExtractor(output_dir=str(tmp_path))
+    segments = [SpeechSegment("Matt", 0.0, 12.0, 30), SpeechSegment("Matt", 20.0, 31.0, 28)]
+    error = subprocess.CalledProcessError(1, "ffmpeg", stderr=b"bad input")
+
+    with patch("subprocess.run", side_effect=error):
+        result = extractor._extract_audio_segments(
+            "/fake/ep.mp3", segments, [tmp_path / "a.wav", tmp_path / "b.wav"]
+        )
+
+    assert result == [False, False]
+
+
 @pytest.mark.unit
 def test_speech_segment_duration_property():
     """SpeechSegment calculates duration correctly."""
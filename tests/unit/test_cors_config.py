@@ -59,3 +59,26 @@ def test_get_cors_origins_empty_entries_filtered():
         from app.config import Config
         result = Config.get_cors_origins()
         assert result == ["https://myapp.railway.app", "https://custom-domain.com"]
+
+
+@pytest.mark.unit
+def test_get_cors_origins_parses_each_value_once():
+    """Test repeated calls with the same CORS_ORIGINS reuse the parsed value."""
+    from app.config import Config, _parse_cors_origins
+    _parse_cors_origins.cache_clear()
+    with patch.dict("os.environ", {"CORS_ORIGINS": "https://a.example,https://b.example"}):
+        first = Config.get_cors_origins()
+        second = Config.get_cors_origins()
+    assert first == second == ["https://a.example", "https://b.example"]
+    info = _parse_cors_origins.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+@pytest.mark.unit
+def test_get_cors_origins_returns_independent_lists():
+    """Test callers cannot mutate the cached origins."""
+    from app.config import Config
+    with patch.dict("os.environ", {"CORS_ORIGINS": "https://a.example"}):
+        Config.get_cors_origins().append("https://evil.example")
+        assert Config.get_cors_origins() == ["https://a.example"]
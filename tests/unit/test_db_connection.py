@@ -118,6 +118,27 @@ def test_get_cursor_rollback_on_exception():
         mock_cursor.close.assert_called_once()
 
 
+@pytest.mark.unit
+def test_get_cursor_defaults_to_dict_rows():
+    """Test get_cursor uses RealDictCursor unless told otherwise."""
+    from psycopg2.extras import RealDictCursor
+
+    mock_conn = MagicMock()
+    with patch("app.db.connection.get_connection") as mock_get_conn:
+        mock_get_conn.return_value.__enter__ = MagicMock(return_value=mock_conn)
+        mock_get_conn.return_value.__exit__ = MagicMock(return_value=False)
+
+        from app.db.connection import get_cursor
+
+        with get_cursor():
+            pass
+        mock_conn.cursor.assert_called_with(name=None, cursor_factory=RealDictCursor)
+
+        with get_cursor(cursor_factory=None):
+            pass
+        mock_conn.cursor.assert_called_with(name=None, cursor_factory=None)
+
+
 @pytest.mark.unit
 def test_all_api_endpoints_return_200():
     """Regression test: all basic API endpoints should return 200, not 500."""
@@ -160,3 +181,160 @@ def test_transcript_endpoints_return_200_not_500():
             # Speaker search without speaker param should return 400, not 500
             response = client.get("/api/transcripts/search/speaker?q=test")
             assert response.status_code == 400, f"speaker search returned {response.status_code}"
+
+
+@pytest.mark.unit
+def test_get_connection_reuses_pooled_connection():
+    """Test get_connection borrows from and returns to the pool."""
+    import app.db.connection as conn_module
+
+    mock_pool = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.closed = 0
+    mock_pool.getconn.return_value = mock_conn
+
+    with patch.object(conn_module, "_get_pool", return_value=mock_pool):
+        with conn_module.get_connection() as conn:
+            assert conn is mock_conn
+
+    mock_pool.getconn.assert_called_once()
+    mock_pool.putconn.assert_called_once_with(mock_conn, close=False)
+
+
+@pytest.mark.unit
+def test_get_connection_discards_broken_connection():
+    """Test connections that hit an OperationalError are closed, not reused."""
+    import psycopg2
+    import app.db.connection as conn_module
+
+    mock_pool = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.closed = 0
+    mock_pool.getconn.return_value = mock_conn
+
+    with patch.object(conn_module, "_get_pool", return_value=mock_pool):
+        with pytest.raises(psycopg2.OperationalError):
+            with conn_module.get_connection():
+                raise psycopg2.OperationalError("server closed the connection")
+
+    mock_pool.putconn.assert_called_once_with(mock_conn, close=True)
+
+
+@pytest.mark.unit
+def test_pool_created_lazily_once():
+    """Test the pool is built on first use and shared afterwards."""
+    import app.db.connection as conn_module
+
+    conn_module.close_all_connections()
+    with patch.object(conn_module, "ThreadedConnectionPool") as mock_pool_class:
+        first = conn_module._get_pool()
+        second = conn_module._get_pool()
+        assert first is second
+        mock_pool_class.assert_called_once()
+
+        conn_module.close_all_connections()
+        first.closeall.assert_called_once()
+        assert conn_module._pool is None
+
+
+@pytest.mark.unit
+def test_pool_size_defaults_and_env_override():
+    """Test pool bounds come from DB_POOL_MIN / DB_POOL_MAX with sane clamping."""
+    import app.db.connection as conn_module
+
+    with patch.dict(os.environ, {}, clear=True):
+        assert conn_module.get_pool_size() == (
+            conn_module.POOL_MIN_CONNECTIONS, conn_module.POOL_MAX_CONNECTIONS
+        )
+    with patch.dict(os.environ, {"DB_POOL_MIN": "1", "DB_POOL_MAX": "8"}):
+        assert conn_module.get_pool_size() == (1, 8)
+    with patch.dict(os.environ, {"DB_POOL_MIN": "10", "DB_POOL_MAX": "5"}):
+        assert conn_module.get_pool_size() == (5, 5)
+
+
+@pytest.mark.unit
+def test_execute_prepared_prepares_once_per_connection():
+    """Test execute_prepared issues PREPARE only on first use per connection."""
+    from app.db.connection import execute_prepared
+
+    cursor = MagicMock()
+    execute_prepared(cursor, "ep_lookup", "SELECT id FROM episodes WHERE id = $1", (1,))
+    execute_prepared(cursor, "ep_lookup", "SELECT id FROM episodes WHERE id = $1", (2,))
+
+    calls = [c[0] for c in cursor.execute.call_args_list]
+    assert calls == [
+        ("PREPARE ep_lookup AS SELECT id FROM episodes WHERE id = $1",),
+        ("EXECUTE ep_lookup(%s)", (1,)),
+        ("EXECUTE ep_lookup(%s)", (2,)),
+    ]
+
+
+@pytest.mark.unit
+def test_execute_prepared_tracks_connections_separately():
+    """Test a new connection prepares the statement again."""
+    from app.db.connection import execute_prepared
+
+    first, second = MagicMock(), MagicMock()
+    execute_prepared(first, "ep_lookup2", "SELECT 1 WHERE $1 > 0", (1,))
+    execute_prepared(second, "ep_lookup2", "SELECT 1 WHERE $1 > 0", (1,))
+
+    assert first.execute.call_args_list[0][0][0].startswith("PREPARE")
+    assert second.execute.call_args_list[0][0][0].startswith("PREPARE")
+
+
+@pytest.mark.unit
+def test_run_migrations_batches_files(tmp_path):
+    """Test migrations are sent as one batch in file order."""
+    from app.db.connection import run_migrations
+
+    (tmp_path / "002_b.sql").write_text("CREATE TABLE b (id int);")
+    (tmp_path / "001_a.sql").write_text("CREATE TABLE a (id int)\n-- trailing comment")
+
+    mock_cursor = MagicMock()
+    with patch("app.db.connection.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        run_migrations(str(tmp_path))
+
+    mock_cursor.execute.assert_called_once_with(
+        b"CREATE TABLE a (id int)\n-- trailing comment\n;\nCREATE TABLE b (id int);"
+    )
+
+
+@pytest.mark.unit
+def test_run_migrations_runs_copy_files_alone(tmp_path):
+    """Test a migration containing COPY is executed as its own batch."""
+    from app.db.connection import run_migrations
+
+    (tmp_path / "001_a.sql").write_text("SELECT 1;")
+    (tmp_path / "002_copy.sql").write_text("copy t FROM STDIN;")
+    (tmp_path / "003_b.sql").write_text("SELECT 3;")
+    (tmp_path / "004_c.sql").write_text("SELECT 4;")
+
+    mock_cursor = MagicMock()
+    with patch("app.db.connection.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        run_migrations(str(tmp_path))
+
+    batches = [c[0][0] for c in mock_cursor.execute.call_args_list]
+    assert batches == [b"SELECT 1;", b"copy t FROM STDIN;", b"SELECT 3;\n;\nSELECT 4;"]
+
+
+@pytest.mark.unit
+def test_run_migrations_only_picks_up_sql_files(tmp_path):
+    """Test non-.sql files, hidden files and directories are ignored."""
+    from app.db.connection import run_migrations
+
+    (tmp_path / "001_a.sql").write_text("SELECT 1;")
+    (tmp_path / "README.md").write_text("not a migration")
+    (tmp_path / ".002_hidden.sql").write_text("SELECT 2;")
+    (tmp_path / "003_dir.sql").mkdir()
+
+    mock_cursor = MagicMock()
+    with patch("app.db.connection.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        run_migrations(str(tmp_path))
+
+    mock_cursor.execute.assert_called_once_with(b"SELECT 1;")
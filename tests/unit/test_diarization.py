@@ -1,8 +1,16 @@
+import logging
+
+import numpy as np
 import pytest
 from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
+from app.db.models import TranscriptSegment
 from app.transcription.diarization import (
+    CachedDiarizer,
+    DEFAULT_EMBEDDING_BATCH_SIZE,
+    DEFAULT_SEGMENTATION_BATCH_SIZE,
+    FAST_SEGMENTATION_STEP,
     SpeakerSegment,
     SpeakerDiarizer,
     assign_speakers_to_words,
@@ -130,6 +138,25 @@ def test_assign_speakers_to_words_overlap_at_transition():
     assert result_b[0].speaker == "SPEAKER_02"  # 1.0s overlap wins
 
 
+@pytest.mark.unit
+def test_assign_speakers_to_words_float_stored_words():
+    """Test stored words (float times) are assigned against Decimal diarization turns."""
+    speaker_segments = [
+        SpeakerSegment(speaker="SPEAKER_01", start_time=Decimal("0.0"), end_time=Decimal("2.0")),
+        SpeakerSegment(speaker="SPEAKER_02", start_time=Decimal("1.8"), end_time=Decimal("4.0")),
+    ]
+    words = [
+        TranscriptSegment(id=1, episode_id=1, word="hello", start_time=0.5, end_time=1.0, segment_index=0),
+        TranscriptSegment(id=2, episode_id=1, word="there", start_time=1.7, end_time=2.2, segment_index=1),
+        TranscriptSegment(id=3, episode_id=1, word="friend", start_time=4.5, end_time=5.0, segment_index=2),
+    ]
+
+    result = assign_speakers_to_words(words, speaker_segments)
+
+    assert [w.speaker for w in result] == ["SPEAKER_01", "SPEAKER_02", "SPEAKER_02"]
+    assert [w.is_overlap for w in result] == [False, True, False]
+
+
 @pytest.mark.unit
 def test_assign_speakers_to_words_bidirectional_gap_fill():
     """Test bidirectional gap-filling picks the temporally closer assigned word."""
@@ -170,6 +197,48 @@ def test_assign_speakers_to_words_bidirectional_gap_fill():
     assert result[3].speaker == "SPEAKER_02"
 
 
+@pytest.mark.unit
+def test_assign_speakers_to_words_matches_full_scan():
+    """Test windowed lookup picks the same speakers as scanning every turn."""
+    import random
+
+    rng = random.Random(7)
+    speaker_segments = []
+    t = Decimal("0")
+    for i in range(200):
+        duration = Decimal(rng.randint(1, 3000)) / 100
+        # Occasional crosstalk: next turn starts before this one ends
+        start = t - Decimal(rng.randint(0, 50)) / 100 if i and rng.random() < 0.2 else t
+        speaker_segments.append(
+            SpeakerSegment(speaker=f"SPEAKER_{i % 3:02d}", start_time=max(start, Decimal("0")), end_time=start + duration)
+        )
+        t = start + duration + Decimal(rng.randint(0, 100)) / 100
+
+    words = []
+    for _ in range(500):
+        start = Decimal(rng.randint(0, int(t * 100))) / 100
+        word = MagicMock(spec=["start_time", "end_time", "speaker", "is_overlap"])
+        word.start_time = start
+        word.end_time = start + Decimal(rng.randint(1, 80)) / 100
+        word.speaker = None
+        words.append(word)
+
+    def best_by_full_scan(word):
+        best, best_overlap = None, Decimal(0)
+        for seg in sorted(speaker_segments, key=lambda s: s.start_time):
+            overlap = min(word.end_time, seg.end_time) - max(word.start_time, seg.start_time)
+            if overlap > best_overlap:
+                best, best_overlap = seg.speaker, overlap
+        return best
+
+    expected = [best_by_full_scan(w) for w in words]
+    assign_speakers_to_words(words, speaker_segments)
+
+    for word, speaker in zip(words, expected):
+        if speaker is not None:
+            assert word.speaker == speaker
+
+
 @pytest.mark.unit
 def test_get_diarizer_factory():
     """Test diarizer factory function."""
@@ -196,6 +265,85 @@ def test_diarizer_init_with_env_token():
         assert diarizer.hf_token == "env_token"
 
 
+@pytest.mark.unit
+def test_diarizer_batch_sizes_default_and_env():
+    """Batch sizes default low and can be overridden from the environment."""
+    with patch.dict("os.environ", {}, clear=True):
+        diarizer = SpeakerDiarizer(hf_token="test")
+    assert diarizer.embedding_batch_size == DEFAULT_EMBEDDING_BATCH_SIZE
+    assert diarizer.segmentation_batch_size == DEFAULT_SEGMENTATION_BATCH_SIZE
+
+    with patch.dict("os.environ", {"PYANNOTE_EMB_BATCH": "4", "PYANNOTE_SEG_BATCH": "16"}):
+        diarizer = SpeakerDiarizer(hf_token="test")
+        explicit = SpeakerDiarizer(hf_token="test", embedding_batch_size=2, segmentation_batch_size=3)
+    assert (diarizer.embedding_batch_size, diarizer.segmentation_batch_size) == (4, 16)
+    assert (explicit.embedding_batch_size, explicit.segmentation_batch_size) == (2, 3)
+
+
+@pytest.mark.unit
+def test_diarizer_applies_batch_sizes_on_load():
+    """The loaded pyannote pipeline gets the configured batch sizes."""
+    pytest.importorskip("pyannote.audio")
+    loaded = MagicMock()
+    diarizer = SpeakerDiarizer(hf_token="test", embedding_batch_size=4, segmentation_batch_size=6)
+    with patch("pyannote.audio.Pipeline.from_pretrained", return_value=loaded), \
+         patch("torch.cuda.is_available", return_value=False), \
+         patch("app.transcription.diarization._install_fast_embeddings", return_value=False):
+        pipeline = diarizer.pipeline
+
+    assert pipeline is loaded
+    assert loaded.embedding_batch_size == 4
+    assert loaded.segmentation_batch_size == 6
+
+
+def _load_on_cpu(diarizer, loaded):
+    with patch("pyannote.audio.Pipeline.from_pretrained", return_value=loaded), \
+         patch("torch.cuda.is_available", return_value=False), \
+         patch("app.transcription.diarization._install_fast_embeddings", return_value=False):
+        return diarizer.pipeline
+
+
+@pytest.mark.unit
+def test_diarizer_fast_cpu_mode_coarsens_window(caplog):
+    """Without a GPU the fast mode widens the segmentation step, skips overlap and warns."""
+    pytest.importorskip("pyannote.audio")
+    loaded = MagicMock(segmentation_step=0.1, embedding_exclude_overlap=False)
+    loaded._segmentation.duration = 10.0
+    loaded._segmentation.step = 1.0
+
+    with caplog.at_level(logging.WARNING, logger="app.transcription.diarization"):
+        _load_on_cpu(SpeakerDiarizer(hf_token="test"), loaded)
+
+    assert any("fast CPU mode" in r.getMessage() for r in caplog.records if r.levelno == logging.WARNING)
+
+    assert loaded.segmentation_step == FAST_SEGMENTATION_STEP
+    assert loaded._segmentation.step == pytest.approx(10.0 * FAST_SEGMENTATION_STEP)
+    assert loaded.embedding_exclude_overlap is True
+
+
+@pytest.mark.unit
+def test_diarizer_full_cpu_mode_keeps_pipeline_settings():
+    """cpu_mode="full" runs the pretrained pipeline unchanged on CPU."""
+    pytest.importorskip("pyannote.audio")
+    loaded = MagicMock(segmentation_step=0.1, embedding_exclude_overlap=False)
+    loaded._segmentation.step = 1.0
+
+    diarizer = SpeakerDiarizer(hf_token="test", cpu_mode="full")
+    _load_on_cpu(diarizer, loaded)
+
+    assert loaded.segmentation_step == 0.1
+    assert loaded._segmentation.step == 1.0
+    assert loaded.embedding_exclude_overlap is False
+    assert diarizer.variant == ""
+
+
+@pytest.mark.unit
+def test_diarizer_rejects_unknown_cpu_mode():
+    """An unknown cpu_mode fails at construction."""
+    with pytest.raises(ValueError, match="cpu_mode"):
+        SpeakerDiarizer(hf_token="test", cpu_mode="turbo")
+
+
 @pytest.mark.unit
 def test_diarizer_get_speaker_at_time():
     """Test getting speaker at a specific timestamp."""
@@ -216,3 +364,200 @@ def test_diarizer_diarize_file_not_found():
     diarizer = SpeakerDiarizer(hf_token="test")
     with pytest.raises(FileNotFoundError):
         diarizer.diarize("/nonexistent/audio.mp3")
+
+
+@pytest.mark.unit
+def test_diarizer_diarize_in_memory_waveform():
+    """A decoded numpy waveform is handed to pyannote as a (1, samples) tensor."""
+    torch = pytest.importorskip("torch")
+    diarizer = SpeakerDiarizer(hf_token="test", num_speakers=2)
+    diarizer._pipeline = MagicMock()
+    diarizer._pipeline.return_value.itertracks.return_value = [
+        (MagicMock(start=0.0, end=1.5), None, "SPEAKER_00"),
+    ]
+    samples = np.zeros(16000, dtype=np.float32)
+
+    segments = diarizer.diarize({"waveform": samples, "sample_rate": 16000})
+
+    (audio_input,), kwargs = diarizer._pipeline.call_args
+    assert isinstance(audio_input["waveform"], torch.Tensor)
+    assert tuple(audio_input["waveform"].shape) == (1, 16000)
+    assert audio_input["sample_rate"] == 16000
+    assert kwargs == {"num_speakers": 2}
+    assert segments == [SpeakerSegment("SPEAKER_00", Decimal("0.0"), Decimal("1.5"))]
+
+
+def _cached_diarizer(tmp_path, num_speakers=None):
+    inner = SpeakerDiarizer(hf_token="test", num_speakers=num_speakers)
+    inner.diarize = MagicMock(return_value=[
+        SpeakerSegment(speaker="SPEAKER_00", start_time=Decimal("0.000"), end_time=Decimal("1.250"), confidence=0.9),
+        SpeakerSegment(speaker="SPEAKER_01", start_time=Decimal("1.250"), end_time=Decimal("3.5")),
+    ])
+    return CachedDiarizer(inner, str(tmp_path / "diarization")), inner
+
+
+@pytest.mark.unit
+def test_cached_diarizer_reuses_results(tmp_path):
+    """A second diarization of the same audio is read from disk."""
+    audio = tmp_path / "ep.mp3"
+    audio.write_bytes(b"audio")
+    cached, inner = _cached_diarizer(tmp_path)
+
+    first = cached.diarize(str(audio))
+    second = cached.diarize(str(audio))
+
+    inner.diarize.assert_called_once_with(str(audio))
+    assert second == first
+    assert second[0].start_time == Decimal("0.000")
+
+
+@pytest.mark.unit
+def test_cached_diarizer_keys_on_audio_and_speaker_hint(tmp_path):
+    """Changed audio bytes or num_speakers miss the cache."""
+    audio = tmp_path / "ep.mp3"
+    audio.write_bytes(b"audio")
+    cached, inner = _cached_diarizer(tmp_path)
+    cached.diarize(str(audio))
+
+    audio.write_bytes(b"new audio")
+    cached.diarize(str(audio))
+    inner.num_speakers = 3
+    cached.diarize(str(audio))
+
+    assert inner.diarize.call_count == 3
+
+
+@pytest.mark.unit
+def test_cached_diarizer_keys_on_fast_cpu_variant(tmp_path):
+    """Fast CPU results are cached apart from full-pipeline results."""
+    pytest.importorskip("torch")
+    audio = tmp_path / "ep.mp3"
+    audio.write_bytes(b"audio")
+    cached, inner = _cached_diarizer(tmp_path)
+
+    with patch("torch.cuda.is_available", return_value=False):
+        assert inner.variant == "cpu-fast"
+        fast_path = cached.cache_path(str(audio))
+    with patch("torch.cuda.is_available", return_value=True):
+        assert inner.variant == ""
+        gpu_path = cached.cache_path(str(audio))
+
+    assert fast_path != gpu_path
+
+
+@pytest.mark.unit
+def test_cached_diarizer_keys_waveforms_on_samples(tmp_path):
+    """In-memory waveforms are cached by their samples and sample rate."""
+    cached, inner = _cached_diarizer(tmp_path)
+    samples = np.linspace(-1, 1, 16000, dtype=np.float32)
+
+    first = cached.diarize({"waveform": samples, "sample_rate": 16000})
+    second = cached.diarize({"waveform": samples.copy(), "sample_rate": 16000})
+    cached.diarize({"waveform": samples[::-1], "sample_rate": 16000})
+
+    assert second == first
+    assert inner.diarize.call_count == 2
+
+
+@pytest.mark.unit
+def test_cached_diarizer_delegates_other_attributes(tmp_path):
+    cached, inner = _cached_diarizer(tmp_path, num_speakers=2)
+    assert cached.num_speakers == 2
+    assert cached.get_speaker_at_time([], Decimal("1.0")) is None
+
+
+@pytest.mark.unit
+def test_get_diarizer_wraps_with_cache_dir(tmp_path):
+    diarizer = get_diarizer(hf_token="test", cache_dir=str(tmp_path))
+    assert isinstance(diarizer, CachedDiarizer)
+    assert isinstance(diarizer.diarizer, SpeakerDiarizer)
+
+
+class _WeSpeakerEmbedding:
+    """Stand-in for pyannote's PyannoteAudioPretrainedSpeakerEmbedding."""
+
+    sample_rate = 16000
+    min_num_samples = 400
+
+    def __init__(self, model):
+        import torch
+        self.model_ = model.eval()
+        self.device = torch.device("cpu")
+        self.dimension = model.dimension
+
+    def __call__(self, waveforms, masks=None):
+        import torch
+        with torch.inference_mode():
+            return self.model_(waveforms, weights=masks).numpy()
+
+
+def _embedding_pipeline(num_chunks=3, num_frames=50, num_speakers=3):
+    """Random WeSpeaker model, audio and segmentation wired like SpeakerDiarization."""
+    torch = pytest.importorskip("torch")
+    from pyannote.audio.models.embedding import WeSpeakerResNet34
+    from pyannote.core import SlidingWindow, SlidingWindowFeature
+    from types import SimpleNamespace
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    audio = torch.from_numpy(rng.standard_normal((1, 16000 * (num_chunks + 1))).astype(np.float32)) * 0.1
+
+    def crop(file, chunk, mode="pad"):
+        start = int(round(chunk.start * 16000))
+        return audio[:, start:start + 16000], 16000
+
+    data = (rng.random((num_chunks, num_frames, num_speakers)) > 0.5).astype(np.float32)
+    data[1, :, 2] = 0  # inactive (chunk, speaker) pair
+    segmentations = SlidingWindowFeature(data, SlidingWindow(start=0.0, duration=1.0, step=1.0))
+
+    pipeline = SimpleNamespace(
+        _embedding=_WeSpeakerEmbedding(WeSpeakerResNet34()),
+        _audio=SimpleNamespace(crop=crop),
+        embedding_batch_size=2,
+        training=False,
+    )
+    return pipeline, segmentations
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("exclude_overlap", [False, True])
+def test_fast_embeddings_match_pyannote(exclude_overlap):
+    """Shared-backbone embeddings equal pyannote's for active pairs, NaN otherwise."""
+    from pyannote.audio.pipelines.speaker_diarization import SpeakerDiarization
+    from app.transcription.diarization import _fast_get_embeddings
+
+    pipeline, segmentations = _embedding_pipeline()
+    expected = SpeakerDiarization.get_embeddings(pipeline, {}, segmentations, exclude_overlap=exclude_overlap)
+    result = _fast_get_embeddings(pipeline, {}, segmentations, exclude_overlap=exclude_overlap)
+
+    assert result.shape == expected.shape
+    assert np.isnan(result[1, 2]).all()
+    active = segmentations.data.sum(axis=1) > 0
+    np.testing.assert_allclose(result[active], expected[active], rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.unit
+def test_fast_embeddings_run_backbone_once_per_chunk():
+    from app.transcription.diarization import _fast_get_embeddings
+
+    pipeline, segmentations = _embedding_pipeline()
+    model = pipeline._embedding.model_
+    with patch.object(model, "forward_frames", wraps=model.forward_frames) as forward_frames:
+        _fast_get_embeddings(pipeline, {}, segmentations)
+
+    # 3 chunks in batches of 2
+    assert forward_frames.call_count == 2
+    assert sum(call.args[0].shape[0] for call in forward_frames.call_args_list) == 3
+
+
+@pytest.mark.unit
+def test_install_fast_embeddings_requires_wespeaker_split():
+    from types import SimpleNamespace
+    from app.transcription.diarization import _install_fast_embeddings
+
+    pipeline, _ = _embedding_pipeline()
+    assert _install_fast_embeddings(pipeline) is True
+
+    other = SimpleNamespace(_embedding=SimpleNamespace(model_=object()))
+    assert _install_fast_embeddings(other) is False
+    assert not hasattr(other, "get_embeddings")
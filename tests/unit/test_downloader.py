@@ -1,4 +1,7 @@
 """Tests for audio downloader with resume support."""
+import io
+import os
+import shutil
 import pytest
 import tempfile
 from pathlib import Path
@@ -116,3 +119,124 @@ def test_already_downloaded_returns_success(downloader, temp_download_dir):
 
     assert result.success is True
     assert result.file_size == len(file_content)
+
+
+@pytest.mark.unit
+def test_cached_download_reports_local_file_only(downloader, temp_download_dir):
+    """cached_download returns the complete local file, and None otherwise."""
+    (Path(temp_download_dir) / "ep1.mp3").write_bytes(b"audio")
+    (Path(temp_download_dir) / "ep2.tmp").write_bytes(b"partial")
+
+    result = downloader.cached_download("ep1")
+
+    assert result.success is True
+    assert result.file_path == str(Path(temp_download_dir) / "ep1.mp3")
+    assert result.file_size == 5
+    assert downloader.cached_download("ep2") is None
+
+
+@pytest.mark.unit
+def test_download_many_preserves_order(downloader):
+    """download_many returns one result per episode, in input order."""
+    episodes = [MagicMock(id=f"ep{i}", audio_url=f"https://x/{i}.mp3") for i in range(5)]
+
+    def fake_download(audio_url, episode_id):
+        return DownloadResult(success=True, file_path=f"{episode_id}.mp3")
+
+    with patch.object(downloader, "download", side_effect=fake_download):
+        results = downloader.download_many(episodes, max_workers=3)
+
+    assert [r.file_path for r in results] == [f"ep{i}.mp3" for i in range(5)]
+
+
+@pytest.mark.unit
+def test_download_many_empty(downloader):
+    """download_many with no episodes does nothing."""
+    assert downloader.download_many([]) == []
+
+
+@pytest.mark.unit
+def test_download_copies_raw_stream_to_disk(downloader, temp_download_dir):
+    """Response bodies are copied from the raw stream in DOWNLOAD_CHUNK_SIZE blocks."""
+    from app.patreon.downloader import DOWNLOAD_CHUNK_SIZE
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"content-length": "3"}
+    mock_response.raw = io.BytesIO(b"abc")
+
+    with patch.object(downloader.session, "get", return_value=mock_response), \
+         patch("app.patreon.downloader.shutil.copyfileobj", wraps=shutil.copyfileobj) as mock_copy:
+        result = downloader.download("https://x/a.mp3", "ep1")
+
+    assert result.success
+    assert result.file_size == 3
+    assert Path(result.file_path).read_bytes() == b"abc"
+    assert mock_response.raw.decode_content is True
+    assert mock_copy.call_args[0][2] == DOWNLOAD_CHUNK_SIZE
+
+
+@pytest.mark.unit
+def test_is_downloaded_scans_directory_once(downloader, temp_download_dir):
+    """is_downloaded answers from one directory scan, not a stat per episode."""
+    (Path(temp_download_dir) / "ep1.mp3").write_bytes(b"audio")
+    (Path(temp_download_dir) / "empty.mp3").write_bytes(b"")
+
+    with patch("app.patreon.downloader.os.scandir", wraps=os.scandir) as mock_scandir:
+        assert downloader.is_downloaded("ep1")
+        assert not downloader.is_downloaded("empty")
+        assert not downloader.is_downloaded("missing")
+
+    assert mock_scandir.call_count == 1
+
+
+@pytest.mark.unit
+def test_download_recovers_when_listed_file_was_removed(downloader, temp_download_dir):
+    """A file deleted after the scan is downloaded again instead of reported present."""
+    final_path = Path(temp_download_dir) / "ep1.mp3"
+    final_path.write_bytes(b"old")
+    assert downloader.is_downloaded("ep1")
+    final_path.unlink()
+
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"content-length": "3"}
+    mock_response.raw = io.BytesIO(b"new")
+
+    with patch.object(downloader.session, "get", return_value=mock_response):
+        result = downloader.download("https://x/a.mp3", "ep1")
+
+    assert result.success
+    assert final_path.read_bytes() == b"new"
+    assert downloader.is_downloaded("ep1")
+
+
+@pytest.mark.unit
+def test_download_to_memory_writes_nothing_to_disk(downloader, temp_download_dir):
+    """download_to_memory returns the body as a rewound buffer and no file."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.raw = io.BytesIO(b"audio bytes")
+
+    with patch.object(downloader.session, "get", return_value=mock_response):
+        result = downloader.download_to_memory("https://x/a.mp3", "ep1")
+
+    assert result.success
+    assert result.file_path is None
+    assert result.file_size == 11
+    assert result.audio.read() == b"audio bytes"
+    assert os.listdir(temp_download_dir) == []
+
+
+@pytest.mark.unit
+def test_download_to_memory_retries_then_fails(downloader):
+    """Each failed attempt is retried; the last error is reported."""
+    with patch.object(downloader.session, "get", side_effect=ConnectionError("reset")) as mock_get, \
+         patch("app.patreon.downloader.time.sleep") as mock_sleep:
+        result = downloader.download_to_memory("https://x/a.mp3", "ep1", max_retries=2)
+
+    assert not result.success
+    assert result.audio is None
+    assert "reset" in result.error
+    assert mock_get.call_count == 2
+    mock_sleep.assert_called_once()
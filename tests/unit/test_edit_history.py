@@ -267,36 +267,9 @@ class TestInsertSegmentAfterLogsEdit:
 class TestAssignSpeakerToRangeLogsEdit:
     """Tests that assign_speaker_to_range logs edits for changed segments."""
 
-    def _make_cursor_single(self, segment_id=10, old_speaker_id=1, episode_id=5):
-        """Mock cursor for single-segment assignment."""
+    def _run(self, row, **kwargs):
         mock_cursor = MagicMock()
-
-        call_count = [0]
-        def fetchone_side_effect():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # Get segment_index for single selection
-                return {'segment_index': 3}
-            return None
-
-        fetchall_call_count = [0]
-        def fetchall_side_effect():
-            fetchall_call_count[0] += 1
-            if fetchall_call_count[0] == 1:
-                # Get old speaker_ids for affected segments
-                return [
-                    {'id': segment_id, 'speaker_id': old_speaker_id, 'episode_id': episode_id}
-                ]
-            return []
-
-        mock_cursor.fetchone.side_effect = fetchone_side_effect
-        mock_cursor.fetchall.side_effect = fetchall_side_effect
-        mock_cursor.rowcount = 1
-        return mock_cursor
-
-    def test_assign_speaker_logs_edit_for_each_changed_segment(self):
-        """assign_speaker_to_range should log field='speaker' for each changed segment."""
-        mock_cursor = self._make_cursor_single(segment_id=10, old_speaker_id=1)
+        mock_cursor.fetchone.return_value = row
 
         with patch('app.transcription.storage.get_cursor') as mock_get_cursor:
             mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
@@ -304,35 +277,39 @@ class TestAssignSpeakerToRangeLogsEdit:
 
             storage = TranscriptStorage()
             result = storage.assign_speaker_to_range(
-                episode_id=5, start_segment_id=10, end_segment_id=10, speaker_id=2
+                episode_id=5, start_segment_id=10, end_segment_id=kwargs.get("end", 10), speaker_id=2
             )
+        return result, mock_cursor
+
+    def test_assign_speaker_logs_edit_for_each_changed_segment(self):
+        """assign_speaker_to_range should log field='speaker' for each changed segment."""
+        result, mock_cursor = self._run({'speaker_exists': True, 'updated': 1})
 
         assert result == 1
-        calls = [str(c) for c in mock_cursor.execute.call_args_list]
-        assert any('edit_history' in c for c in calls)
+        mock_cursor.execute.assert_called_once()
+        sql = mock_cursor.execute.call_args[0][0]
+        assert 'INSERT INTO edit_history' in sql
+        assert "'speaker'" in sql
 
     def test_assign_speaker_logs_correct_values(self):
         """assign_speaker_to_range should log old speaker_id and new speaker_id."""
-        mock_cursor = self._make_cursor_single(segment_id=10, old_speaker_id=1, episode_id=5)
-
-        with patch('app.transcription.storage.get_cursor') as mock_get_cursor:
-            mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-            mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+        _, mock_cursor = self._run({'speaker_exists': True, 'updated': 1})
 
-            storage = TranscriptStorage()
-            storage.assign_speaker_to_range(
-                episode_id=5, start_segment_id=10, end_segment_id=10, speaker_id=2
-            )
+        sql, params = mock_cursor.execute.call_args[0]
+        # Old value comes from the pre-update row, new value from the request
+        assert 'old.speaker_id::text, %(speaker_id)s::text' in sql
+        assert params['speaker_id'] == 2
+        assert params['episode_id'] == 5
+
+    def test_assign_speaker_unknown_speaker_returns_none(self):
+        """A missing speaker is reported as None, distinct from an empty range."""
+        result, _ = self._run({'speaker_exists': False, 'updated': 0})
+        assert result is None
 
-        for c in mock_cursor.execute.call_args_list:
-            sql, params = c[0]
-            if 'edit_history' in sql:
-                assert params[2] == 'speaker'
-                assert params[3] == '1'   # old speaker_id as string
-                assert params[4] == '2'   # new speaker_id as string
-                break
-        else:
-            pytest.fail("edit_history insert not found")
+    def test_assign_speaker_empty_range_returns_zero(self):
+        """A range whose endpoints are not in the episode updates nothing."""
+        result, _ = self._run({'speaker_exists': True, 'updated': 0}, end=11)
+        assert result == 0
 
 
 @pytest.mark.unit
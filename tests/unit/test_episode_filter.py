@@ -1,7 +1,7 @@
 """Tests for the EpisodeFilter module."""
 
 import pytest
-from app.filters.episode_filter import EpisodeFilter
+from app.filters.episode_filter import EpisodeFilter, _SHAPE_CACHE
 
 
 @pytest.mark.unit
@@ -275,3 +275,27 @@ class TestEpisodeFilterSQLGeneration:
         filter_premium = EpisodeFilter().with_content_type("premium")
         _, params_premium = filter_premium.build()
         assert params_premium == []
+
+
+@pytest.mark.unit
+class TestEpisodeFilterShapeCache:
+    """Test SQL reuse across filters with the same shape."""
+
+    def test_same_shape_reuses_sql(self):
+        """Test filters setting the same fields share one SQL string."""
+        _SHAPE_CACHE.clear()
+        sql_a, params_a = EpisodeFilter().with_date_from("2023-01-01").with_content_type("free").build()
+        sql_b, params_b = EpisodeFilter().with_date_from("2024-06-01").with_content_type("free").build()
+
+        assert sql_a is sql_b
+        assert params_a == ["2023-01-01"]
+        assert params_b == ["2024-06-01"]
+        assert len(_SHAPE_CACHE) == 1
+
+    def test_different_shapes_build_different_sql(self):
+        """Test content type is part of the shape."""
+        sql_free, _ = EpisodeFilter().with_content_type("free").build()
+        sql_premium, _ = EpisodeFilter().with_content_type("premium").build()
+
+        assert sql_free == "e.is_free = true"
+        assert sql_premium == "e.is_free = false"
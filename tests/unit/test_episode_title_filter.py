@@ -0,0 +1,67 @@
+"""Tests for title-based episode filtering in app.episode_filter."""
+
+import pytest
+from app.episode_filter import filter_episodes, is_excluded_show, is_numbered_episode
+from app.db.models import Episode
+
+
+@pytest.mark.unit
+class TestIsNumberedEpisode:
+    """Test numbered episode title detection."""
+
+    @pytest.mark.parametrize("title", [
+        "832 - Title (1/27/25)",
+        "500 - Special Episode (12/1/21)",
+        "1003 - Bored of Peace (10/31/2025)  ",
+    ])
+    def test_numbered_titles(self, title):
+        assert is_numbered_episode(title)
+
+    @pytest.mark.parametrize("title", [
+        "",
+        None,
+        "Title (1/27/25)",
+        "832 - Title",
+        "832 - (1/27/25) with a trailing note",
+    ])
+    def test_other_titles(self, title):
+        assert not is_numbered_episode(title)
+
+
+@pytest.mark.unit
+class TestIsExcludedShow:
+    """Test excluded show detection."""
+
+    @pytest.mark.parametrize("title", [
+        "Players Club: Episode 3",
+        "MOVIE MINDSET - Heat",
+        "Hell on Earth Episode 1",
+        "Bonus (Players Club) 1/27/25",
+        "832 - Hell-on-earth? No, Hell on Earth!",
+    ])
+    def test_excluded_titles_any_case(self, title):
+        assert is_excluded_show(title)
+
+    @pytest.mark.parametrize("title", ["", None, "832 - Title (1/27/25)"])
+    def test_regular_titles(self, title):
+        assert not is_excluded_show(title)
+
+
+@pytest.mark.unit
+def test_filter_episodes_drops_excluded_and_unnumbered():
+    """filter_episodes keeps numbered episodes that are not excluded shows."""
+    episodes = [
+        Episode(id=1, patreon_id="1", title="832 - Title (1/27/25)"),
+        Episode(id=2, patreon_id="2", title="Movie Mindset 5 (1/27/25)"),
+        Episode(id=3, patreon_id="3", title="Bonus Episode"),
+    ]
+    assert [ep.id for ep in filter_episodes(episodes)] == [1]
+    assert [ep.id for ep in filter_episodes(episodes, numbered_only=False)] == [1, 3]
+
+
+@pytest.mark.unit
+def test_filter_episodes_keeps_untitled_only_when_not_numbered_only():
+    """Episodes without a title pass only the unnumbered filter."""
+    episodes = [Episode(id=1, patreon_id="1", title="")]
+    assert filter_episodes(episodes) == []
+    assert [ep.id for ep in filter_episodes(episodes, numbered_only=False)] == [1]
@@ -0,0 +1,53 @@
+"""Tests for the orjson-backed Flask JSON provider."""
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from flask import Flask, jsonify
+
+from app.api.json_provider import OrjsonProvider
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    return app
+
+
+@pytest.mark.unit
+def test_create_app_uses_orjson_provider():
+    """Test the application factory installs the orjson provider."""
+    with patch("app.data.database.init_db"):
+        from app.api.app import create_app
+        app = create_app()
+    assert isinstance(app.json, OrjsonProvider)
+
+
+@pytest.mark.unit
+def test_jsonify_round_trip(app):
+    """Test jsonify output parses back to the same payload."""
+    payload = {"segments": [{"id": 1, "word": "hi", "start_time": 1.25}], "total": 1}
+    with app.app_context():
+        response = jsonify(payload)
+    assert response.mimetype == "application/json"
+    assert response.get_json() == payload
+
+
+@pytest.mark.unit
+def test_decimal_and_datetime_match_flask_default(app):
+    """Test non-native types are encoded the same way as Flask's default provider."""
+    value = {"confidence": Decimal("0.95"), "at": datetime(2024, 1, 2, 3, 4, 5)}
+    with app.app_context():
+        assert app.json.loads(app.json.dumps(value)) == {
+            "confidence": "0.95",
+            "at": "Tue, 02 Jan 2024 03:04:05 GMT",
+        }
+
+
+@pytest.mark.unit
+def test_non_string_keys(app):
+    """Test integer dict keys are serialized as strings."""
+    with app.app_context():
+        assert app.json.loads(app.json.dumps({1: "a"})) == {"1": "a"}
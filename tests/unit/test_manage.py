@@ -82,6 +82,14 @@ class TestProcessCommandIntegration:
                     force=False,
                     expected_speakers=None,
                     vad=False,
+                    precision=None,
+                    quantize=False,
+                    audio_cache_dir=None,
+                    diarization_cache_dir=None,
+                    prefetch=2,
+                    gpus=1,
+                    serial_diarization=False,
+                    cpu_diarization="fast",
                 )
 
                 manage.process(args)
@@ -135,6 +143,14 @@ class TestProcessCommandIntegration:
                     force=False,
                     expected_speakers=None,
                     vad=False,
+                    precision=None,
+                    quantize=False,
+                    audio_cache_dir=None,
+                    diarization_cache_dir=None,
+                    prefetch=2,
+                    gpus=1,
+                    serial_diarization=False,
+                    cpu_diarization="fast",
                 )
 
                 manage.process(args)
@@ -188,6 +204,14 @@ class TestProcessCommandIntegration:
                     force=False,
                     expected_speakers=None,
                     vad=False,
+                    precision=None,
+                    quantize=False,
+                    audio_cache_dir=None,
+                    diarization_cache_dir=None,
+                    prefetch=2,
+                    gpus=1,
+                    serial_diarization=False,
+                    cpu_diarization="fast",
                 )
 
                 manage.process(args)
@@ -116,3 +116,16 @@ def test_transcript_segment_speaker_defaults_to_none():
         segment_index=0
     )
     assert segment.speaker is None
+
+
+@pytest.mark.unit
+def test_models_use_slots():
+    """Episode and TranscriptSegment are slotted, so instances carry no __dict__."""
+    episode = Episode(id=1, patreon_id="p1", title="Ep")
+    segment = TranscriptSegment(
+        id=1, episode_id=1, word="hi", start_time=0.0, end_time=0.5, segment_index=0
+    )
+    for obj in (episode, segment):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.not_a_field = True
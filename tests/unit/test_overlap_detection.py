@@ -5,7 +5,7 @@ Tests for:
 - assign_speakers_to_words() overlap detection logic
 - TranscriptStorage.bulk_insert() is_overlap persistence
 - TranscriptStorage.update_speaker_labels() is_overlap persistence
-- TranscriptStorage.get_episode_paragraphs() has_overlap aggregation
+- (has_overlap paragraph aggregation: tests/integration/test_episode_paragraphs.py)
 """
 import pytest
 from decimal import Decimal
@@ -263,99 +263,3 @@ def test_update_speaker_labels_includes_is_overlap():
                 break
         else:
             pytest.fail("No UPDATE transcript_segments call found")
-
-
-# ─── Storage: get_episode_paragraphs has_overlap aggregation tests ────────────
-
-@pytest.mark.unit
-def test_get_episode_paragraphs_has_overlap_false_when_none_overlap():
-    """Paragraph has_overlap should be False when no words have is_overlap=True."""
-    mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
-        {
-            "id": 2, "word": "world", "start_time": Decimal("0.5"), "end_time": Decimal("1.0"),
-            "segment_index": 1, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
-    ]
-
-    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
-        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-        storage = TranscriptStorage()
-        paragraphs = storage.get_episode_paragraphs(1)
-
-        assert len(paragraphs) == 1
-        assert paragraphs[0]["has_overlap"] is False
-
-
-@pytest.mark.unit
-def test_get_episode_paragraphs_has_overlap_true_when_any_word_overlaps():
-    """Paragraph has_overlap should be True if any word in it has is_overlap=True."""
-    mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
-        {
-            "id": 2, "word": "world", "start_time": Decimal("0.5"), "end_time": Decimal("1.0"),
-            "segment_index": 1, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": True,
-        },
-    ]
-
-    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
-        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-        storage = TranscriptStorage()
-        paragraphs = storage.get_episode_paragraphs(1)
-
-        assert len(paragraphs) == 1
-        assert paragraphs[0]["has_overlap"] is True
-
-
-@pytest.mark.unit
-def test_get_episode_paragraphs_has_overlap_only_for_affected_paragraph():
-    """has_overlap is aggregated per paragraph, not globally."""
-    mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
-        # Paragraph 1: speaker A, no overlap
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
-        # Paragraph 2: speaker B, has overlap
-        {
-            "id": 2, "word": "crosstalk", "start_time": Decimal("0.5"), "end_time": Decimal("1.0"),
-            "segment_index": 1, "speaker": "B", "speaker_name": "Bob",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": True,
-        },
-        # Paragraph 3: speaker A again, no overlap
-        {
-            "id": 3, "word": "ok", "start_time": Decimal("1.0"), "end_time": Decimal("1.5"),
-            "segment_index": 2, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
-    ]
-
-    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
-        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
-        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
-
-        storage = TranscriptStorage()
-        paragraphs = storage.get_episode_paragraphs(1)
-
-        assert len(paragraphs) == 3
-        assert paragraphs[0]["has_overlap"] is False   # Alice paragraph
-        assert paragraphs[1]["has_overlap"] is True    # Bob paragraph (overlap)
-        assert paragraphs[2]["has_overlap"] is False   # Alice paragraph again
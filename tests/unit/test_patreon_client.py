@@ -0,0 +1,100 @@
+"""Tests for PatreonClient."""
+import orjson
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.patreon.client import HTTP_POOL_MAXSIZE, REQUEST_TIMEOUT, PatreonClient
+
+
+def _response(payload):
+    response = MagicMock()
+    response.content = orjson.dumps(payload)
+    return response
+
+
+@pytest.mark.unit
+def test_session_keeps_connections_alive():
+    """The session mounts a pooled adapter so pages reuse TLS connections."""
+    client = PatreonClient(session_id="abc")
+    adapter = client.session.get_adapter("https://www.patreon.com/api/posts")
+    assert adapter._pool_maxsize == HTTP_POOL_MAXSIZE
+
+
+@pytest.mark.unit
+def test_get_episodes_parses_posts_and_cursor():
+    """get_episodes maps posts to episodes and extracts the next cursor."""
+    client = PatreonClient(session_id="abc")
+    payload = {
+        "data": [{
+            "id": "1",
+            "attributes": {"title": "832 - Title (1/27/25)", "published_at": "2025-01-27"},
+            "relationships": {"audio": {"data": {"id": "m1"}}},
+        }],
+        "included": [
+            {"type": "media", "id": "m1",
+             "attributes": {"mimetype": "audio/mpeg", "download_url": "https://x/a.mp3"}},
+        ],
+        "links": {"next": "https://www.patreon.com/api/posts?page%5Bcursor%5D=next123"},
+    }
+
+    with patch.object(client.session, "get", return_value=_response(payload)) as mock_get:
+        episodes, cursor = client.get_episodes(limit=10)
+
+    assert [ep.audio_url for ep in episodes] == ["https://x/a.mp3"]
+    assert cursor == "next123"
+    assert mock_get.call_args.kwargs["timeout"] == REQUEST_TIMEOUT
+
+
+def _page(post_ids, next_cursor=None):
+    page = {"data": [{"id": pid, "attributes": {"title": f"Post {pid}"}} for pid in post_ids]}
+    if next_cursor:
+        page["links"] = {"next": f"https://www.patreon.com/api/posts?page%5Bcursor%5D={next_cursor}"}
+    return page
+
+
+@pytest.mark.unit
+def test_get_all_episodes_follows_cursors_in_order():
+    """get_all_episodes chains pages by cursor and keeps their order."""
+    client = PatreonClient(session_id="abc")
+    pages = {None: _page(["1", "2"], "c2"), "c2": _page(["3", "4"], "c3"), "c3": _page(["5"])}
+
+    with patch.object(client, "_fetch_posts", side_effect=lambda limit, cursor: pages[cursor]) as mock_fetch:
+        episodes = client.get_all_episodes(max_episodes=1000)
+
+    assert [ep.id for ep in episodes] == ["1", "2", "3", "4", "5"]
+    assert [c.args[1] for c in mock_fetch.call_args_list] == [None, "c2", "c3"]
+
+
+@pytest.mark.unit
+def test_get_all_episodes_stops_at_max():
+    """No further page is requested once max_episodes is reached."""
+    client = PatreonClient(session_id="abc")
+    pages = {None: _page(["1", "2"], "c2"), "c2": _page(["3", "4"], "c3")}
+
+    with patch.object(client, "_fetch_posts", side_effect=lambda limit, cursor: pages[cursor]) as mock_fetch:
+        episodes = client.get_all_episodes(max_episodes=3)
+
+    assert [ep.id for ep in episodes] == ["1", "2", "3"]
+    assert mock_fetch.call_count == 2
+
+
+@pytest.mark.unit
+def test_get_audio_url_returns_first_audio_media():
+    """get_audio_url skips non-audio media and tolerates null attributes."""
+    client = PatreonClient(session_id="abc")
+    payload = {
+        "included": [
+            {"type": "media", "id": "img", "attributes": {"mimetype": None}},
+            {"type": "media", "id": "bare", "attributes": None},
+            {"type": "media", "id": "m1",
+             "attributes": {"mimetype": "audio/mpeg", "download_url": "https://x/a.mp3"}},
+            {"type": "media", "id": "m2",
+             "attributes": {"mimetype": "audio/mpeg", "download_url": "https://x/b.mp3"}},
+        ],
+    }
+
+    with patch.object(client.session, "get", return_value=_response(payload)):
+        assert client.get_audio_url("1") == "https://x/a.mp3"
+
+    with patch.object(client.session, "get", return_value=_response({"data": {}})):
+        assert client.get_audio_url("1") is None
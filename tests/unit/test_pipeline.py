@@ -1,3 +1,6 @@
+import threading
+
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock, PropertyMock
 from decimal import Decimal
@@ -42,7 +45,8 @@ def pipeline():
          patch("app.pipeline.get_transcriber"), \
          patch("app.pipeline.TranscriptStorage"), \
          patch("app.pipeline.EpisodeRepository"):
-        p = EpisodePipeline(session_id="test-session")
+        p = EpisodePipeline(session_id="test-session", enable_diarization=False)
+        p.downloader.cached_download.return_value = None
         yield p
 
 
@@ -54,7 +58,8 @@ def pipeline_no_cleanup():
          patch("app.pipeline.get_transcriber"), \
          patch("app.pipeline.TranscriptStorage"), \
          patch("app.pipeline.EpisodeRepository"):
-        p = EpisodePipeline(session_id="test-session", cleanup_audio=False)
+        p = EpisodePipeline(session_id="test-session", cleanup_audio=False, enable_diarization=False)
+        p.downloader.cached_download.return_value = None
         yield p
 
 
@@ -75,16 +80,35 @@ def test_process_episode_success(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = transcript
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     result = pipeline.process_episode(episode)
 
     assert result is True
     pipeline.downloader.download.assert_called_once_with(episode.audio_url, episode.patreon_id)
     pipeline.transcriber.transcribe.assert_called_once_with("/tmp/test.mp3")
-    pipeline.storage.delete_episode_transcript.assert_called_once_with(episode.id)
-    pipeline.storage.store_transcript.assert_called_once_with(episode.id, transcript)
-    pipeline.episode_repo.mark_processed.assert_called_once_with(episode.id)
+    pipeline.storage.replace_transcript.assert_called_once_with(episode.id, transcript, mark_processed=True)
+    pipeline.storage.delete_episode_transcript.assert_not_called()
+    pipeline.episode_repo.mark_processed.assert_not_called()
+
+
+@pytest.mark.unit
+def test_process_episode_reuses_downloaded_audio(pipeline_no_cleanup):
+    """Audio already on disk is transcribed without fetching a fresh URL."""
+    pipeline = pipeline_no_cleanup
+    episode = make_episode()
+    pipeline.downloader.cached_download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+    pipeline.storage.replace_transcript.return_value = 3
+
+    assert pipeline.process_episode(episode) is True
+
+    pipeline.downloader.cached_download.assert_called_once_with(episode.patreon_id)
+    pipeline.patreon.get_audio_url.assert_not_called()
+    pipeline.downloader.download.assert_not_called()
+    pipeline.transcriber.transcribe.assert_called_once_with("/tmp/test.mp3")
 
 
 @pytest.mark.unit
@@ -136,7 +160,7 @@ def test_process_episode_handles_transcription_error(pipeline):
     result = pipeline.process_episode(episode)
 
     assert result is False
-    pipeline.episode_repo.mark_processed.assert_not_called()
+    pipeline.storage.replace_transcript.assert_not_called()
 
 
 @pytest.mark.unit
@@ -149,7 +173,7 @@ def test_process_episode_cleans_up_audio(pipeline, tmp_path):
         success=True, file_path=str(audio_file), file_size=15
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     result = pipeline.process_episode(episode)
 
@@ -157,6 +181,26 @@ def test_process_episode_cleans_up_audio(pipeline, tmp_path):
     assert not audio_file.exists()
 
 
+@pytest.mark.unit
+def test_cleanup_audio_ignores_missing_file(pipeline, tmp_path, caplog):
+    with caplog.at_level("INFO", logger="app.pipeline"):
+        pipeline._cleanup_audio(str(tmp_path / "gone.mp3"))
+
+    assert "Failed to clean up" not in caplog.text
+
+
+@pytest.mark.unit
+def test_cleanup_audio_logs_freed_size(pipeline, tmp_path, caplog):
+    audio_file = tmp_path / "test.mp3"
+    audio_file.write_bytes(b"\0" * (3 * 1024 * 1024))
+
+    with caplog.at_level("INFO", logger="app.pipeline"):
+        pipeline._cleanup_audio(str(audio_file))
+
+    assert not audio_file.exists()
+    assert "3.0 MB freed" in caplog.text
+
+
 @pytest.mark.unit
 def test_process_episode_no_cleanup_when_disabled(pipeline_no_cleanup, tmp_path):
     audio_file = tmp_path / "test.mp3"
@@ -167,7 +211,7 @@ def test_process_episode_no_cleanup_when_disabled(pipeline_no_cleanup, tmp_path)
         success=True, file_path=str(audio_file), file_size=15
     )
     pipeline_no_cleanup.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline_no_cleanup.storage.store_transcript.return_value = 3
+    pipeline_no_cleanup.storage.replace_transcript.return_value = 3
 
     result = pipeline_no_cleanup.process_episode(episode)
 
@@ -175,19 +219,100 @@ def test_process_episode_no_cleanup_when_disabled(pipeline_no_cleanup, tmp_path)
     assert audio_file.exists()
 
 
+@pytest.mark.unit
+def test_process_episode_streams_audio_in_memory_when_discarded(pipeline):
+    """Without diarization, audio that would be cleaned up never touches disk."""
+    import io
+
+    episode = make_episode()
+    audio = io.BytesIO(b"audio")
+    pipeline.diarizer = None
+    pipeline.downloader.is_downloaded.return_value = False
+    pipeline.downloader.download_to_memory.return_value = DownloadResult(
+        success=True, file_path=None, file_size=5, audio=audio
+    )
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+    pipeline.storage.replace_transcript.return_value = 3
+
+    with patch.object(pipeline, "_cleanup_audio") as mock_cleanup:
+        result = pipeline.process_episode(episode)
+
+    assert result is True
+    pipeline.downloader.download.assert_not_called()
+    pipeline.transcriber.transcribe.assert_called_once_with(audio)
+    mock_cleanup.assert_not_called()
+
+
+@pytest.mark.unit
+def test_process_episode_downloads_to_disk_for_diarization(pipeline):
+    """Speaker identification reads a file path, so audio is downloaded to disk."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.return_value = []
+    pipeline.speaker_identifier = None
+    pipeline.downloader.is_downloaded.return_value = False
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+
+    with patch("app.pipeline.decode_audio") as mock_decode:
+        assert pipeline.process_episode(episode) is True
+    pipeline.downloader.download_to_memory.assert_not_called()
+    mock_decode.assert_called_once_with("/tmp/test.mp3", sampling_rate=16000)
+
+
+@pytest.mark.unit
+def test_process_episode_decodes_once_for_whisper_and_diarizer(pipeline):
+    """The diarizer gets the waveform Whisper transcribed, not the file path."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.return_value = []
+    pipeline.speaker_identifier = None
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+
+    samples = np.zeros(16000, dtype=np.float32)
+    with patch("app.pipeline.decode_audio", return_value=samples):
+        assert pipeline.process_episode(episode) is True
+
+    pipeline.transcriber.transcribe.assert_called_once_with(samples)
+    audio = pipeline.diarizer.diarize.call_args[0][0]
+    assert audio["sample_rate"] == 16000
+    assert tuple(audio["waveform"].shape) == (1, 16000)
+
+
+@pytest.mark.unit
+def test_process_episode_transcribes_cached_decoded_audio(pipeline):
+    """With an audio cache, Whisper receives the cached decoded samples."""
+    episode = make_episode()
+    pipeline.audio_cache = MagicMock()
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+
+    assert pipeline.process_episode(episode) is True
+    pipeline.audio_cache.decoded.assert_called_once_with(episode.patreon_id, "/tmp/test.mp3")
+    pipeline.transcriber.transcribe.assert_called_once_with(pipeline.audio_cache.decoded.return_value)
+
+
 @pytest.mark.unit
 def test_process_unprocessed_with_limit(pipeline):
-    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(5)]
+    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(3)]
     pipeline.episode_repo.get_unprocessed.return_value = episodes
 
     pipeline.downloader.download.return_value = DownloadResult(
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
-    stats = pipeline.process_unprocessed(limit=3)
+    stats = pipeline.process_unprocessed(limit=3, offset=2)
 
+    pipeline.episode_repo.get_unprocessed.assert_called_once_with(numbered_only=False, limit=3, offset=2)
     assert stats["total"] == 3
     assert stats["success"] == 3
     assert stats["failed"] == 0
@@ -202,7 +327,7 @@ def test_process_unprocessed_all(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     stats = pipeline.process_unprocessed(limit=None)
 
@@ -223,7 +348,7 @@ def test_process_unprocessed_counts_skipped(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     stats = pipeline.process_unprocessed(limit=None)
 
@@ -232,6 +357,167 @@ def test_process_unprocessed_counts_skipped(pipeline):
     assert stats["skipped"] == 2
 
 
+@pytest.mark.unit
+def test_process_unprocessed_overlaps_download_and_transcribe(pipeline):
+    """The next episode downloads while the previous one is transcribing."""
+    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(1, 4)]
+    pipeline.episode_repo.get_unprocessed.return_value = episodes
+    pipeline.patreon.get_audio_url.return_value = None
+
+    third_download_started = threading.Event()
+
+    def download(url, patreon_id):
+        if patreon_id == "3":
+            third_download_started.set()
+        return DownloadResult(success=True, file_path=f"/tmp/{patreon_id}.mp3", file_size=1000)
+
+    def transcribe(path):
+        if path == "/tmp/1.mp3":
+            assert third_download_started.wait(timeout=5)
+        return make_transcript_result()
+
+    pipeline.downloader.download.side_effect = download
+    pipeline.transcriber.transcribe.side_effect = transcribe
+    pipeline.storage.replace_transcript.return_value = 3
+
+    stats = pipeline.process_unprocessed(limit=None)
+
+    assert stats == {"total": 3, "success": 3, "failed": 0, "skipped": 0}
+    assert sorted(c.args[0] for c in pipeline.storage.replace_transcript.call_args_list) == [1, 2, 3]
+
+
+@pytest.mark.unit
+def test_process_unprocessed_prefetches_configured_number_of_episodes(pipeline):
+    """prefetch_episodes downloads run at the same time."""
+    pipeline.prefetch_episodes = 3
+    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(1, 4)]
+    pipeline.episode_repo.get_unprocessed.return_value = episodes
+    pipeline.patreon.get_audio_url.return_value = None
+
+    all_downloading = threading.Barrier(3, timeout=5)
+
+    def download(url, patreon_id):
+        all_downloading.wait()
+        return DownloadResult(success=True, file_path=f"/tmp/{patreon_id}.mp3", file_size=1000)
+
+    pipeline.downloader.download.side_effect = download
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+    pipeline.storage.replace_transcript.return_value = 3
+
+    stats = pipeline.process_unprocessed(limit=None)
+
+    assert stats["success"] == 3
+
+
+@pytest.mark.unit
+def test_prefetch_episodes_must_be_positive():
+    with patch("app.pipeline.PatreonClient"), \
+         patch("app.pipeline.AudioDownloader"), \
+         patch("app.pipeline.get_transcriber"), \
+         patch("app.pipeline.TranscriptStorage"), \
+         patch("app.pipeline.EpisodeRepository"):
+        with pytest.raises(ValueError, match="prefetch_episodes"):
+            EpisodePipeline(session_id="test-session", prefetch_episodes=0)
+
+
+@pytest.mark.unit
+def test_process_unprocessed_warms_up_transcriber(pipeline):
+    """Models load in the transcribe worker while downloads run; a failed warm-up is not fatal."""
+    episodes = [make_episode(id=1, patreon_id="1")]
+    pipeline.episode_repo.get_unprocessed.return_value = episodes
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.warm_up.side_effect = RuntimeError("no GPU")
+    pipeline.transcriber.transcribe.return_value = make_transcript_result()
+    pipeline.storage.replace_transcript.return_value = 3
+
+    stats = pipeline.process_unprocessed(limit=None)
+
+    pipeline.transcriber.warm_up.assert_called_once_with()
+    assert stats["success"] == 1
+
+
+@pytest.mark.unit
+def test_num_gpus_loads_one_transcriber_per_device():
+    with patch("app.pipeline.PatreonClient"), \
+         patch("app.pipeline.AudioDownloader"), \
+         patch("app.pipeline.get_transcriber", side_effect=lambda *a, **kw: MagicMock()) as mock_get_transcriber, \
+         patch("app.pipeline.TranscriptStorage"), \
+         patch("app.pipeline.EpisodeRepository"):
+        p = EpisodePipeline(session_id="test-session", num_gpus=2, enable_diarization=False)
+
+    assert [c.kwargs["device_index"] for c in mock_get_transcriber.call_args_list] == [0, 1]
+    assert len(p.transcribers) == 2
+    assert p.transcriber is p.transcribers[0]
+
+
+@pytest.mark.unit
+def test_num_gpus_must_be_positive():
+    with patch("app.pipeline.PatreonClient"), \
+         patch("app.pipeline.AudioDownloader"), \
+         patch("app.pipeline.get_transcriber"), \
+         patch("app.pipeline.TranscriptStorage"), \
+         patch("app.pipeline.EpisodeRepository"):
+        with pytest.raises(ValueError, match="num_gpus"):
+            EpisodePipeline(session_id="test-session", num_gpus=0)
+
+
+@pytest.mark.unit
+def test_process_unprocessed_transcribes_on_every_gpu(pipeline):
+    """Each loaded transcriber works on its own episode at the same time."""
+    pipeline.transcribers = [MagicMock(), MagicMock()]
+    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(1, 5)]
+    pipeline.episode_repo.get_unprocessed.return_value = episodes
+    pipeline.patreon.get_audio_url.return_value = None
+    pipeline.downloader.download.side_effect = lambda url, patreon_id: DownloadResult(
+        success=True, file_path=f"/tmp/{patreon_id}.mp3", file_size=1000
+    )
+
+    both_transcribing = threading.Barrier(2, timeout=5)
+
+    def transcribe(path):
+        both_transcribing.wait()
+        return make_transcript_result()
+
+    for transcriber in pipeline.transcribers:
+        transcriber.transcribe.side_effect = transcribe
+    pipeline.storage.replace_transcript.return_value = 3
+
+    stats = pipeline.process_unprocessed(limit=None)
+
+    assert stats == {"total": 4, "success": 4, "failed": 0, "skipped": 0}
+    assert all(t.transcribe.call_count == 2 for t in pipeline.transcribers)
+
+
+@pytest.mark.unit
+def test_process_unprocessed_counts_failures_per_stage(pipeline):
+    """Failures in any stage are counted once and do not stop other episodes."""
+    episodes = [make_episode(id=i, patreon_id=str(i)) for i in range(1, 4)]
+    pipeline.episode_repo.get_unprocessed.return_value = episodes
+    pipeline.patreon.get_audio_url.return_value = None
+
+    def download(url, patreon_id):
+        if patreon_id == "1":
+            return DownloadResult(success=False, file_path=None, error="boom")
+        return DownloadResult(success=True, file_path=f"/tmp/{patreon_id}.mp3", file_size=1000)
+
+    def transcribe(path):
+        if path == "/tmp/2.mp3":
+            raise RuntimeError("Whisper failed")
+        return make_transcript_result()
+
+    pipeline.downloader.download.side_effect = download
+    pipeline.transcriber.transcribe.side_effect = transcribe
+    pipeline.storage.replace_transcript.return_value = 3
+
+    stats = pipeline.process_unprocessed(limit=None)
+
+    assert stats == {"total": 3, "success": 1, "failed": 2, "skipped": 0}
+    assert pipeline.storage.replace_transcript.call_args.args[0] == 3
+    pipeline.storage.replace_transcript.assert_called_once()
+
+
 @pytest.mark.unit
 def test_run_full_pipeline(pipeline):
     from app.patreon.client import PatreonEpisode
@@ -239,19 +525,43 @@ def test_run_full_pipeline(pipeline):
     pipeline.patreon.get_all_episodes.return_value = [
         PatreonEpisode(id="100", title="Ep 1", audio_url="https://example.com/1.mp3", published_at="2024-01-01T00:00:00Z", duration_seconds=3600),
     ]
-    pipeline.episode_repo.create.return_value = make_episode(id=1, patreon_id="100")
+    pipeline.episode_repo.bulk_create.return_value = [make_episode(id=1, patreon_id="100")]
     pipeline.episode_repo.get_unprocessed.return_value = [make_episode(id=1, patreon_id="100")]
 
     pipeline.downloader.download.return_value = DownloadResult(
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     results = pipeline.run(sync=True, max_sync=100, process_limit=10)
 
     assert results["synced"] == 1
     assert results["processed"]["success"] == 1
+    (synced,), _ = pipeline.episode_repo.bulk_create.call_args
+    assert [ep.patreon_id for ep in synced] == ["100"]
+    pipeline.episode_repo.create.assert_not_called()
+
+
+@pytest.mark.unit
+def test_sync_episodes_parses_utc_timestamps(pipeline):
+    from datetime import timezone
+    from app.patreon.client import PatreonEpisode
+
+    pipeline.patreon.get_all_episodes.return_value = [
+        PatreonEpisode(id="100", title="Ep 1", audio_url=None, published_at="2024-01-01T12:30:00.000+00:00", duration_seconds=None),
+        PatreonEpisode(id="101", title="Ep 2", audio_url=None, published_at="2024-01-02T08:00:00Z", duration_seconds=None),
+        PatreonEpisode(id="102", title="Ep 3", audio_url=None, published_at=None, duration_seconds=None),
+    ]
+
+    pipeline.sync_episodes()
+
+    (synced,), _ = pipeline.episode_repo.bulk_create.call_args
+    assert [ep.published_at for ep in synced] == [
+        datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 8, 0, tzinfo=timezone.utc),
+        None,
+    ]
 
 
 @pytest.mark.unit
@@ -273,7 +583,7 @@ def test_run_process_all(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     results = pipeline.run(sync=False, process_limit=None)
 
@@ -290,13 +600,13 @@ def test_process_single_success(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     result = pipeline.process_single(42)
 
     assert result is True
     pipeline.episode_repo.get_by_id.assert_called_once_with(42)
-    pipeline.episode_repo.mark_processed.assert_called_once_with(42)
+    assert pipeline.storage.replace_transcript.call_args.kwargs == {"mark_processed": True}
 
 
 @pytest.mark.unit
@@ -316,22 +626,35 @@ def test_process_unprocessed_numbered_only(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     stats = pipeline.process_unprocessed(limit=None, numbered_only=True)
 
-    pipeline.episode_repo.get_unprocessed.assert_called_once_with(numbered_only=True)
+    pipeline.episode_repo.get_unprocessed.assert_called_once_with(numbered_only=True, limit=None, offset=0)
     assert stats["total"] == 3
     assert stats["success"] == 3
 
 
+@pytest.mark.unit
+def test_process_unprocessed_logs_backlog_count(pipeline, caplog):
+    """The backlog size comes from a COUNT query, not from fetching every row."""
+    pipeline.episode_repo.get_unprocessed.return_value = []
+    pipeline.episode_repo.count_unprocessed.return_value = 250
+
+    with caplog.at_level("INFO", logger="app.pipeline"):
+        pipeline.process_unprocessed(limit=10, numbered_only=True)
+
+    pipeline.episode_repo.count_unprocessed.assert_called_once_with(numbered_only=True)
+    assert "Found 250 unprocessed episodes, processing 0" in caplog.text
+
+
 @pytest.mark.unit
 def test_run_with_numbered_only(pipeline):
     pipeline.episode_repo.get_unprocessed.return_value = []
 
     results = pipeline.run(sync=False, process_limit=10, numbered_only=True)
 
-    pipeline.episode_repo.get_unprocessed.assert_called_once_with(numbered_only=True)
+    pipeline.episode_repo.get_unprocessed.assert_called_once_with(numbered_only=True, limit=10, offset=0)
 
 
 
@@ -348,7 +671,8 @@ def pipeline_with_vocabulary(tmp_path):
          patch("app.pipeline.get_transcriber"), \
          patch("app.pipeline.TranscriptStorage"), \
          patch("app.pipeline.EpisodeRepository"):
-        p = EpisodePipeline(session_id="test-session", vocabulary_file=str(vocab_file))
+        p = EpisodePipeline(session_id="test-session", vocabulary_file=str(vocab_file), enable_diarization=False)
+        p.downloader.cached_download.return_value = None
         yield p
 
 
@@ -395,7 +719,7 @@ def test_pipeline_passes_vocabulary_hints_to_transcriber(pipeline_with_vocabular
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline_with_vocabulary.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline_with_vocabulary.storage.store_transcript.return_value = 3
+    pipeline_with_vocabulary.storage.replace_transcript.return_value = 3
 
     pipeline_with_vocabulary.process_episode(episode)
 
@@ -411,7 +735,7 @@ def test_pipeline_no_vocabulary_hints_when_no_file(pipeline):
         success=True, file_path="/tmp/test.mp3", file_size=1000
     )
     pipeline.transcriber.transcribe.return_value = make_transcript_result()
-    pipeline.storage.store_transcript.return_value = 3
+    pipeline.storage.replace_transcript.return_value = 3
 
     pipeline.process_episode(episode)
 
@@ -447,6 +771,100 @@ def test_pipeline_skips_empty_lines_in_vocabulary(tmp_path):
         assert p.vocabulary_hints == ["Name One", "Name Two", "Name Three"]
 
 
+@pytest.mark.unit
+def test_vocabulary_file_parsed_once_until_changed(pipeline, tmp_path):
+    """Repeated loads reuse the parsed hints; editing the file re-reads it."""
+    import os
+    from app.pipeline import _read_vocabulary
+
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("Name One\nName Two\n")
+    _read_vocabulary.cache_clear()
+
+    assert pipeline._load_vocabulary(str(vocab_file)) == ["Name One", "Name Two"]
+    assert pipeline._load_vocabulary(str(vocab_file)) == ["Name One", "Name Two"]
+    assert _read_vocabulary.cache_info().misses == 1
+
+    vocab_file.write_text("Name Three\n")
+    os.utime(vocab_file, ns=(0, vocab_file.stat().st_mtime_ns + 1_000_000_000))
+    assert pipeline._load_vocabulary(str(vocab_file)) == ["Name Three"]
+    assert _read_vocabulary.cache_info().misses == 2
+
+
+@pytest.mark.unit
+def test_vocabulary_drops_case_insensitive_repeats(tmp_path):
+    """Repeated hints are dropped, keeping the first spelling and order."""
+    vocab_file = tmp_path / "vocab.txt"
+    vocab_file.write_text("Will Menaker\nFelix Biederman\nwill menaker\nWILL MENAKER\nAmber A'Lee Frost\n")
+
+    with patch("app.pipeline.PatreonClient"), \
+         patch("app.pipeline.AudioDownloader"), \
+         patch("app.pipeline.get_transcriber") as mock_get_transcriber, \
+         patch("app.pipeline.TranscriptStorage"), \
+         patch("app.pipeline.EpisodeRepository"):
+        p = EpisodePipeline(session_id="test-session", vocabulary_file=str(vocab_file), enable_diarization=False)
+
+    assert p.vocabulary_hints == ["Will Menaker", "Felix Biederman", "Amber A'Lee Frost"]
+    assert mock_get_transcriber.call_args[1]["initial_prompt"] == (
+        "Names mentioned: Will Menaker, Felix Biederman, Amber A'Lee Frost."
+    )
+
+
+@pytest.mark.unit
+def test_vocabulary_prompt_fits_token_budget():
+    """Hints past the prompt budget are left out rather than truncated by Whisper."""
+    from app.pipeline import _vocabulary_prompt, VOCABULARY_PROMPT_TOKENS, TOKENS_PER_WORD
+
+    hints = [f"First{i} Last{i}" for i in range(200)]
+    prompt = _vocabulary_prompt(hints)
+
+    assert prompt.startswith("Names mentioned: First0 Last0, First1 Last1,")
+    assert len(prompt.split()) * TOKENS_PER_WORD <= VOCABULARY_PROMPT_TOKENS
+    assert "First75 Last75" not in prompt
+    assert _vocabulary_prompt([]) is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("cuda", [True, False])
+def test_cpu_diarization_skip_only_without_gpu(cuda):
+    """cpu_diarization="skip" disables diarization only when no GPU is available."""
+    with patch("app.pipeline.PatreonClient"), \
+         patch("app.pipeline.AudioDownloader"), \
+         patch("app.pipeline.get_transcriber"), \
+         patch("app.pipeline.TranscriptStorage"), \
+         patch("app.pipeline.EpisodeRepository"), \
+         patch("app.pipeline.get_diarizer") as mock_get_diarizer, \
+         patch("app.pipeline._cuda_available", return_value=cuda):
+        p = EpisodePipeline(
+            session_id="test-session",
+            enable_diarization=True,
+            enable_speaker_id=False,
+            cpu_diarization="skip",
+        )
+
+    assert (p.diarizer is not None) == cuda
+    assert mock_get_diarizer.called == cuda
+    if cuda:
+        assert mock_get_diarizer.call_args[1]["cpu_mode"] == "skip"
+
+
+@pytest.mark.unit
+def test_count_speakers_ignores_unlabelled_words():
+    """Only distinct non-empty speaker labels are counted."""
+    from app.pipeline import _count_speakers
+
+    words = [
+        WordSegment(word="a", start_time=Decimal("0"), end_time=Decimal("1"), speaker="Matt"),
+        WordSegment(word="b", start_time=Decimal("1"), end_time=Decimal("2"), speaker=None),
+        WordSegment(word="c", start_time=Decimal("2"), end_time=Decimal("3"), speaker="Will"),
+        WordSegment(word="d", start_time=Decimal("3"), end_time=Decimal("4"), speaker="Matt"),
+        WordSegment(word="e", start_time=Decimal("4"), end_time=Decimal("5"), speaker=""),
+    ]
+
+    assert _count_speakers(words) == 2
+    assert _count_speakers([]) == 0
+
+
 # Tests for speaker identification integration
 
 @pytest.mark.unit
@@ -483,6 +901,7 @@ def test_process_episode_with_speaker_id():
          patch("app.pipeline.TranscriptStorage"), \
          patch("app.pipeline.EpisodeRepository"), \
          patch("app.pipeline.get_diarizer") as mock_get_diarizer, \
+         patch("app.pipeline.decode_audio"), \
          patch("app.transcription.speaker_identification.SpeakerIdentifier") as mock_si_cls:
 
         # Set up speaker identifier mock
@@ -509,10 +928,145 @@ def test_process_episode_with_speaker_id():
             success=True, file_path="/tmp/test.mp3", file_size=1000
         )
         p.transcriber.transcribe.return_value = make_transcript_result()
-        p.storage.store_transcript.return_value = 3
+        p.storage.replace_transcript.return_value = 3
 
         result = p.process_episode(episode)
 
         assert result is True
         mock_si.identify.assert_called_once()
         mock_si.relabel_segments.assert_called_once()
+
+
+@pytest.mark.unit
+def test_diarize_episode_decodes_audio_once(pipeline):
+    """Diarization, identification and refinement share one decoded waveform."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.return_value = []
+    pipeline.speaker_identifier = MagicMock()
+    pipeline.speaker_identifier.identify.return_value = ({"SPEAKER_00": "Matt"}, {"SPEAKER_00": 0.9})
+    pipeline.speaker_identifier.relabel_segments.side_effect = lambda segs, lmap, smap: segs
+    pipeline.storage.has_transcript.return_value = True
+    pipeline.storage.get_segments_for_diarization.return_value = []
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+
+    with patch("app.pipeline.decode_audio", return_value=np.zeros(16000, dtype=np.float32)) as mock_decode, \
+         patch("app.pipeline.refine_speaker_boundaries", return_value=[]) as mock_refine:
+        assert pipeline.diarize_episode(episode) is True
+
+    mock_decode.assert_called_once_with("/tmp/test.mp3", sampling_rate=16000)
+    audio = pipeline.diarizer.diarize.call_args[0][0]
+    assert tuple(audio["waveform"].shape) == (1, 16000)
+    assert pipeline.speaker_identifier.identify.call_args[0][0] is audio
+    assert mock_refine.call_args[0][2] is audio
+    pipeline.speaker_identifier._load_audio.assert_not_called()
+
+
+@pytest.mark.unit
+def test_diarize_episode_reuses_downloaded_audio(pipeline):
+    """Re-diarizing an episode whose audio is on disk skips the URL lookup and download."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.return_value = []
+    pipeline.speaker_identifier = None
+    pipeline.storage.has_transcript.return_value = True
+    pipeline.storage.get_segments_for_diarization.return_value = []
+    pipeline.downloader.cached_download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+
+    with patch("app.pipeline.decode_audio", return_value=np.zeros(16000, dtype=np.float32)) as mock_decode:
+        assert pipeline.diarize_episode(episode) is True
+
+    pipeline.patreon.get_audio_url.assert_not_called()
+    pipeline.downloader.download.assert_not_called()
+    mock_decode.assert_called_once_with("/tmp/test.mp3", sampling_rate=16000)
+
+
+@pytest.mark.unit
+def test_diarize_episode_logs_failure_with_traceback(pipeline, caplog, capsys):
+    """A diarization error is logged with its traceback instead of printed to stderr."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.storage.has_transcript.return_value = True
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+
+    with patch("app.pipeline.decode_audio", side_effect=RuntimeError("bad audio")), \
+         caplog.at_level("ERROR", logger="app.pipeline"):
+        assert pipeline.diarize_episode(episode) is False
+
+    record = next(r for r in caplog.records if "Error diarizing episode" in r.getMessage())
+    assert record.exc_info[0] is RuntimeError
+    assert "Traceback" not in capsys.readouterr().err
+
+
+@pytest.mark.unit
+def test_process_episode_diarizes_while_transcribing(pipeline):
+    """With parallel diarization, pyannote runs while Whisper transcribes."""
+    episode = make_episode()
+    diarizing = threading.Event()
+    pipeline.diarizer = MagicMock()
+
+    def diarize(audio):
+        diarizing.set()
+        return []
+
+    def transcribe(audio):
+        # Only returns if diarization started concurrently
+        assert diarizing.wait(timeout=5)
+        return make_transcript_result()
+
+    pipeline.diarizer.diarize.side_effect = diarize
+    pipeline.speaker_identifier = None
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.side_effect = transcribe
+
+    with patch("app.pipeline.decode_audio", return_value=np.zeros(16000, dtype=np.float32)):
+        assert pipeline.process_episode(episode) is True
+    pipeline.diarizer.diarize.assert_called_once()
+
+
+@pytest.mark.unit
+def test_process_episode_serial_diarization(pipeline):
+    """With parallel diarization off, diarization starts after transcription."""
+    episode = make_episode()
+    calls = []
+    pipeline.parallel_diarization = False
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.side_effect = lambda audio: calls.append("diarize") or []
+    pipeline.speaker_identifier = None
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    pipeline.transcriber.transcribe.side_effect = (
+        lambda audio: calls.append("transcribe") or make_transcript_result()
+    )
+
+    with patch("app.pipeline.decode_audio", return_value=np.zeros(16000, dtype=np.float32)):
+        assert pipeline.process_episode(episode) is True
+    assert calls == ["transcribe", "diarize"]
+
+
+@pytest.mark.unit
+def test_process_episode_parallel_diarization_failure_keeps_transcript(pipeline):
+    """A diarization error in the background thread doesn't fail the episode."""
+    episode = make_episode()
+    pipeline.diarizer = MagicMock()
+    pipeline.diarizer.diarize.side_effect = RuntimeError("CUDA out of memory")
+    pipeline.speaker_identifier = None
+    pipeline.downloader.download.return_value = DownloadResult(
+        success=True, file_path="/tmp/test.mp3", file_size=1000
+    )
+    transcript = make_transcript_result()
+    pipeline.transcriber.transcribe.return_value = transcript
+
+    with patch("app.pipeline.decode_audio", return_value=np.zeros(16000, dtype=np.float32)):
+        assert pipeline.process_episode(episode) is True
+    pipeline.storage.replace_transcript.assert_called_once_with(episode.id, transcript, mark_processed=True)
+    assert all(s.speaker is None for s in transcript.segments)
@@ -1,10 +1,27 @@
-"""Tests for EpisodeRepository."""
+"""Tests for EpisodeRepository and TranscriptRepository."""
+import dataclasses
+
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
-from app.db.models import Episode
-from app.db.repository import EpisodeRepository
+from app.db.models import Episode, TranscriptSegment
+from app.db.repository import (
+    COPY_BUFFER_SIZE,
+    EPISODE_BY_ID_SQL,
+    EPISODE_COLUMNS,
+    EPISODE_STREAM_BATCH_SIZE,
+    EpisodeRepository,
+    TranscriptRepository,
+    clear_episode_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_episode_cache():
+    clear_episode_cache()
+    yield
+    clear_episode_cache()
 
 
 def make_episode(id=1, patreon_id="123", title="Test Episode"):
@@ -27,34 +44,8 @@ class TestGetByEpisodeNumbers:
         """Should return episodes whose titles start with the given episode numbers."""
         mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "patreon_id": "abc123",
-                "title": "1003 - Bored of Peace feat. Derek Davison",
-                "audio_url": "https://example.com/1.mp3",
-                "published_at": datetime(2024, 1, 1),
-                "duration_seconds": 3600,
-                "youtube_url": None,
-                "youtube_id": None,
-                "is_free": False,
-                "processed": False,
-                "created_at": datetime(2024, 1, 1),
-                "updated_at": datetime(2024, 1, 1),
-            },
-            {
-                "id": 2,
-                "patreon_id": "def456",
-                "title": "1006 - Another Episode",
-                "audio_url": "https://example.com/2.mp3",
-                "published_at": datetime(2024, 1, 2),
-                "duration_seconds": 4200,
-                "youtube_url": None,
-                "youtube_id": None,
-                "is_free": False,
-                "processed": False,
-                "created_at": datetime(2024, 1, 2),
-                "updated_at": datetime(2024, 1, 2),
-            },
+            _episode_row(1, "abc123", "1003 - Bored of Peace feat. Derek Davison"),
+            _episode_row(2, "def456", "1006 - Another Episode"),
         ]
 
         with patch("app.db.repository.get_cursor") as mock_get_cursor:
@@ -103,25 +94,26 @@ class TestGetByEpisodeNumbers:
             # Check that params include the patterns
             assert "1003 -%" in params or "1003 - %" in params or ("1003 -%",) in params or any("1003" in str(p) for p in params)
 
+    @pytest.mark.unit
+    def test_uses_single_array_parameter(self):
+        """Should pass all prefixes as one array instead of one OR clause each."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+
+        with _patched_cursor(mock_cursor):
+            EpisodeRepository().get_by_episode_numbers([1003, 1006, 1010])
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert "LIKE ANY(%s)" in query
+        assert " OR " not in query
+        assert params == (["1003 -%", "1006 -%", "1010 -%"],)
+
     @pytest.mark.unit
     def test_handles_single_episode_number(self):
         """Should work with a single episode number."""
         mock_cursor = MagicMock()
         mock_cursor.fetchall.return_value = [
-            {
-                "id": 1,
-                "patreon_id": "abc123",
-                "title": "1003 - Bored of Peace feat. Derek Davison",
-                "audio_url": "https://example.com/1.mp3",
-                "published_at": datetime(2024, 1, 1),
-                "duration_seconds": 3600,
-                "youtube_url": None,
-                "youtube_id": None,
-                "is_free": False,
-                "processed": False,
-                "created_at": datetime(2024, 1, 1),
-                "updated_at": datetime(2024, 1, 1),
-            },
+            _episode_row(1, "abc123", "1003 - Bored of Peace feat. Derek Davison"),
         ]
 
         with patch("app.db.repository.get_cursor") as mock_get_cursor:
@@ -135,3 +127,387 @@ class TestGetByEpisodeNumbers:
 
             assert len(episodes) == 1
             assert episodes[0].title == "1003 - Bored of Peace feat. Derek Davison"
+
+
+def _patched_cursor(mock_cursor):
+    mock_ctx = MagicMock()
+    mock_ctx.__enter__ = MagicMock(return_value=mock_cursor)
+    mock_ctx.__exit__ = MagicMock(return_value=False)
+    return patch("app.db.repository.get_cursor", return_value=mock_ctx)
+
+
+class TestPreparedLookups:
+    """Tests that hot lookups go through server-side prepared statements."""
+
+    @pytest.mark.unit
+    def test_get_by_id_prepares_once_per_connection(self):
+        """Repeated get_by_id calls on one connection PREPARE only once."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        with _patched_cursor(mock_cursor):
+            repo = EpisodeRepository()
+            assert repo.get_by_id(1) is None
+            assert repo.get_by_id(2) is None
+
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert statements == [
+            f"PREPARE ep_by_id AS {EPISODE_BY_ID_SQL}",
+            "EXECUTE ep_by_id(%s)",
+            "EXECUTE ep_by_id(%s)",
+        ]
+
+    @pytest.mark.unit
+    def test_get_by_patreon_id_returns_episode(self):
+        """get_by_patreon_id executes the prepared statement and builds an Episode."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row(3, "p3")
+
+        with _patched_cursor(mock_cursor):
+            episode = EpisodeRepository().get_by_patreon_id("p3")
+
+        assert episode.id == 3
+        assert mock_cursor.execute.call_args[0] == ("EXECUTE ep_by_patreon_id(%s)", ("p3",))
+
+    @pytest.mark.unit
+    def test_mark_processed_uses_prepared_statement(self):
+        """mark_processed executes the prepared UPDATE."""
+        mock_cursor = MagicMock()
+
+        with _patched_cursor(mock_cursor):
+            EpisodeRepository().mark_processed(5)
+
+        assert mock_cursor.execute.call_args[0] == ("EXECUTE ep_mark_processed(%s)", (5,))
+
+    @pytest.mark.unit
+    def test_search_uses_prepared_statement(self):
+        """search binds the pattern, limit and offset to the prepared query."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [{"word": "hello"}]
+
+        with _patched_cursor(mock_cursor):
+            results = TranscriptRepository().search("hell", limit=10, offset=20)
+
+        assert results == [{"word": "hello"}]
+        assert mock_cursor.execute.call_args[0] == ("EXECUTE ts_search(%s, %s, %s)", ("%hell%", 10, 20))
+
+    @pytest.mark.unit
+    def test_search_escapes_like_wildcards(self):
+        """Literal % and _ in the query are matched literally, not as wildcards."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+
+        with _patched_cursor(mock_cursor):
+            TranscriptRepository().search("100%_")
+
+        assert mock_cursor.execute.call_args[0][1][0] == "%100\\%\\_%"
+
+
+class TestBulkInsert:
+    """Tests for TranscriptRepository.bulk_insert."""
+
+    @pytest.mark.unit
+    def test_empty_segments_skips_database(self):
+        """No segments means no cursor is opened."""
+        with patch("app.db.repository.get_cursor") as mock_get_cursor:
+            TranscriptRepository().bulk_insert([])
+        mock_get_cursor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_streams_rows_with_copy(self):
+        """Segments are streamed through COPY, escaping text fields."""
+        segments = (
+            TranscriptSegment(id=None, episode_id=1, word=word, start_time=float(i),
+                              end_time=i + 0.5, segment_index=i)
+            for i, word in enumerate(["w0", "tab\there", "back\\slash"])
+        )
+        mock_cursor = MagicMock()
+        sent = {}
+
+        def fake_copy_expert(sql, file, size):
+            sent["sql"] = sql
+            sent["size"] = size
+            sent["data"] = "".join(iter(lambda: file.read(size), ""))
+
+        mock_cursor.copy_expert.side_effect = fake_copy_expert
+
+        with _patched_cursor(mock_cursor):
+            TranscriptRepository().bulk_insert(segments)
+
+        assert sent["sql"].startswith("COPY transcript_segments (episode_id, word, start_time, end_time, segment_index)")
+        assert sent["size"] == COPY_BUFFER_SIZE
+        assert sent["data"] == (
+            "1\tw0\t0.0\t0.5\t0\n"
+            "1\ttab\\there\t1.0\t1.5\t1\n"
+            "1\tback\\\\slash\t2.0\t2.5\t2\n"
+        )
+
+
+def _episode_row(id=1, patreon_id="p1", title="Ep"):
+    """A tuple row in EPISODE_COLUMNS order."""
+    created = datetime(2024, 1, 1)
+    return (id, patreon_id, title, None, created, None, None,
+            False, False, False, False, created, created)
+
+
+class TestEpisodeCache:
+    """Tests for the cache in front of get_by_id / get_by_patreon_id."""
+
+    @pytest.mark.unit
+    def test_repeated_lookup_hits_cache(self):
+        """A second lookup by either key is served without a query."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row()
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            repo = EpisodeRepository()
+            first = repo.get_by_id(1)
+            second = repo.get_by_id(1)
+            by_patreon = repo.get_by_patreon_id("p1")
+
+        assert mock_get_cursor.call_count == 1
+        assert first == second == by_patreon
+        assert first is not second
+
+    @pytest.mark.unit
+    def test_returned_episode_is_a_copy(self):
+        """Mutating a returned episode does not change the cached one."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row()
+
+        with _patched_cursor(mock_cursor):
+            repo = EpisodeRepository()
+            repo.get_by_id(1).title = "Changed"
+            assert repo.get_by_id(1).title == "Ep"
+
+    @pytest.mark.unit
+    def test_misses_are_not_cached(self):
+        """A missing episode is looked up again next time."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = None
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            repo = EpisodeRepository()
+            assert repo.get_by_id(1) is None
+            assert repo.get_by_id(1) is None
+
+        assert mock_get_cursor.call_count == 2
+
+    @pytest.mark.unit
+    def test_writes_invalidate_both_keys(self):
+        """Updating an episode drops it under its ID and Patreon ID."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row()
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            repo = EpisodeRepository()
+            repo.get_by_id(1)
+            repo.update_is_free(1, True)
+            repo.get_by_patreon_id("p1")
+
+        # lookup, update, lookup again after invalidation
+        assert mock_get_cursor.call_count == 3
+
+    @pytest.mark.unit
+    def test_expired_entries_are_reloaded(self):
+        """Entries older than the TTL are fetched again."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row()
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor, \
+             patch("app.db.repository.time.monotonic", side_effect=[0.0, 10_000.0, 10_000.0]):
+            repo = EpisodeRepository()
+            repo.get_by_id(1)
+            repo.get_by_id(1)
+
+        assert mock_get_cursor.call_count == 2
+
+    @pytest.mark.unit
+    def test_cache_can_be_disabled(self):
+        """use_cache=False always reads from the database."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = _episode_row()
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            repo = EpisodeRepository(use_cache=False)
+            repo.get_by_id(1)
+            repo.get_by_id(1)
+
+        assert mock_get_cursor.call_count == 2
+
+
+class TestStreamingEpisodes:
+    """Tests for the iter_* generators backed by server-side cursors."""
+
+    @pytest.mark.unit
+    def test_iter_all_uses_named_cursor(self):
+        """iter_all reads through a named cursor in fixed-size batches."""
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([_episode_row(1, "p1"), _episode_row(2, "p2")])
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            episodes = EpisodeRepository().iter_all()
+            mock_get_cursor.assert_not_called()
+            assert [ep.id for ep in episodes] == [1, 2]
+
+        assert mock_get_cursor.call_args.kwargs["name"] == "episodes_all"
+        assert mock_cursor.itersize == EPISODE_STREAM_BATCH_SIZE
+
+
+class TestEpisodeColumns:
+    """Tests for the explicit episode column projection."""
+
+    @pytest.mark.unit
+    def test_columns_match_leading_episode_fields(self):
+        """EPISODE_COLUMNS lists Episode's stored fields in declaration order."""
+        columns = EPISODE_COLUMNS.split(", ")
+        fields = [f.name for f in dataclasses.fields(Episode)]
+        assert fields[:len(columns)] == columns
+
+    @pytest.mark.unit
+    def test_rows_build_episodes_by_position(self):
+        """Lookups read tuple rows and map them onto Episode positionally."""
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [_episode_row(7, "p7", "7 - Title")]
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            episodes = EpisodeRepository().search_by_title("Title")
+
+        assert mock_get_cursor.call_args.kwargs["cursor_factory"] is None
+        assert "SELECT *" not in mock_cursor.execute.call_args[0][0]
+        assert episodes[0].patreon_id == "p7"
+        assert episodes[0].updated_at == datetime(2024, 1, 1)
+        assert episodes[0].youtube_id is None
+
+    @pytest.mark.unit
+    def test_get_unprocessed_returns_list(self):
+        """get_unprocessed keeps returning a list built from the stream."""
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([_episode_row(3, "p3")])
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            episodes = EpisodeRepository().get_unprocessed(numbered_only=True)
+
+        assert isinstance(episodes, list)
+        assert episodes[0].id == 3
+        assert mock_get_cursor.call_args.kwargs["name"] == "episodes_unprocessed_numbered"
+        assert "title ~ '^[0-9]'" in mock_cursor.execute.call_args[0][0]
+
+
+    @pytest.mark.unit
+    def test_get_unprocessed_pages_in_sql(self):
+        """limit and offset are bound as LIMIT/OFFSET instead of slicing in Python."""
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([_episode_row(3, "p3")])
+
+        with _patched_cursor(mock_cursor) as mock_get_cursor:
+            EpisodeRepository().get_unprocessed(limit=10, offset=20)
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert mock_get_cursor.call_args.kwargs["name"] == "episodes_unprocessed"
+        assert query.endswith("ORDER BY published_at DESC LIMIT %s OFFSET %s")
+        assert params == (10, 20)
+
+    @pytest.mark.unit
+    def test_get_unprocessed_without_limit_reads_all(self):
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([])
+
+        with _patched_cursor(mock_cursor):
+            EpisodeRepository().get_unprocessed()
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert "LIMIT" not in query and "OFFSET" not in query
+        assert params == ()
+
+
+    @pytest.mark.unit
+    def test_count_unprocessed_runs_count_query(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchone.return_value = (42,)
+
+        with _patched_cursor(mock_cursor):
+            count = EpisodeRepository().count_unprocessed(numbered_only=True)
+
+        query = mock_cursor.execute.call_args[0][0]
+        assert count == 42
+        assert query.startswith("SELECT COUNT(*) FROM episodes WHERE NOT processed")
+        assert "title ~ '^[0-9]'" in query
+
+
+class TestMissingWordConfidence:
+    """Tests for iter_with_missing_word_confidence."""
+
+    @pytest.mark.unit
+    def test_uses_exists_semi_join(self):
+        """The query probes segments with EXISTS rather than DISTINCT over a join."""
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([_episode_row(4, "p4")])
+
+        with _patched_cursor(mock_cursor):
+            episodes = EpisodeRepository().get_with_missing_word_confidence()
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert "EXISTS" in query
+        assert "DISTINCT" not in query
+        assert "LIMIT" not in query
+        assert params == ()
+        assert [ep.id for ep in episodes] == [4]
+
+    @pytest.mark.unit
+    def test_limit_is_bound_as_parameter(self):
+        """The limit is passed as a query parameter, not formatted into the SQL."""
+        mock_cursor = MagicMock()
+        mock_cursor.__iter__.return_value = iter([])
+
+        with _patched_cursor(mock_cursor):
+            EpisodeRepository().get_with_missing_word_confidence(limit=5)
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert query.rstrip().endswith("LIMIT %s")
+        assert params == (5,)
+
+
+class TestBulkCreate:
+    """Tests for EpisodeRepository.bulk_create."""
+
+    @pytest.mark.unit
+    def test_empty_list_skips_database(self):
+        with patch("app.db.repository.get_cursor") as mock_get_cursor:
+            assert EpisodeRepository().bulk_create([]) == []
+        mock_get_cursor.assert_not_called()
+
+    @pytest.mark.unit
+    def test_upserts_all_rows_in_one_statement(self):
+        """One execute_values call upserts every episode and fills in returned columns."""
+        episodes = [make_episode(id=None, patreon_id="a"), make_episode(id=None, patreon_id="b")]
+        created = datetime(2024, 2, 1)
+        returned = [
+            {"patreon_id": "b", "id": 12, "is_free": True, "created_at": created, "updated_at": created},
+            {"patreon_id": "a", "id": 11, "is_free": False, "created_at": created, "updated_at": created},
+        ]
+
+        with _patched_cursor(MagicMock()), \
+             patch("app.db.repository.execute_values", return_value=returned) as mock_execute_values:
+            saved = EpisodeRepository().bulk_create(episodes)
+
+        mock_execute_values.assert_called_once()
+        sql = mock_execute_values.call_args[0][1]
+        assert "ON CONFLICT (patreon_id) DO UPDATE" in sql
+        assert mock_execute_values.call_args.kwargs["fetch"] is True
+        assert [(ep.patreon_id, ep.id, ep.is_free) for ep in saved] == [("a", 11, False), ("b", 12, True)]
+
+    @pytest.mark.unit
+    def test_duplicate_patreon_ids_collapse_to_last(self):
+        """ON CONFLICT cannot touch a row twice, so duplicates are sent once."""
+        first = make_episode(id=None, patreon_id="a", title="Old")
+        last = make_episode(id=None, patreon_id="a", title="New")
+        returned = [{"patreon_id": "a", "id": 1, "is_free": False, "created_at": None, "updated_at": None}]
+
+        with _patched_cursor(MagicMock()), \
+             patch("app.db.repository.execute_values", return_value=returned) as mock_execute_values:
+            saved = EpisodeRepository().bulk_create([first, last])
+
+        rows = mock_execute_values.call_args[0][2]
+        assert [row[1] for row in rows] == ["New"]
+        assert saved == [last]
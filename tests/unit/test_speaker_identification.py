@@ -204,6 +204,26 @@ def test_identify_greedy_assignment(tmp_path):
     assert label_map["SPEAKER_01"] == "Will"
 
 
+@pytest.mark.unit
+def test_identify_uses_preloaded_waveform(tmp_path):
+    """A pre-loaded waveform dict reaches the embedding model without reloading."""
+    np.save(tmp_path / "Matt.npy", make_embedding(seed=10))
+    segments = [
+        SpeakerSegment(speaker="SPEAKER_00", start_time=Decimal("0.0"), end_time=Decimal("5.0")),
+    ]
+    audio = {"waveform": MagicMock(), "sample_rate": 16000}
+    identifier = SpeakerIdentifier(embeddings_dir=str(tmp_path), match_threshold=0.50)
+
+    with patch.object(identifier, 'extract_cluster_embedding',
+                      return_value=make_embedding(seed=10)) as mock_extract, \
+         patch("torchaudio.load") as mock_load:
+        label_map, _ = identifier.identify(audio, segments)
+
+    assert label_map == {"SPEAKER_00": "Matt"}
+    assert mock_extract.call_args[0][0] is audio
+    mock_load.assert_not_called()
+
+
 @pytest.mark.unit
 def test_identify_unknown_speakers(tmp_path):
     """Unmatched clusters get Unknown_N labels."""
@@ -324,3 +344,55 @@ def test_hungarian_algorithm_optimal_assignment(tmp_path):
     assert label_map["SPEAKER_01"] == "Matt"
     assert score_map["SPEAKER_00"] >= 0.70
     assert score_map["SPEAKER_01"] >= 0.70
+
+
+def _identifier_with_random_xvector():
+    """SpeakerIdentifier whose embedding model is a randomly initialised XVectorSincNet."""
+    torch = pytest.importorskip("torch")
+    from pyannote.audio import Inference
+    from pyannote.audio.core.task import Problem, Resolution, Specifications
+    from pyannote.audio.models.embedding import XVectorSincNet
+
+    torch.manual_seed(0)
+    model = XVectorSincNet()
+    model._specifications = Specifications(
+        problem=Problem.REPRESENTATION, resolution=Resolution.CHUNK, duration=3.0
+    )
+    model.eval()
+    identifier = SpeakerIdentifier(embeddings_dir="/nonexistent")
+    identifier._model = Inference(model, window="whole")
+    return identifier, torch
+
+
+@pytest.mark.unit
+def test_embed_segments_matches_per_segment_crop():
+    """Batched embeddings agree with embedding each span on its own."""
+    identifier, torch = _identifier_with_random_xvector()
+    rng = np.random.default_rng(0)
+    audio = {
+        "waveform": torch.from_numpy(rng.standard_normal((1, 16000 * 6)).astype(np.float32)) * 0.1,
+        "sample_rate": 16000,
+    }
+    spans = [(0.5, 1.5), (2.0, 3.05), (3.2, 4.25), (4.5, 5.0)]
+
+    from pyannote.core import Segment
+    with patch.object(identifier._model.model, "forward", wraps=identifier._model.model.forward) as forward:
+        batched = identifier.embed_segments(audio, spans)
+    # The three ~1s spans share a batch; padding the 0.5s span would double it
+    assert forward.call_count == 2
+
+    for (start, end), embedding in zip(spans, batched):
+        single = identifier.model.crop(audio, Segment(start, end))
+        assert SpeakerIdentifier.cosine_similarity(embedding, single) > 0.999
+
+
+@pytest.mark.unit
+def test_embed_segments_uncroppable_span_is_none():
+    """A span outside the audio gets None without failing the others."""
+    identifier, torch = _identifier_with_random_xvector()
+    audio = {"waveform": torch.zeros(1, 16000 * 2) + 0.01, "sample_rate": 16000}
+
+    embeddings = identifier.embed_segments(audio, [(0.5, 1.5), (5.0, 6.0)])
+
+    assert embeddings[0] is not None
+    assert embeddings[1] is None
@@ -2,7 +2,7 @@
 import pytest
 from decimal import Decimal
 from unittest.mock import MagicMock, patch, call
-from app.transcription.storage import TranscriptStorage, BATCH_SIZE
+from app.transcription.storage import TranscriptStorage, BATCH_SIZE, APPROXIMATE_COUNT_THRESHOLD
 from app.db.models import TranscriptSegment
 
 
@@ -180,24 +180,25 @@ def test_bulk_insert_word_confidence_null_handled():
         assert result == 1
 
 
-# ─── get_episode_paragraphs: words array and min_word_confidence tests ─────────
+# ─── get_episode_paragraphs tests ──────────────────────────────────────────────
 
-@pytest.mark.unit
-def test_get_episode_paragraphs_includes_words_array():
-    """Paragraphs should include a words array with per-word metadata."""
+def _paragraph_row(**overrides):
+    row = {
+        "speaker": "Alice", "text": "hello world", "start_time": 0.0, "end_time": 1.0,
+        "segment_ids": [1, 2], "speaker_confidence": 0.9, "has_overlap": False,
+        "words": [
+            {"id": 1, "text": "hello", "speaker_confidence": 0.9, "word_confidence": 0.8},
+            {"id": 2, "text": "world", "speaker_confidence": 0.9, "word_confidence": 0.6},
+        ],
+        "min_word_confidence": 0.6,
+    }
+    row.update(overrides)
+    return row
+
+
+def _run_get_episode_paragraphs(rows):
     mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": Decimal("0.9"), "word_confidence": Decimal("0.8"), "is_overlap": False,
-        },
-        {
-            "id": 2, "word": "world", "start_time": Decimal("0.5"), "end_time": Decimal("1.0"),
-            "segment_index": 1, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": Decimal("0.9"), "word_confidence": Decimal("0.6"), "is_overlap": False,
-        },
-    ]
+    mock_cursor.fetchall.return_value = rows
 
     with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
         mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
@@ -206,57 +207,356 @@ def test_get_episode_paragraphs_includes_words_array():
         storage = TranscriptStorage()
         paragraphs = storage.get_episode_paragraphs(1)
 
-        assert len(paragraphs) == 1
-        para = paragraphs[0]
-        assert "words" in para
-        assert len(para["words"]) == 2
-        assert para["words"][0] == {"id": 1, "text": "hello", "speaker_confidence": 0.9, "word_confidence": 0.8}
-        assert para["words"][1] == {"id": 2, "text": "world", "speaker_confidence": 0.9, "word_confidence": 0.6}
+    sql = mock_cursor.execute.call_args[0][0]
+    return paragraphs, sql
+
+
+@pytest.mark.unit
+def test_get_episode_paragraphs_sql_shape():
+    """Paragraphs are grouped and aggregated in one PARAGRAPHS_SQL query.
+
+    Grouping itself is covered against Postgres in
+    tests/integration/test_episode_paragraphs.py.
+    """
+    _, sql = _run_get_episode_paragraphs([])
+
+    assert "IS DISTINCT FROM LAG(speaker)" in sql
+    assert "SUM(brk) OVER (ORDER BY segment_index)" in sql
+    assert "GROUP BY paragraph, speaker" in sql
+    assert "COALESCE(bool_or(is_overlap), FALSE) AS has_overlap" in sql
+    assert "MIN(word_confidence)::float8 AS min_word_confidence" in sql
+
+
+@pytest.mark.unit
+def test_get_episode_paragraphs_empty_episode():
+    """An episode without segments has no paragraphs."""
+    paragraphs, _ = _run_get_episode_paragraphs([])
+    assert paragraphs == []
+
+
+@pytest.mark.unit
+def test_get_segments_for_diarization_builds_segments_from_tuples():
+    """Test tuple rows map positionally onto TranscriptSegment fields."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [(7, 1, "hi", 1.0, 1.5, 0, "Matt")]
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        segments = TranscriptStorage().get_segments_for_diarization(1)
+
+    assert mock_get_cursor.call_args.kwargs["cursor_factory"] is None
+    assert segments == [TranscriptSegment(
+        id=7, episode_id=1, word="hi", start_time=1.0, end_time=1.5,
+        segment_index=0, speaker="Matt"
+    )]
+
+
+@pytest.mark.unit
+def test_get_segments_paginated_keyset_skips_offset():
+    """Test get_segments_paginated uses a segment_index cursor instead of OFFSET."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (3,)
+    mock_cursor.fetchall.return_value = [(7, 1, "hi", 1.0, 1.5, 6, None)]
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        segments, total = storage.get_segments_paginated(1, limit=50, after_index=5)
+
+        assert total == 3
+        assert segments[0].segment_index == 6
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "segment_index > %s" in sql
+        assert "OFFSET" not in sql
+        assert params == [1, 5, 50]
+
+
+@pytest.mark.unit
+def test_get_segments_paginated_keeps_float_timings():
+    """Test timings read from double precision columns are passed through as floats."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (1,)
+    mock_cursor.fetchall.return_value = [(7, 1, "hi", 1.25, 1.5, 0, None)]
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        segments, _ = storage.get_segments_paginated(1, limit=50)
+
+    assert type(segments[0].start_time) is float
+    assert segments[0].start_time == 1.25
+    assert segments[0].end_time == 1.5
+
+
+@pytest.mark.unit
+def test_get_episode_segments_page_single_query():
+    """Test get_episode_segments_page fetches everything in one execute."""
+    page = {
+        "episode": {"id": 1, "title": "Ep"},
+        "speakers": ["Matt"],
+        "segments": [],
+        "total": 0,
+    }
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = (page,)
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = storage.get_episode_segments_page(1, limit=10, speaker="Matt")
+
+        assert result == page
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "json_build_object" in sql
+        assert "speaker = %(speaker)s" in sql
+        assert params["speaker"] == "Matt"
+        # Filtered views always get an exact count
+        assert "MAX(segment_index)" not in sql
+
+
+@pytest.mark.unit
+def test_get_episode_segments_page_missing_episode():
+    """Test get_episode_segments_page returns None for unknown episodes."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = ({
+        "episode": None, "speakers": [], "segments": [], "total": 0
+    },)
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        assert storage.get_episode_segments_page(999) is None
+
+
+@pytest.mark.unit
+def test_get_episode_segments_page_unfiltered_uses_estimate():
+    """Test unfiltered pages estimate the total above the threshold."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = ({
+        "episode": {"id": 1, "title": "Ep"}, "speakers": [], "segments": [],
+        "total": 50000, "total_is_approximate": True,
+    },)
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = storage.get_episode_segments_page(1)
+
+        assert result["total_is_approximate"] is True
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "MAX(segment_index)" in sql
+        assert params["approx_threshold"] == APPROXIMATE_COUNT_THRESHOLD
+
+
+@pytest.mark.unit
+def test_get_episode_segments_page_columnar():
+    """Test columnar pages aggregate each column separately."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = ({
+        "episode": {"id": 1, "title": "Ep"}, "speakers": [],
+        "columns": {"ids": [], "words": [], "starts": [], "ends": [],
+                    "indices": [], "speakers": []},
+        "total": 0, "total_is_approximate": False,
+    },)
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = storage.get_episode_segments_page(1, columnar=True)
+
+        assert result["columns"]["ids"] == []
+        sql = mock_cursor.execute.call_args[0][0]
+        assert "'columns'" in sql
+        assert "json_agg(word ORDER BY segment_index)" in sql
+
+
+@pytest.mark.unit
+def test_update_speaker_labels_pairs_empty():
+    """Test update_speaker_labels_pairs with no pairs does nothing."""
+    storage = TranscriptStorage()
+    assert storage.update_speaker_labels_pairs([]) == 0
+
+
+@pytest.mark.unit
+def test_update_speaker_labels_pairs_single_statement():
+    """Test update_speaker_labels_pairs issues one UPDATE ... FROM VALUES per batch."""
+    mock_cursor = MagicMock()
+    mock_cursor.rowcount = 2
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor, \
+         patch("app.transcription.storage.execute_values") as mock_execute_values, \
+         patch.object(TranscriptStorage, "_resolve_speaker_id", side_effect=lambda c, name: {"Matt": 1}.get(name)):
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = storage.update_speaker_labels_pairs([(10, "Matt"), (11, "SPEAKER_01")])
+
+        assert result == 2
+        mock_execute_values.assert_called_once()
+        args, kwargs = mock_execute_values.call_args
+        assert "FROM (VALUES %s) AS v(id, speaker, speaker_id)" in args[1]
+        assert args[2] == [(10, "Matt", 1), (11, "SPEAKER_01", None)]
+        assert kwargs["template"] == "(%s, %s, %s::integer)"
 
 
 @pytest.mark.unit
-def test_get_episode_paragraphs_min_word_confidence():
-    """min_word_confidence should be the minimum word_confidence in the paragraph."""
+def test_insert_segments_after_empty():
+    """Test insert_segments_after with no items does nothing."""
+    storage = TranscriptStorage()
+    assert storage.insert_segments_after([]) == []
+
+
+@pytest.mark.unit
+def test_insert_segments_after_missing_reference():
+    """Test insert_segments_after inserts nothing if a reference is missing."""
     mock_cursor = MagicMock()
     mock_cursor.fetchall.return_value = [
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": Decimal("0.9"), "is_overlap": False,
-        },
-        {
-            "id": 2, "word": "world", "start_time": Decimal("0.5"), "end_time": Decimal("1.0"),
-            "segment_index": 1, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": Decimal("0.4"), "is_overlap": False,
-        },
-        {
-            "id": 3, "word": "there", "start_time": Decimal("1.0"), "end_time": Decimal("1.5"),
-            "segment_index": 2, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": Decimal("0.7"), "is_overlap": False,
-        },
+        {"id": 10, "episode_id": 1, "start_time": 1.0, "end_time": 1.5,
+         "segment_index": 4, "speaker": "Matt", "speaker_id": 1},
     ]
 
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor, \
+         patch("app.transcription.storage.execute_values") as mock_execute_values:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        assert storage.insert_segments_after([(10, "a"), (99, "b")]) is None
+        mock_execute_values.assert_not_called()
+
+
+@pytest.mark.unit
+def test_insert_segments_after_batches_statements():
+    """Test insert_segments_after shifts, inserts and logs with one statement each."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchall.return_value = [
+        {"id": 10, "episode_id": 1, "start_time": 1.0, "end_time": 1.5,
+         "segment_index": 4, "speaker": "Matt", "speaker_id": 1},
+        {"id": 20, "episode_id": 1, "start_time": 3.0, "end_time": 3.5,
+         "segment_index": 9, "speaker": "Will", "speaker_id": 2},
+    ]
+
+    def fake_execute_values(cursor, sql, rows, **kwargs):
+        if "RETURNING id" in sql:
+            return [{"id": 100 + i} for i in range(len(rows))]
+        return None
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor, \
+         patch("app.transcription.storage.execute_values", side_effect=fake_execute_values) as mock_execute_values:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = storage.insert_segments_after([(20, " z "), (10, "a"), (10, "b")])
+
+    assert result == [100, 101, 102]
+    assert mock_execute_values.call_count == 3
+    shift_call, insert_call, log_call = mock_execute_values.call_args_list
+
+    assert "UPDATE transcript_segments" in shift_call[0][1]
+    assert sorted(shift_call[0][2]) == [(1, 4, 2), (1, 9, 1)]
+
+    # Words after segment 10 keep request order; segment 20 moved down by two
+    assert insert_call[0][2] == [
+        (1, "z", 3.0, 3.5, 12, "Will", 2),
+        (1, "a", 1.0, 1.5, 5, "Matt", 1),
+        (1, "b", 1.0, 1.5, 6, "Matt", 1),
+    ]
+    assert insert_call[1]["fetch"] is True
+
+    assert "INSERT INTO edit_history" in log_call[0][1]
+    assert log_call[0][2] == [
+        (1, 100, "insert", None, "z"),
+        (1, 101, "insert", None, "a"),
+        (1, 102, "insert", None, "b"),
+    ]
+
+
+@pytest.mark.unit
+def test_get_episode_segments_page_probes_one_extra_row():
+    """Test has_more comes from reading limit + 1 rows, not a count."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = ({
+        "episode": {"id": 1, "title": "Ep"}, "speakers": [], "segments": [],
+        "has_more": True, "total": None, "total_is_approximate": False,
+    },)
+
     with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
         mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
         mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
         storage = TranscriptStorage()
-        paragraphs = storage.get_episode_paragraphs(1)
+        result = storage.get_episode_segments_page(1, limit=25, speaker="Matt", count_mode="none")
+
+        assert result["has_more"] is True
+        sql, params = mock_cursor.execute.call_args[0]
+        assert params["probe_limit"] == 26
+        assert "'has_more', (SELECT COUNT(*) FROM probe) > %(limit)s" in sql
+        assert "COUNT(*) AS total" not in sql
+        assert "NULL::bigint AS total" in sql
 
-        assert len(paragraphs) == 1
-        assert paragraphs[0]["min_word_confidence"] == pytest.approx(0.4)
+
+@pytest.mark.unit
+def test_get_episode_paragraphs_strips_ordering_column():
+    """The internal ordering column is not part of the paragraph payload."""
+    paragraphs, _ = _run_get_episode_paragraphs([_paragraph_row(first_segment_index=0)])
+    assert "first_segment_index" not in paragraphs[0]
 
 
 @pytest.mark.unit
-def test_get_episode_paragraphs_min_word_confidence_null_when_no_data():
-    """min_word_confidence should be None when word_confidence is not present."""
+def test_iter_episode_paragraphs_uses_named_cursor():
+    """Paragraphs stream through a server-side cursor with the header on each row."""
+    rows = [
+        {"episode_title": "Ep", "manually_reviewed": False, "paragraph": _paragraph_row()},
+        {"episode_title": "Ep", "manually_reviewed": False, "paragraph": _paragraph_row(speaker="Bob")},
+    ]
     mock_cursor = MagicMock()
-    mock_cursor.fetchall.return_value = [
-        {
-            "id": 1, "word": "hello", "start_time": Decimal("0.0"), "end_time": Decimal("0.5"),
-            "segment_index": 0, "speaker": "A", "speaker_name": "Alice",
-            "speaker_confidence": None, "word_confidence": None, "is_overlap": False,
-        },
+    mock_cursor.__iter__ = MagicMock(return_value=iter(rows))
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        storage = TranscriptStorage()
+        result = list(storage.iter_episode_paragraphs(1))
+
+        assert [r["paragraph"]["speaker"] for r in result] == ["Alice", "Bob"]
+        assert mock_get_cursor.call_args.kwargs["name"] == "paragraphs_1"
+        sql = mock_cursor.execute.call_args[0][0]
+        assert "LEFT JOIN LATERAL" in sql
+        assert "- 'first_segment_index'" in sql
+
+
+# ─── replace_transcript tests ─────────────────────────────────────────────────
+
+@pytest.mark.unit
+def test_replace_transcript_deletes_and_inserts_in_one_transaction():
+    """replace_transcript should clear old segments and insert on a single cursor."""
+    mock_cursor = MagicMock()
+    mock_cursor.fetchone.return_value = None
+    mock_cursor.mogrify.side_effect = lambda fmt, vals: (fmt % tuple(str(v) for v in vals)).encode()
+    result = MagicMock()
+    result.segments = [
+        MagicMock(word="hello", start_time=Decimal("0.0"), end_time=Decimal("0.5"),
+                  speaker=None, speaker_confidence=None, word_confidence=0.9),
+        MagicMock(word="world", start_time=Decimal("0.5"), end_time=Decimal("1.0"),
+                  speaker=None, speaker_confidence=None, word_confidence=0.8),
     ]
 
     with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
@@ -264,7 +564,70 @@ def test_get_episode_paragraphs_min_word_confidence_null_when_no_data():
         mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
 
         storage = TranscriptStorage()
-        paragraphs = storage.get_episode_paragraphs(1)
+        count = storage.replace_transcript(7, result)
+
+    assert count == 2
+    assert mock_get_cursor.call_count == 1
+    statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+    assert statements[0].startswith("DELETE FROM transcript_segments")
+    assert mock_cursor.execute.call_args_list[0][0][1] == (7,)
+    assert "INSERT INTO transcript_segments" in statements[1]
+
+
+@pytest.mark.unit
+def test_replace_transcript_with_no_segments_still_clears():
+    """replace_transcript with an empty result should only delete."""
+    mock_cursor = MagicMock()
+    result = MagicMock()
+    result.segments = []
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        count = TranscriptStorage().replace_transcript(7, result)
+
+    assert count == 0
+    mock_cursor.execute.assert_called_once()
+    assert "DELETE" in mock_cursor.execute.call_args[0][0]
+
+
+@pytest.mark.unit
+def test_replace_transcript_marks_processed_in_same_transaction():
+    """mark_processed=True updates the episode on the transcript's cursor."""
+    mock_cursor = MagicMock()
+    mock_cursor.connection = MagicMock()
+    result = MagicMock()
+    result.segments = []
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor, \
+         patch("app.transcription.storage.clear_episode_cache") as mock_clear:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        TranscriptStorage().replace_transcript(7, result, mark_processed=True)
+
+    assert mock_get_cursor.call_count == 1
+    statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+    assert statements[0].startswith("DELETE FROM transcript_segments")
+    assert "ep_mark_processed" in statements[-1]
+    assert mock_cursor.execute.call_args_list[-1][0][1] == (7,)
+    mock_clear.assert_called_once_with(7)
+
+
+@pytest.mark.unit
+def test_replace_transcript_leaves_processed_flag_by_default():
+    """Without mark_processed the episode row is not touched."""
+    mock_cursor = MagicMock()
+    result = MagicMock()
+    result.segments = []
+
+    with patch("app.transcription.storage.get_cursor") as mock_get_cursor, \
+         patch("app.transcription.storage.clear_episode_cache") as mock_clear:
+        mock_get_cursor.return_value.__enter__ = MagicMock(return_value=mock_cursor)
+        mock_get_cursor.return_value.__exit__ = MagicMock(return_value=False)
+
+        TranscriptStorage().replace_transcript(7, result)
 
-        assert len(paragraphs) == 1
-        assert paragraphs[0]["min_word_confidence"] is None
+    assert all("processed" not in c[0][0] for c in mock_cursor.execute.call_args_list)
+    mock_clear.assert_not_called()
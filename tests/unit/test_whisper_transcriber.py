@@ -1,4 +1,5 @@
 """Tests for WhisperTranscriber (faster-whisper backend)."""
+import numpy as np
 import pytest
 from unittest.mock import patch, MagicMock
 from decimal import Decimal
@@ -259,3 +260,155 @@ class TestGetTranscriberWithInitialPrompt:
             )
             assert transcriber.model_name == "medium"
             assert transcriber.initial_prompt == "Test vocabulary"
+
+
+@pytest.mark.unit
+class TestWarmUp:
+    """Tests for warming the model before the first episode."""
+
+    def test_warm_up_decodes_silence(self, mock_faster_whisper_model):
+        segments = MagicMock()
+        segments.__iter__.return_value = iter([])
+        mock_faster_whisper_model.transcribe.return_value = (segments, _make_info())
+        with patch("app.transcription.whisper_transcriber.WhisperModel",
+                   return_value=mock_faster_whisper_model):
+            WhisperTranscriber(model_name="base").warm_up()
+
+        (audio,), kwargs = mock_faster_whisper_model.transcribe.call_args
+        assert audio.dtype == np.float32
+        assert not audio.any()
+        assert kwargs["beam_size"] == 1
+        # The segment generator must be consumed for decoding to happen
+        segments.__iter__.assert_called_once()
+
+
+@pytest.mark.unit
+class TestBatchedTranscription:
+    """Tests for batched decoding through BatchedInferencePipeline."""
+
+    def test_sequential_by_default(self, mock_faster_whisper_model, temp_audio_file):
+        with patch("app.transcription.whisper_transcriber.WhisperModel",
+                   return_value=mock_faster_whisper_model), \
+             patch("app.transcription.whisper_transcriber.BatchedInferencePipeline") as mock_batched:
+            WhisperTranscriber(model_name="base").transcribe(temp_audio_file)
+
+        mock_batched.assert_not_called()
+        mock_faster_whisper_model.transcribe.assert_called_once()
+
+    def test_batch_size_uses_batched_pipeline_with_vad(self, mock_faster_whisper_model, temp_audio_file):
+        batched = MagicMock()
+        batched.transcribe.return_value = (iter([_make_segment([_make_word("Hi", 0.0, 0.4)])]), _make_info())
+
+        with patch("app.transcription.whisper_transcriber.WhisperModel",
+                   return_value=mock_faster_whisper_model), \
+             patch("app.transcription.whisper_transcriber.BatchedInferencePipeline",
+                   return_value=batched) as mock_batched:
+            transcriber = WhisperTranscriber(model_name="base", batch_size=8)
+            result = transcriber.transcribe(temp_audio_file)
+            transcriber.transcribe(temp_audio_file)
+
+        mock_batched.assert_called_once_with(model=mock_faster_whisper_model)
+        mock_faster_whisper_model.transcribe.assert_not_called()
+        kwargs = batched.transcribe.call_args.kwargs
+        assert kwargs["batch_size"] == 8
+        assert kwargs["vad_filter"] is True
+        assert result.full_text == "Hi"
+
+    def test_get_transcriber_reads_batch_size_env(self):
+        with patch.dict("os.environ", {"WHISPER_BATCH_SIZE": "16"}):
+            assert get_transcriber(model_name="base").batch_size == 16
+            assert get_transcriber(model_name="base", batch_size=4).batch_size == 4
+
+    def test_get_transcriber_batch_size_defaults_to_none(self):
+        with patch.dict("os.environ", {}, clear=True):
+            assert get_transcriber(model_name="base").batch_size is None
+
+
+def _load_model(transcriber, cuda=True, capability=(8, 0)):
+    """Load transcriber.model against a mocked torch/WhisperModel; return WhisperModel kwargs."""
+    torch = MagicMock()
+    torch.cuda.is_available.return_value = cuda
+    torch.cuda.get_device_capability.return_value = capability
+    with patch.dict("sys.modules", {"torch": torch}), \
+         patch("app.transcription.whisper_transcriber.WhisperModel") as mock_model:
+        transcriber.model
+    return mock_model.call_args.kwargs
+
+
+@pytest.mark.unit
+class TestPrecision:
+    """Tests for compute type selection."""
+
+    def test_ampere_gpu_defaults_to_bfloat16(self):
+        with patch.dict("os.environ", {}, clear=True):
+            kwargs = _load_model(WhisperTranscriber(model_name="base"), capability=(8, 6))
+        assert kwargs == {"device": "cuda", "device_index": 0, "compute_type": "bfloat16"}
+
+    def test_older_gpu_defaults_to_float16(self):
+        with patch.dict("os.environ", {}, clear=True):
+            kwargs = _load_model(WhisperTranscriber(model_name="base"), capability=(7, 5))
+        assert kwargs["compute_type"] == "float16"
+
+    def test_cpu_defaults_to_int8(self):
+        with patch.dict("os.environ", {}, clear=True):
+            kwargs = _load_model(WhisperTranscriber(model_name="base"), cuda=False)
+        assert kwargs == {"device": "cpu", "device_index": 0, "compute_type": "int8"}
+
+    def test_explicit_precision_overrides_env(self):
+        with patch.dict("os.environ", {"WHISPER_COMPUTE_TYPE": "int8"}):
+            kwargs = _load_model(WhisperTranscriber(model_name="base", precision="fp32"))
+        assert kwargs["compute_type"] == "float32"
+
+    def test_unknown_precision_rejected(self):
+        with pytest.raises(ValueError, match="Unknown precision"):
+            WhisperTranscriber(model_name="base", precision="fp8")
+
+    def test_get_transcriber_passes_precision(self):
+        assert get_transcriber(model_name="base", precision="fp16").precision == "fp16"
+
+
+@pytest.mark.unit
+class TestDeviceIndex:
+    """Tests for pinning a transcriber to one GPU."""
+
+    def test_gpu_loads_on_device_index(self):
+        kwargs = _load_model(WhisperTranscriber(model_name="base", device_index=2))
+        assert kwargs["device"] == "cuda"
+        assert kwargs["device_index"] == 2
+
+    def test_cpu_ignores_device_index(self):
+        kwargs = _load_model(WhisperTranscriber(model_name="base", device_index=2), cuda=False)
+        assert kwargs["device_index"] == 0
+
+    def test_get_transcriber_passes_device_index(self):
+        assert get_transcriber(model_name="base", device_index=1).device_index == 1
+
+
+@pytest.mark.unit
+class TestQuantize:
+    """Tests for int8 weight quantization."""
+
+    def test_gpu_keeps_float_activations(self):
+        with patch.dict("os.environ", {}, clear=True):
+            kwargs = _load_model(WhisperTranscriber(model_name="base", quantize=True), capability=(7, 5))
+        assert kwargs["compute_type"] == "int8_float16"
+
+    def test_gpu_combines_with_precision(self):
+        kwargs = _load_model(WhisperTranscriber(model_name="base", precision="bf16", quantize=True))
+        assert kwargs["compute_type"] == "int8_bfloat16"
+
+    def test_cpu_uses_int8(self):
+        kwargs = _load_model(WhisperTranscriber(model_name="base", precision="fp32", quantize=True), cuda=False)
+        assert kwargs["compute_type"] == "int8"
+
+    def test_pipeline_forwards_quantize(self):
+        from app.pipeline import EpisodePipeline
+
+        with patch("app.pipeline.PatreonClient"), \
+             patch("app.pipeline.AudioDownloader"), \
+             patch("app.pipeline.get_transcriber") as mock_get_transcriber, \
+             patch("app.pipeline.TranscriptStorage"), \
+             patch("app.pipeline.EpisodeRepository"):
+            EpisodePipeline(session_id="test", whisper_quantize=True, enable_diarization=False, enable_speaker_id=False)
+
+        assert mock_get_transcriber.call_args.kwargs["quantize"] is True